@@ -0,0 +1,75 @@
+"""Compare the tree path and the compiled layout for rendering pages.
+
+Run with ``uv run python benchmarks/bench_compiled_layout.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+from dataclasses import replace
+
+from tdom_sphinx.compiled_layout import CompiledLayout
+from tdom_sphinx.components.base_layout import BaseLayout
+from tdom_sphinx.models import IconLink, Link, NavbarConfig, PageContext, SiteConfig
+from tdom_sphinx.utils import html_string_to_tdom
+
+PAGES = 200
+REPEAT = 5
+
+SITE_CONFIG = SiteConfig(
+    site_title="Benchmark Site",
+    navbar=NavbarConfig(
+        links=[Link(href=f"/section{i}.html", style="", text=f"S{i}") for i in range(5)],
+        buttons=[
+            IconLink(href="https://github.com/org", color="#000", icon_class="fa fa-github")
+        ],
+    ),
+)
+
+TOC = html_string_to_tdom(
+    "<ul><li><a href='#'>Page</a><ul>"
+    + "".join(f"<li><a href='#s{i}'>Section {i}</a></li>" for i in range(20))
+    + "</ul></li></ul>"
+)
+
+BASE = PageContext(
+    body="<p>" + "Lorem ipsum dolor sit amet. " * 400 + "</p>",
+    css_files=(),
+    display_toc=True,
+    js_files=(),
+    pagename="index",
+    page_source_suffix=".rst",
+    sourcename=None,
+    templatename="page.html",
+    title="Page",
+    toc=TOC,
+)
+
+CONTEXTS = [
+    replace(BASE, pagename=f"dir{i % 10}/page{i}", title=f"Page {i}")
+    for i in range(PAGES)
+]
+
+
+def render_tree() -> None:
+    for page_context in CONTEXTS:
+        str(BaseLayout(page_context=page_context, site_config=SITE_CONFIG))
+
+
+def render_compiled(compiled: CompiledLayout) -> None:
+    for page_context in CONTEXTS:
+        compiled.render(page_context)
+
+
+def main() -> None:
+    compiled = CompiledLayout(SITE_CONFIG)
+    tree = min(timeit.repeat(render_tree, number=1, repeat=REPEAT))
+    fast = min(timeit.repeat(lambda: render_compiled(compiled), number=1, repeat=REPEAT))
+    print(f"pages:    {PAGES}")
+    print(f"tree:     {tree * 1000 / PAGES:.3f} ms/page")
+    print(f"compiled: {fast * 1000 / PAGES:.3f} ms/page")
+    print(f"speedup:  {tree / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Wall-clock time of writing a generated 5k-page site with 1 to 8 workers.
+
+Generates a project with ``benchmarks/large_site``, reads it once so the
+doctrees are cached, then times ``sphinx-build -j N`` into a fresh output
+directory for each worker count. Only the write phase is left to do in
+those runs.
+
+Run with ``uv run python benchmarks/bench_parallel_write.py``.
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from large_site import SiteSpec, generate_project
+
+WORKERS = (1, 2, 4, 8)
+
+SPEC = SiteSpec(
+    pages=5_000,
+    depth=2,
+    fanout=50,
+    body_size=1_000,
+    options=(("tdom_compiled_layout", True), ("tdom_site_navigation", True)),
+)
+
+
+def sphinx_build(srcdir: Path, outdir: Path, doctrees: Path, workers: int) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "sphinx",
+            "-b",
+            "html",
+            "-q",
+            "-j",
+            str(workers),
+            "-d",
+            str(doctrees),
+            str(srcdir),
+            str(outdir),
+        ],
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        srcdir = root / "src"
+        doctrees = root / "doctrees"
+        pages = generate_project(SPEC, srcdir)
+
+        print(f"reading {pages} pages...")
+        sphinx_build(srcdir, root / "warmup", doctrees, max(WORKERS))
+
+        print(f"{'workers':>7}  {'seconds':>8}  {'speedup':>7}")
+        baseline = None
+        for workers in WORKERS:
+            outdir = root / f"out-{workers}"
+            elapsed = sphinx_build(srcdir, outdir, doctrees, workers)
+            shutil.rmtree(outdir)
+            baseline = baseline or elapsed
+            print(f"{workers:>7}  {elapsed:>8.2f}  {baseline / elapsed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Parse large Sphinx-style bodies with ``html_string_to_tdom`` and tdom's parser.
+
+Bodies from 10 KB to 5 MB are built from the markup Sphinx emits for a
+section: headings, paragraphs with inline markup and entities, a literal
+block and a list. Each is parsed with ``html_string_to_tdom`` and with
+``tdom.parser.parse_html``; both should grow linearly with the body size.
+
+Run with ``uv run python benchmarks/bench_parse_html.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from tdom.parser import parse_html
+
+from tdom_sphinx.utils import html_string_to_tdom
+
+SIZES = (10_000, 500_000, 5_000_000)
+NUMBER = 5
+
+SECTION = """\
+<section id="usage">
+<h2>Usage<a class="headerlink" href="#usage" title="Link to this heading">¶</a></h2>
+<p>Call <code class="docutils literal notranslate"><span class="pre">render()</span></code>
+with a <em>page context</em> &amp; a <strong>site config</strong>. The result is a
+tree, not a string &mdash; serialize it when you write the page.</p>
+<div class="highlight-python notranslate"><div class="highlight"><pre><span></span>\
+<span class="n">page</span> <span class="o">=</span> <span class="n">render</span>\
+<span class="p">(</span><span class="n">context</span><span class="p">)</span>
+</pre></div></div>
+<ul class="simple">
+<li><p>First item with a <a class="reference internal" href="#usage">link</a>.</p></li>
+<li><p>Second item.</p></li>
+</ul>
+</section>
+"""
+
+
+def make_body(size: int) -> str:
+    return SECTION * max(1, size // len(SECTION))
+
+
+def main() -> None:
+    print(f"{'body size':>10}  {'html_string_to_tdom':>20}  {'parse_html':>12}")
+    for size in SIZES:
+        body = make_body(size)
+        ours = timeit.timeit(lambda: html_string_to_tdom(body), number=NUMBER)
+        theirs = timeit.timeit(lambda: parse_html(body), number=NUMBER)
+        print(
+            f"{size:>10,}  {ours * 1e3 / NUMBER:>17.1f} ms"
+            f"  {theirs * 1e3 / NUMBER:>9.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Show that putting the Sphinx body into the page tree costs O(1).
+
+Builds the ``Main`` subtree for bodies from 5 KB to 5 MB, once with the
+``RawHTML`` node ``Main`` uses and once with the previous
+``Markup``-in-a-``Text`` approach, which copies the body.
+
+Run with ``uv run python benchmarks/bench_raw_html.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from markupsafe import Markup
+from tdom import Node, html
+
+from tdom_sphinx.components.main import Main
+from tdom_sphinx.models import PageContext
+
+SIZES = (5_000, 500_000, 5_000_000)
+NUMBER = 200
+
+ROW = "<tr><td>cell</td><td>value</td></tr>\n"
+
+
+def make_body(size: int) -> str:
+    return "<table>" + ROW * (size // len(ROW)) + "</table>"
+
+
+def make_page_context(body: str) -> PageContext:
+    return PageContext(
+        body=body,
+        css_files=(),
+        display_toc=False,
+        js_files=(),
+        pagename="api/reference",
+        page_source_suffix=".rst",
+        sourcename=None,
+        templatename="page.html",
+        title="API Reference",
+        toc=None,
+    )
+
+
+def markup_main(page_context: PageContext) -> Node:
+    """The previous Main implementation, for comparison."""
+    safe_body = Markup(page_context.body)
+    return html(t"<main>{safe_body}</main>")
+
+
+def main() -> None:
+    print(f"{'body size':>10}  {'RawHTML':>12}  {'Markup':>12}")
+    for size in SIZES:
+        page_context = make_page_context(make_body(size))
+        raw = timeit.timeit(lambda: Main(page_context=page_context), number=NUMBER)
+        markup = timeit.timeit(lambda: markup_main(page_context), number=NUMBER)
+        print(
+            f"{size:>10,}  {raw * 1e6 / NUMBER:>9.1f} µs  {markup * 1e6 / NUMBER:>9.1f} µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
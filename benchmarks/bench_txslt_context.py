@@ -0,0 +1,174 @@
+"""Count the contexts and variable scopes ``apply_templates`` creates.
+
+A document of lists of items, about 100k nodes, is transformed with a
+template for items and default processing for everything else. The script
+counts the ``TemplateContext`` and ``VariableScope`` objects created and
+reports them per 100k nodes, with the time the transform takes. Contexts
+are made once per list of nodes, not once per node, and a variable scope
+only gets a dict when a template sets a variable.
+
+The same document is also transformed with ``apply_templates_copying``
+below, the loop ``apply_templates`` replaced, which copied the context and
+its variables dict for every node.
+
+Run with ``uv run python benchmarks/bench_txslt_context.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from tdom import Element, Fragment, Node, Text
+
+from tdom_sphinx.txslt import apply_templates, template
+from tdom_sphinx.txslt.registry import (
+    TemplateContext,
+    VariableScope,
+    get_global_registry,
+    reset_global_registry,
+)
+from tdom_sphinx.txslt.patterns import PatternMatcher
+
+LISTS = 1_000
+ITEMS = 50
+NUMBER = 3
+
+
+def make_document() -> Element:
+    lists = [
+        Element(
+            "list",
+            children=[
+                Element("item", children=[Text(f"item {i}.{j}")]) for j in range(ITEMS)
+            ],
+        )
+        for i in range(LISTS)
+    ]
+    return Element("document", children=lists)
+
+
+@dataclass
+class CopyingContext:
+    """``TemplateContext`` as it was, with its variables in a plain dict."""
+
+    variables: Dict[str, Any] = field(default_factory=dict)
+    current_node: Optional[Node] = None
+    mode: Optional[str] = None
+    position: int = 1
+    size: int = 1
+    ancestors: Tuple[Node, ...] = ()
+
+    def copy(self, **changes: Any) -> CopyingContext:
+        new_context = CopyingContext(
+            variables=self.variables.copy(),
+            current_node=self.current_node,
+            mode=self.mode,
+            position=self.position,
+            size=self.size,
+            ancestors=self.ancestors,
+        )
+        for key, value in changes.items():
+            setattr(new_context, key, value)
+        return new_context
+
+
+def apply_templates_copying(
+    nodes: Node | List[Node],
+    mode: Optional[str] = None,
+    context: Optional[CopyingContext] = None,
+) -> Node:
+    """``apply_templates`` as it was, copying the context for every node."""
+    if context is None:
+        context = CopyingContext(mode=mode)
+    registry = get_global_registry()
+    ancestors = context.ancestors
+    if context.current_node is not None:
+        ancestors = (*ancestors, context.current_node)
+    if isinstance(nodes, Node):
+        nodes = [nodes]
+
+    results: List[Node] = []
+    for i, node in enumerate(nodes):
+        node_context = context.copy(
+            current_node=node, position=i + 1, size=len(nodes), ancestors=ancestors
+        )
+        template_info = registry.find_template(node, mode, ancestors)
+        if template_info:
+            result = template_info.function(node, node_context)
+            if isinstance(result, Node):
+                results.append(result)
+            elif result is not None:
+                results.append(Text(str(result)))
+        elif isinstance(node, (Element, Fragment)):
+            children: List[Node] = []
+            if node.children:
+                child_result = apply_templates_copying(
+                    node.children, node_context.mode, node_context
+                )
+                if isinstance(child_result, Fragment):
+                    children = child_result.children
+                else:
+                    children = [child_result]
+            if isinstance(node, Element):
+                results.append(Element(node.tag, node.attrs.copy(), children))
+            else:
+                results.append(Fragment(children))
+        else:
+            results.append(node)
+
+    if len(results) == 1:
+        return results[0]
+    return Fragment(children=results)
+
+
+def count_nodes(node: Node) -> int:
+    if isinstance(node, Element):
+        return 1 + sum(count_nodes(child) for child in node.children)
+    return 1
+
+
+def counting(cls: type, counts: Counter, name: str) -> None:
+    """Count instances of ``cls`` created from now on."""
+    init = cls.__init__
+
+    def counted_init(self, *args, **kwargs):
+        counts[name] += 1
+        init(self, *args, **kwargs)
+
+    cls.__init__ = counted_init  # type: ignore[method-assign]
+
+
+def main() -> None:
+    reset_global_registry()
+
+    @template(pattern="item")
+    def item_template(node, context):
+        return Element("li", children=[Text(PatternMatcher.get_text_content(node))])
+
+    document = make_document()
+    nodes = count_nodes(document)
+
+    assert str(apply_templates_copying(document)) == str(apply_templates(document))
+    copying = timeit.timeit(lambda: apply_templates_copying(document), number=NUMBER)
+    elapsed = timeit.timeit(lambda: apply_templates(document), number=NUMBER)
+
+    counts: Counter = Counter()
+    counting(CopyingContext, counts, "copying contexts")
+    apply_templates_copying(document)
+    counting(TemplateContext, counts, "contexts")
+    counting(VariableScope, counts, "scopes")
+    apply_templates(document)
+
+    scale = 100_000 / nodes
+    print(f"{nodes:,} nodes")
+    print(f"copy per node:      {copying * 1e3 / NUMBER:>8.1f} ms per transform")
+    print(f"context per list:   {elapsed * 1e3 / NUMBER:>8.1f} ms per transform")
+    for name in ("copying contexts", "contexts", "scopes"):
+        print(f"{name:>16} per 100k nodes: {counts[name] * scale:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
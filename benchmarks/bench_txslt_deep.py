@@ -0,0 +1,131 @@
+"""Transform deeply nested trees with ``apply_templates``.
+
+Trees are chains of nested ``section`` elements with a ``leaf`` at the
+bottom, like the nested definition lists autodoc produces, plus a wide,
+shallow tree for comparison. Each is transformed with ``apply_templates``,
+which descends with an explicit stack, and with ``apply_templates_recursive``
+below, the recursive descent it replaced. The recursive version runs out
+of stack at a few hundred levels.
+
+Run with ``uv run python benchmarks/bench_txslt_deep.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+from typing import List, Optional
+
+from tdom import Element, Fragment, Node, Text
+
+from tdom_sphinx.txslt import apply_templates, template
+from tdom_sphinx.txslt.registry import (
+    TemplateContext,
+    get_global_registry,
+    reset_global_registry,
+)
+
+DEPTHS = (100, 400, 2_000, 10_000)
+WIDE = (1_000, 100)
+NUMBER = 5
+
+
+def apply_templates_recursive(
+    nodes: Node | List[Node],
+    mode: Optional[str] = None,
+    context: Optional[TemplateContext] = None,
+) -> Node:
+    """``apply_templates`` as it was, recursing into unmatched nodes."""
+    if context is None:
+        context = TemplateContext(mode=mode)
+    registry = get_global_registry()
+    ancestors = context.ancestors
+    if context.current_node is not None:
+        ancestors = (*ancestors, context.current_node)
+    if isinstance(nodes, Node):
+        nodes = [nodes]
+
+    results: List[Node] = []
+    node_context = context.copy(size=len(nodes), ancestors=ancestors)
+    for i, node in enumerate(nodes):
+        node_context.current_node = node
+        node_context.position = i + 1
+        node_context.variables.reset()
+        template_info = registry.find_template(node, mode, ancestors)
+        if template_info:
+            result = template_info.function(node, node_context)
+            if isinstance(result, Node):
+                results.append(result)
+            elif result is not None:
+                results.append(Text(str(result)))
+        elif isinstance(node, (Element, Fragment)):
+            children: List[Node] = []
+            if node.children:
+                child_result = apply_templates_recursive(
+                    node.children, node_context.mode, node_context
+                )
+                if isinstance(child_result, Fragment):
+                    children = child_result.children
+                else:
+                    children = [child_result]
+            if isinstance(node, Element):
+                results.append(Element(node.tag, node.attrs.copy(), children))
+            else:
+                results.append(Fragment(children))
+        else:
+            results.append(node)
+
+    if len(results) == 1:
+        return results[0]
+    return Fragment(children=results)
+
+
+def make_deep(depth: int) -> Element:
+    root = node = Element("section", {"class": "level"})
+    for _ in range(depth - 1):
+        child = Element("section", {"class": "level"}, [Text("term")])
+        node.children.append(child)
+        node = child
+    node.children.append(Element("leaf"))
+    return root
+
+
+def make_wide(sections: int, items: int) -> Element:
+    return Element(
+        "document",
+        children=[
+            Element(
+                "section",
+                children=[Element("p", children=[Text("text")]) for _ in range(items)],
+            )
+            for _ in range(sections)
+        ],
+    )
+
+
+def run(transform, tree: Node) -> str:
+    try:
+        seconds = timeit.timeit(lambda: transform(tree), number=NUMBER)
+    except RecursionError:
+        return "RecursionError"
+    return f"{seconds * 1e3 / NUMBER:.1f} ms"
+
+
+def main() -> None:
+    reset_global_registry()
+
+    @template(pattern="leaf")
+    def leaf_template(node, context):
+        return Text("leaf")
+
+    trees = [(f"depth {depth:,}", make_deep(depth)) for depth in DEPTHS]
+    trees.append((f"wide {WIDE[0]:,}x{WIDE[1]:,}", make_wide(*WIDE)))
+
+    print(f"{'tree':>16}  {'iterative':>14}  {'recursive':>14}")
+    for name, tree in trees:
+        iterative = run(apply_templates, tree)
+        recursive = run(apply_templates_recursive, tree)
+        print(f"{name:>16}  {iterative:>14}  {recursive:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Per-page cost of making site-absolute URLs relative.
+
+Compares the previous approach, where ``Head``, ``SiteAside``,
+``NavbarBrand`` and ``NavbarLinks`` each walked their own subtree and
+resolved every href through ``PurePosixPath``, with the single
+``relative_tree`` pass ``BaseLayout`` now makes over the whole document.
+Only the walks are timed; the trees are built beforehand.
+
+Run with ``uv run python benchmarks/bench_url_rewrite.py``.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from pathlib import PurePosixPath
+
+from tdom import Node, Text
+
+from tdom_sphinx.components.base_layout import DocumentShell
+from tdom_sphinx.components.footer import Footer
+from tdom_sphinx.components.head import Head
+from tdom_sphinx.components.main import Main
+from tdom_sphinx.components.navbar_brand import NavbarBrand
+from tdom_sphinx.components.navbar_links import NavbarLinks
+from tdom_sphinx.components.site_aside import SiteAside
+from tdom_sphinx.models import Link, PageContext, SiteConfig
+from tdom_sphinx.url import relative, relative_tree, reset_relative_cache
+from tdom_sphinx.utils import html_string_to_tdom
+
+PAGES = 500
+TOC_ENTRIES = 200
+
+SITE_CONFIG = SiteConfig(site_title="Benchmark Site")
+LINKS = [Link(href=f"/section{i}.html", style="", text=f"S{i}") for i in range(5)]
+
+TOC_HTML = (
+    "<ul><li><a href='/index.html'>Home</a><ul>"
+    + "".join(
+        f"<li><a href='/dir{i % 10}/page{i}.html'>Page {i}</a></li>"
+        for i in range(TOC_ENTRIES)
+    )
+    + "</ul></li></ul>"
+)
+
+BASE = PageContext(
+    body="<p>Body</p>",
+    css_files=(),
+    display_toc=True,
+    js_files=(),
+    pagename="index",
+    page_source_suffix=".rst",
+    sourcename=None,
+    templatename="page.html",
+    title="Page",
+    toc=None,
+)
+
+
+def legacy_relative_tree(target_node: Node, current: PurePosixPath) -> None:
+    """The per-component walk used before, for comparison."""
+
+    def walk(node: object, in_head: bool = False) -> None:
+        tag = getattr(node, "tag", None)
+        attrs = getattr(node, "attrs", None)
+        now_in_head = in_head or (tag == "head")
+        if tag in ("a", "link") and isinstance(attrs, dict):
+            href = attrs.get("href")
+            if (tag == "a" or now_in_head) and isinstance(href, str) and href.startswith("/"):
+                attrs["href"] = str(relative(current=current, target=href))
+        children = getattr(node, "children", None)
+        if isinstance(children, (list, tuple)):
+            for child in children:
+                walk(child, now_in_head)
+
+    walk(target_node)
+
+
+def build_parts(page_context: PageContext) -> dict[str, Node]:
+    return {
+        "head": Head(page_context=page_context, site_config=SITE_CONFIG),
+        "brand": NavbarBrand(pagename=page_context.pagename, href="/", title="Site"),
+        "links": NavbarLinks(pagename=page_context.pagename, links=LINKS, buttons=()),
+        "aside": SiteAside(page_context=page_context, site_config=SITE_CONFIG),
+    }
+
+
+def build_document(page_context: PageContext) -> Node:
+    parts = build_parts(page_context)
+    return DocumentShell(
+        head=parts["head"],
+        heading=Text(""),
+        aside=parts["aside"],
+        main=Main(page_context=page_context),
+        footer=Footer(page_context=page_context, site_config=SITE_CONFIG),
+    )
+
+
+def main() -> None:
+    # SiteAside builds new nodes from the toc, so one parsed toc is enough
+    toc = html_string_to_tdom(TOC_HTML)
+    contexts = [
+        replace(BASE, pagename=f"dir{i % 10}/page{i}", toc=toc) for i in range(PAGES)
+    ]
+
+    per_component = [build_parts(page_context) for page_context in contexts]
+    start = time.perf_counter()
+    for page_context, parts in zip(contexts, per_component):
+        current = PurePosixPath("/" + page_context.pagename)
+        for part in parts.values():
+            legacy_relative_tree(part, current)
+    before = time.perf_counter() - start
+
+    documents = [build_document(page_context) for page_context in contexts]
+    reset_relative_cache()
+    start = time.perf_counter()
+    for page_context, document in zip(contexts, documents):
+        relative_tree(document, "/" + page_context.pagename)
+    after = time.perf_counter() - start
+
+    print(f"pages:          {PAGES} ({TOC_ENTRIES} toc entries)")
+    print(f"per component:  {before * 1e6 / PAGES:.1f} µs/page")
+    print(f"one pass:       {after * 1e6 / PAGES:.1f} µs/page")
+    print(f"speedup:        {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
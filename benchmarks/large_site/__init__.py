@@ -0,0 +1,9 @@
+"""Generate large Sphinx projects and time full builds with the tdom theme.
+
+Run with ``uv run python -m benchmarks.large_site --help``.
+"""
+
+from .generate import SiteSpec, generate_project
+from .run import BuildResult, run_build, run_suite
+
+__all__ = ["BuildResult", "SiteSpec", "generate_project", "run_build", "run_suite"]
@@ -0,0 +1,56 @@
+"""Command line for the large-site benchmark.
+
+Examples::
+
+    uv run python -m benchmarks.large_site --pages 1000 10000 --jobs 1 4
+    uv run python -m benchmarks.large_site --pages 50000 --depth 4 \\
+        --option tdom_compiled_layout --output results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from .generate import SiteSpec
+from .run import run_suite
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.large_site")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1_000])
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--body-size", type=int, default=2_000)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1])
+    parser.add_argument(
+        "--option",
+        action="append",
+        default=[],
+        help="tdom_sphinx config value to switch on, e.g. tdom_compiled_layout",
+    )
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    options = tuple((name, True) for name in args.option)
+    specs = [
+        SiteSpec(
+            pages=pages,
+            depth=args.depth,
+            fanout=args.fanout,
+            body_size=args.body_size,
+            options=options,
+        )
+        for pages in args.pages
+    ]
+    report = json.dumps(run_suite(specs, args.jobs), indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        sys.stdout.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Write a synthetic Sphinx project of a given size and shape."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+CONF = """\
+extensions = ["tdom_sphinx"]
+project = "Large site benchmark"
+html_theme = "tdom-theme"
+{options}
+"""
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua"
+).split()
+
+CODE = """\
+.. code-block:: python
+
+   def example(value):
+       return {"value": value, "double": value * 2}
+"""
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    """The shape of a generated project.
+
+    Pages are arranged in directories ``depth - 1`` levels deep, each with
+    ``fanout`` subdirectories. Leaf pages are spread over the deepest
+    directories until there are ``pages`` documents in total. Each page's
+    body has about ``body_size`` characters of reStructuredText.
+    """
+
+    pages: int = 1_000
+    depth: int = 3
+    fanout: int = 10
+    body_size: int = 2_000
+    options: tuple[tuple[str, object], ...] = ()
+
+    @property
+    def name(self) -> str:
+        name = f"{self.pages}p-d{self.depth}-f{self.fanout}-b{self.body_size}"
+        enabled = [key for key, value in self.options if value]
+        return "+".join([name, *enabled])
+
+
+def make_body(size: int, seed: int) -> str:
+    """Paragraphs, subsections and a code block adding up to about ``size``."""
+    parts: list[str] = []
+    length = 0
+    section = 0
+    while length < size:
+        words = [WORDS[(seed + i) % len(WORDS)] for i in range(60)]
+        paragraph = " ".join(words).capitalize() + "."
+        if len(parts) % 4 == 0:
+            section += 1
+            heading = f"Section {section}"
+            paragraph = f"{heading}\n{'-' * len(heading)}\n\n{paragraph}"
+        if len(parts) % 6 == 5:
+            paragraph = f"{paragraph}\n\n{CODE}"
+        parts.append(paragraph)
+        length += len(paragraph)
+        seed += 7
+    return "\n\n".join(parts)
+
+
+def plan_tree(spec: SiteSpec) -> dict[str, list[str]]:
+    """Map each directory index docname to the docnames in its toctree."""
+    children: dict[str, list[str]] = defaultdict(list)
+    count = 1  # the root index
+    level = [""]
+    for _ in range(spec.depth - 1):
+        next_level = []
+        for directory in level:
+            for i in range(spec.fanout):
+                if count >= spec.pages:
+                    break
+                child = f"{directory}s{i}/"
+                children[f"{directory}index"].append(f"{child}index")
+                next_level.append(child)
+                count += 1
+        if not next_level:
+            break
+        level = next_level
+
+    i = 0
+    while count < spec.pages:
+        directory = level[i % len(level)]
+        children[f"{directory}index"].append(f"{directory}p{i // len(level)}")
+        count += 1
+        i += 1
+    return children
+
+
+def generate_project(spec: SiteSpec, srcdir: Path) -> int:
+    """Write ``conf.py`` and all documents into ``srcdir``; return the page count."""
+    srcdir.mkdir(parents=True, exist_ok=True)
+    options = "\n".join(f"{key} = {value!r}" for key, value in spec.options)
+    (srcdir / "conf.py").write_text(CONF.format(options=options))
+
+    children = plan_tree(spec)
+    docnames = ["index", *(doc for docs in children.values() for doc in docs)]
+    for n, docname in enumerate(docnames):
+        title = f"Page {docname}"
+        text = f"{title}\n{'=' * len(title)}\n\n{make_body(spec.body_size, n)}\n"
+        if docname in children:
+            directory = docname.removesuffix("index")
+            entries = "".join(
+                f"   {child.removeprefix(directory)}\n" for child in children[docname]
+            )
+            text += f"\n.. toctree::\n   :maxdepth: 2\n\n{entries}"
+        path = srcdir / f"{docname}.rst"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return len(docnames)
@@ -0,0 +1,150 @@
+"""Run full Sphinx builds of generated projects and collect timings."""
+
+from __future__ import annotations
+
+import io
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from importlib.metadata import PackageNotFoundError, version
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Iterable
+
+from sphinx.application import Sphinx
+
+from .generate import SiteSpec, generate_project
+
+SCHEMA_VERSION = 1
+
+# Phases in build order, each starting at the named Sphinx event
+PHASE_EVENTS = (
+    ("read", "env-before-read-docs"),
+    ("resolve", "env-updated"),
+    ("write", "write-started"),
+    ("finish", "build-finished"),
+)
+
+
+@dataclass(frozen=True)
+class BuildResult:
+    """Timings and memory use of one build."""
+
+    name: str
+    pages: int
+    depth: int
+    fanout: int
+    body_size: int
+    jobs: int
+    wall_seconds: float
+    phases: dict[str, float]
+    peak_rss_mb: float
+    peak_worker_rss_mb: float
+    pages_per_second: float
+
+
+def _max_rss_mb(who: int) -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_build(spec: SiteSpec, jobs: int = 1) -> BuildResult:
+    """Generate a project and build it in this process, timing each phase.
+
+    The "setup" phase covers creating the Sphinx application, up to and
+    including builder-inited. Project generation is not timed.
+    """
+    with tempfile.TemporaryDirectory(prefix="tdom-bench-") as tmp:
+        root = Path(tmp)
+        srcdir = root / "src"
+        pages = generate_project(spec, srcdir)
+
+        start = time.perf_counter()
+        app = Sphinx(
+            srcdir,
+            srcdir,
+            root / "html",
+            root / "doctrees",
+            "html",
+            status=None,
+            warning=io.StringIO(),
+            freshenv=True,
+            parallel=jobs,
+        )
+        marks = {"setup": start}
+        for phase, event in PHASE_EVENTS:
+
+            def mark(*args: object, phase: str = phase) -> None:
+                marks.setdefault(phase, time.perf_counter())
+
+            app.connect(event, mark)
+        app.build()
+        end = time.perf_counter()
+
+    names = ["setup", *(phase for phase, _ in PHASE_EVENTS)]
+    times = [marks.get(name) for name in names] + [end]
+    phases = {}
+    for i, name in enumerate(names):
+        if times[i] is None:
+            continue
+        following = next((t for t in times[i + 1 :] if t is not None), end)
+        phases[name] = round(following - times[i], 4)
+
+    wall = end - start
+    return BuildResult(
+        name=spec.name,
+        pages=pages,
+        depth=spec.depth,
+        fanout=spec.fanout,
+        body_size=spec.body_size,
+        jobs=jobs,
+        wall_seconds=round(wall, 4),
+        phases=phases,
+        peak_rss_mb=round(_max_rss_mb(resource.RUSAGE_SELF), 1),
+        peak_worker_rss_mb=round(_max_rss_mb(resource.RUSAGE_CHILDREN), 1),
+        pages_per_second=round(pages / wall, 1),
+    )
+
+
+def _installed_version(distribution: str) -> str:
+    try:
+        return version(distribution)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def run_suite(specs: Iterable[SiteSpec], jobs: Iterable[int] = (1,)) -> dict:
+    """Run every spec with every job count, each in a fresh process.
+
+    Separate processes keep one build's caches and peak RSS from leaking
+    into the next. Returns a JSON-ready report.
+    """
+    results = []
+    spawn = get_context("spawn")
+    for spec in specs:
+        for job_count in jobs:
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                result = pool.submit(run_build, spec, job_count).result()
+            print(
+                f"{result.name} -j{result.jobs}: {result.wall_seconds:.2f}s, "
+                f"{result.pages_per_second:.0f} pages/s",
+                file=sys.stderr,
+            )
+            results.append(asdict(result))
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sphinx": _installed_version("sphinx"),
+            "tdom": _installed_version("tdom"),
+            "tdom-sphinx": _installed_version("tdom-sphinx"),
+        },
+        "results": results,
+    }
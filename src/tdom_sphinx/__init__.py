@@ -6,7 +6,13 @@ from pathlib import Path
 from typing import Any, Callable
 
 # Import Sphinx event handlers from a dedicated module
-from .sphinx_events import _on_html_page_context, _on_builder_inited
+from .sphinx_events import (
+    _on_build_finished,
+    _on_builder_inited,
+    _on_env_updated,
+    _on_html_page_context,
+    _on_write_started,
+)
 
 THEME_ROOT = Path(__file__).parent / "theme"
 
@@ -30,9 +36,45 @@ def setup(app) -> dict[str, Any]:
     # passed through into the HTML page context by our event handler.
     app.add_config_value("site_config", None, "env")
 
+    # Opt-in: render pages by filling slots in a pre-serialized BaseLayout
+    app.add_config_value("tdom_compiled_layout", False, "html")
+
+    # Opt-in: stream rendered trees to the output files in chunks
+    app.add_config_value("tdom_stream_pages", False, "html")
+
+    # Opt-in: build the aside navigation once from the site's toctrees. It
+    # lists the whole site below the root document in place of the page's
+    # own toc, whatever the root's title (no hide_root check)
+    app.add_config_value("tdom_site_navigation", False, "html")
+
+    # Opt-in: index page titles, relations and metadata once for all pages
+    app.add_config_value("tdom_page_index", False, "html")
+
+    # Opt-in: link to content-hashed copies of the theme's static assets
+    app.add_config_value("tdom_asset_manifest", False, "html")
+
+    # Opt-in: skip rendering and writing pages whose inputs are unchanged
+    app.add_config_value("tdom_fingerprint_pages", False, "html")
+
+    # Opt-in: time components and write a report at build-finished
+    app.add_config_value("tdom_timings", False, "html")
+
+    # Opt-in: trace memory per page and component, report the top N pages
+    app.add_config_value("tdom_memory_profile", False, "html")
+    app.add_config_value("tdom_memory_top", 10, "html")
+
+    # Opt-in: record node counts and output size per page, dump them as CSV
+    app.add_config_value("tdom_tree_stats", False, "html")
+
+    # Opt-in: write the build's spans as a Chrome trace-event file
+    app.add_config_value("tdom_trace", False, "html")
+
     # Connect event handlers used by our custom Template Bridge and views
     app.connect("builder-inited", _on_builder_inited)
+    app.connect("env-updated", _on_env_updated)
+    app.connect("write-started", _on_write_started)
     app.connect("html-page-context", _on_html_page_context)
+    app.connect("build-finished", _on_build_finished)
 
     return {
         "version": "0.1",
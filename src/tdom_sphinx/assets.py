@@ -0,0 +1,125 @@
+"""Content-hashed URLs for the stylesheets and icon ``Head`` links to.
+
+With ``tdom_asset_manifest = True``, once Sphinx has copied the static files
+into ``_static``, each asset ``Head`` uses is copied again under a name that
+contains a hash of its content, e.g. ``pico.3f2a9c01d4b7e6a2.css``. That
+includes the stylesheets and scripts Sphinx and extensions register. An
+``AssetManifest`` maps the plain names to those URLs. It is stored on the
+``SiteConfig``, so ``Head`` links to the hashed files and page fingerprints
+change when an asset does.
+
+A hashed file never changes, so ``_static`` can be served with
+``Cache-Control: public, max-age=31536000, immutable``. The manifest is
+also written to ``_static/tdom-assets.json`` for deployment tooling.
+Hashed copies of an asset left over from earlier builds are deleted, so
+``_static`` doesn't grow with every edit to a stylesheet.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import shutil
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from pathlib import Path, PurePosixPath
+from typing import Callable, Mapping
+
+from sphinx.builders.html import StandaloneHTMLBuilder
+
+# Stylesheets Head links to, in order
+STYLESHEETS = ("tdom-sphinx.css", "pico.css", "sphinx.css", "pygments.css")
+FAVICON = "favicon.ico"
+MANIFEST_NAME = "tdom-assets.json"
+
+
+@dataclass(frozen=True)
+class AssetManifest:
+    """Site-absolute URLs of static assets, by their plain file name."""
+
+    urls: Mapping[str, str] = field(default_factory=dict)
+
+    def url(self, name: str) -> str:
+        """The hashed URL of an asset, or its plain ``/_static`` URL."""
+        return self.urls.get(name, f"/_static/{name}")
+
+
+def hashed_name(name: str, content: bytes) -> str:
+    """``name`` with a hash of ``content`` before its suffix."""
+    path = PurePosixPath(name)
+    digest = blake2b(content, digest_size=8).hexdigest()
+    return str(path.with_name(f"{path.stem}.{digest}{path.suffix}"))
+
+
+def remove_stale_copies(static_dir: Path, name: str, keep: str) -> None:
+    """Delete hashed copies of ``name`` in ``static_dir`` other than ``keep``.
+
+    ``keep`` is a file name in the directory of ``name``.
+    """
+    path = PurePosixPath(name)
+    pattern = re.compile(
+        rf"{re.escape(path.stem)}\.[0-9a-f]{{16}}{re.escape(path.suffix)}"
+    )
+    directory = static_dir / path.parent
+    for candidate in directory.glob(f"{path.stem}.*{path.suffix}"):
+        if candidate.name != keep and pattern.fullmatch(candidate.name):
+            candidate.unlink()
+
+
+def build_asset_manifest(
+    static_dir: Path, names: tuple[str, ...] = (*STYLESHEETS, FAVICON)
+) -> AssetManifest:
+    """Copy each asset in ``static_dir`` to its hashed name; map names to URLs.
+
+    Assets that don't exist keep their plain URL. Older hashed copies of
+    each asset are removed.
+    """
+    urls = {}
+    for name in names:
+        path = static_dir / name
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            continue
+        hashed = static_dir / hashed_name(name, content)
+        if not hashed.exists():
+            shutil.copyfile(path, hashed)
+        remove_stale_copies(static_dir, name, hashed.name)
+        urls[name] = f"/_static/{hashed.name}"
+
+    (static_dir / MANIFEST_NAME).write_text(
+        json.dumps(urls, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+    )
+    return AssetManifest(urls)
+
+
+def builder_asset_names(builder: StandaloneHTMLBuilder) -> tuple[str, ...]:
+    """Names, within ``_static``, of the stylesheets and scripts pages get."""
+    assets = (*getattr(builder, "_css_files", ()), *getattr(builder, "_js_files", ()))
+    names = []
+    for asset in assets:
+        filename = str(asset.filename or "")
+        if filename.startswith("_static/"):
+            names.append(filename.removeprefix("_static/"))
+    return tuple(names)
+
+
+def install_asset_manifest(
+    builder: StandaloneHTMLBuilder, use_manifest: Callable[[AssetManifest], None]
+) -> None:
+    """Build the manifest each time the builder has copied its assets.
+
+    Sphinx copies static files after ``write-started`` and before writing
+    any page, so ``use_manifest`` runs before the first page is rendered.
+    Besides Head's own assets, the builder's stylesheets and scripts are
+    hashed too.
+    """
+    copy_assets = builder.copy_assets
+
+    def copy_assets_with_manifest() -> None:
+        copy_assets()
+        names = dict.fromkeys((*STYLESHEETS, FAVICON, *builder_asset_names(builder)))
+        static_dir = Path(builder.outdir) / "_static"
+        use_manifest(build_asset_manifest(static_dir, tuple(names)))
+
+    builder.copy_assets = copy_assets_with_manifest  # type: ignore[method-assign]
@@ -0,0 +1,90 @@
+"""Memoization of the page chrome rendered around every page body.
+
+The ``<head>``, the navbar heading and the footer only change with the
+``SiteConfig`` and the directory the page lives in (relative URLs). The
+``<head>`` also depends on the page's stylesheets and scripts, which are
+the same for almost every page. The page title in the ``<head>`` is
+swapped in per page, so it is not part of the key. Rendering them once
+per key instead of once per page removes most of the per-page component
+work on large sites.
+"""
+
+from __future__ import annotations
+
+import posixpath
+from dataclasses import dataclass, field
+from typing import Callable, Hashable
+
+from tdom import Node
+
+from tdom_sphinx.models import PageContext, SiteConfig
+
+
+def page_directory(pagename: str) -> str:
+    """Return the site directory of a page, e.g. ``"/a/b"`` for ``"a/b/c"``.
+
+    Relative URLs computed for a page only depend on this directory, so it
+    is what chrome entries are keyed on.
+    """
+    return posixpath.dirname("/" + pagename)
+
+
+def page_assets(page_context: PageContext) -> tuple[tuple, tuple]:
+    """Return the page's ``css_files`` and ``js_files`` as a hashable key."""
+    return tuple(page_context.css_files), tuple(page_context.js_files)
+
+
+@dataclass
+class ChromeCache:
+    """Cache of rendered chrome subtrees with hit/miss counters.
+
+    Entries are keyed by ``(SiteConfig identity, *key)``. The ``SiteConfig``
+    is kept alive alongside the entry so its ``id()`` cannot be reused by
+    another config while the entry exists.
+
+    Cached nodes are shared between pages and must be treated as read-only.
+    """
+
+    entries: dict[tuple[Hashable, ...], tuple[SiteConfig, Node]] = field(
+        default_factory=dict
+    )
+    hits: int = 0
+    misses: int = 0
+
+    def get(
+        self,
+        site_config: SiteConfig,
+        key: tuple[Hashable, ...],
+        render: Callable[[], Node],
+    ) -> Node:
+        """Return the cached node for the key, rendering it on a miss."""
+        cache_key = (id(site_config), *key)
+        entry = self.entries.get(cache_key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        node = render()
+        self.entries[cache_key] = (site_config, node)
+        return node
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Global cache instance
+_chrome_cache = ChromeCache()
+
+
+def get_chrome_cache() -> ChromeCache:
+    """Get the global chrome cache."""
+    return _chrome_cache
+
+
+def reset_chrome_cache() -> None:
+    """Reset the global chrome cache (useful for testing)."""
+    _chrome_cache.clear()
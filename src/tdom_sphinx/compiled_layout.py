@@ -0,0 +1,134 @@
+"""Precompiled BaseLayout: render pages by filling slots in a serialized skeleton.
+
+The tree path builds and serializes a full tdom tree for every page. Most of
+that document never changes between pages of the same directory, so the
+compiled layout serializes it once, with markers where the per-page parts
+go, and splits it into static segments. Rendering a page is then a string
+join of those segments with the page's title, aside and body.
+
+Enable it with ``tdom_compiled_layout = True`` in ``conf.py``.
+"""
+
+from __future__ import annotations
+
+import re
+import secrets
+from dataclasses import dataclass, field
+
+from markupsafe import Markup
+from tdom import Text
+
+from tdom_sphinx.chrome import page_assets, page_directory
+from tdom_sphinx.components.base_layout import DocumentShell
+from tdom_sphinx.components.footer import Footer
+from tdom_sphinx.components.head import Head
+from tdom_sphinx.components.heading import Heading
+from tdom_sphinx.components.main import Main
+from tdom_sphinx.components.site_aside import SiteAside
+from tdom_sphinx.instrumentation import timed
+from tdom_sphinx.models import PageContext, SiteConfig
+from tdom_sphinx.url import relative_tree
+
+SLOTS = ("title", "aside", "body")
+
+_MARKER_PREFIX = f"tdom-sphinx-slot-{secrets.token_hex(4)}-"
+_MARKER_RE = re.compile(re.escape(_MARKER_PREFIX) + "(" + "|".join(SLOTS) + ")")
+
+
+def _marker(slot: str) -> str:
+    return f"{_MARKER_PREFIX}{slot}"
+
+
+@dataclass(frozen=True)
+class Skeleton:
+    """Static segments of a serialized layout and the slots between them.
+
+    ``segments`` always has exactly one more item than ``slots``.
+    """
+
+    segments: tuple[str, ...]
+    slots: tuple[str, ...]
+
+    def fill(self, values: dict[str, str]) -> str:
+        """Join the static segments with the values for each slot."""
+        parts = [self.segments[0]]
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            parts.append(values[slot])
+            parts.append(segment)
+        return "".join(parts)
+
+
+def compile_skeleton(
+    site_config: SiteConfig,
+    directory: str,
+    css_files: tuple = (),
+    js_files: tuple = (),
+) -> Skeleton:
+    """Serialize the BaseLayout document for pages in ``directory``.
+
+    The components are rendered with marker values in place of the page
+    title and body, and a marker in place of the aside. The serialized
+    output is then split on those markers. ``css_files`` and ``js_files``
+    are the page's Sphinx assets, linked from the ``<head>``.
+    """
+    pagename = f"{directory.rstrip('/')}/index".lstrip("/")
+    placeholder = PageContext(
+        body=Markup(_marker("body")),
+        css_files=css_files,
+        display_toc=False,
+        js_files=js_files,
+        pagename=pagename,
+        page_source_suffix="",
+        sourcename=None,
+        templatename="page.html",
+        title=_marker("title"),
+        toc=None,
+    )
+    document = DocumentShell(
+        head=Head(page_context=placeholder, site_config=site_config),
+        heading=Heading(page_context=placeholder, site_config=site_config),
+        aside=Text(_marker("aside")),
+        main=Main(page_context=placeholder),
+        footer=Footer(page_context=placeholder, site_config=site_config),
+    )
+    relative_tree(document, "/" + pagename)
+    # re.split with one group alternates static segments and slot names
+    parts = _MARKER_RE.split(str(document))
+    return Skeleton(segments=tuple(parts[0::2]), slots=tuple(parts[1::2]))
+
+
+@dataclass
+class CompiledLayout:
+    """BaseLayout compiled to per-directory skeletons for one SiteConfig."""
+
+    site_config: SiteConfig
+    skeletons: dict[tuple, Skeleton] = field(default_factory=dict)
+
+    def skeleton_for(
+        self, pagename: str, css_files: tuple = (), js_files: tuple = ()
+    ) -> Skeleton:
+        """Return the skeleton for a page's directory and assets, compiling it once."""
+        key = (page_directory(pagename), css_files, js_files)
+        skeleton = self.skeletons.get(key)
+        if skeleton is None:
+            skeleton = compile_skeleton(self.site_config, *key)
+            self.skeletons[key] = skeleton
+        return skeleton
+
+    def render(self, page_context: PageContext) -> str:
+        """Render a page to HTML by filling the skeleton's slots."""
+        body = page_context.body
+        with timed("SiteAside"):
+            aside = SiteAside(page_context=page_context, site_config=self.site_config)
+        relative_tree(aside, "/" + page_context.pagename)
+        with timed("serialize"):
+            values = {
+                # <title> content is emitted unescaped by the tree path as well
+                "title": page_context.title,
+                "aside": str(aside),
+                "body": body if isinstance(body, str) else str(body),
+            }
+            skeleton = self.skeleton_for(
+                page_context.pagename, *page_assets(page_context)
+            )
+            return skeleton.fill(values)
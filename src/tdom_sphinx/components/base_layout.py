@@ -1,32 +1,104 @@
+from typing import Callable
+
 from tdom import Node, html
 
+from tdom_sphinx.chrome import get_chrome_cache, page_assets, page_directory
 from tdom_sphinx.components.footer import Footer
-from tdom_sphinx.components.head import Head
+from tdom_sphinx.components.head import Head, make_full_title, with_title
 from tdom_sphinx.components.heading import Heading
 from tdom_sphinx.components.main import Main
 from tdom_sphinx.components.site_aside import SiteAside
+from tdom_sphinx.instrumentation import timed
 from tdom_sphinx.models import PageContext, SiteConfig
+from tdom_sphinx.url import relative_tree
 
 
-def BaseLayout(*, page_context: PageContext, site_config: SiteConfig) -> Node:
-    """Render a basic HTML document shell for Sphinx pages.
+def DocumentShell(
+    *, head: Node, heading: Node, aside: Node, main: Node, footer: Node
+) -> Node:
+    """The HTML5 document skeleton that BaseLayout fills with components.
 
-    Renders a full HTML5 document using components:
-    - <{Head} /> for the <head>
-    - <{Heading} />, <{SiteAside} />, <{Main} />, <{Footer} /> inside <body>
+    Kept separate so the compiled layout can serialize the exact same
+    skeleton once and fill its slots per page.
     """
 
     return html(
         t"""\
 <!DOCTYPE html>
 <html lang=\"EN\">
-<{Head} page_context={page_context} site_config={site_config} />
+{head}
 <body>
-  <{Heading} page_context={page_context} site_config={site_config} />
-  <{SiteAside} page_context={page_context} site_config={site_config} />
-  <{Main} page_context={page_context} />
-  <{Footer} page_context={page_context} site_config={site_config} />
+  {heading}
+  {aside}
+  {main}
+  {footer}
 </body>
 </html>
 """
     )
+
+
+def BaseLayout(*, page_context: PageContext, site_config: SiteConfig) -> Node:
+    """Render a basic HTML document shell for Sphinx pages.
+
+    Renders a full HTML5 document using components:
+    - <{Head} /> for the <head>
+    - <{Heading} />, <{SiteAside} />, <{Main} />, <{Footer} /> inside <body>
+
+    Head, Heading and Footer are page chrome: they are memoized in the
+    chrome cache per site config and page directory. Head is also keyed by
+    the page's css_files and script_files, but not its title; each page gets
+    a copy with its own <title>.
+
+    Components render site-absolute URLs, which relative_tree makes relative
+    to the page. Chrome is rewritten once, before it is cached, so cached
+    nodes are never modified afterwards; the aside and main are rewritten
+    per page.
+    """
+    chrome = get_chrome_cache()
+    directory = page_directory(page_context.pagename)
+    current = "/" + page_context.pagename
+
+    def relative(render: Callable[[], Node]) -> Callable[[], Node]:
+        def render_relative() -> Node:
+            node = render()
+            relative_tree(node, current)
+            return node
+
+        return render_relative
+
+    with timed("Head"):
+        shared_head = chrome.get(
+            site_config,
+            ("head", directory, *page_assets(page_context)),
+            relative(lambda: Head(page_context=page_context, site_config=site_config)),
+        )
+        full_title = make_full_title(page_context=page_context, site_config=site_config)
+        head = with_title(shared_head, full_title)
+    with timed("Heading"):
+        heading = chrome.get(
+            site_config,
+            ("heading", directory),
+            relative(
+                lambda: Heading(page_context=page_context, site_config=site_config)
+            ),
+        )
+    with timed("Footer"):
+        footer = chrome.get(
+            site_config,
+            ("footer", directory),
+            relative(
+                lambda: Footer(page_context=page_context, site_config=site_config)
+            ),
+        )
+    with timed("SiteAside"):
+        aside = SiteAside(page_context=page_context, site_config=site_config)
+        relative_tree(aside, current)
+    with timed("Main"):
+        main = Main(page_context=page_context)
+        relative_tree(main, current)
+
+    with timed("DocumentShell"):
+        return DocumentShell(
+            head=head, heading=heading, aside=aside, main=main, footer=footer
+        )
@@ -1,9 +1,7 @@
-from pathlib import PurePosixPath
-
-from tdom import Node, html
+from tdom import Element, Fragment, Node, Text, html
 
+from tdom_sphinx.assets import FAVICON, STYLESHEETS, AssetManifest
 from tdom_sphinx.models import PageContext, SiteConfig
-from tdom_sphinx.url import relative_tree
 
 
 def make_full_title(
@@ -25,21 +23,104 @@ def make_full_title(
         return f"{title}"
 
 
+def asset_url(filename: str, assets: AssetManifest) -> str:
+    """The site-absolute URL of a Sphinx ``css_files``/``script_files`` entry.
+
+    Files under ``_static`` go through the manifest, so they get their
+    hashed name when there is one. Full URLs are left alone.
+    """
+    if "://" in filename or filename.startswith("/"):
+        return filename
+    if filename.startswith("_static/"):
+        return assets.url(filename.removeprefix("_static/"))
+    return "/" + filename
+
+
+def _asset(entry: object) -> tuple[str, dict[str, str]]:
+    """The filename and attributes of a Sphinx asset, or of a plain string."""
+    filename = getattr(entry, "filename", entry) or ""
+    return str(filename), dict(getattr(entry, "attributes", {}))
+
+
+def page_stylesheets(page_context: PageContext, assets: AssetManifest) -> list[Node]:
+    """``<link>`` elements for the page's ``css_files``.
+
+    Stylesheets Head already links to, and repeated entries, are skipped.
+    """
+    seen = {assets.url(name) for name in STYLESHEETS}
+    links = []
+    for entry in page_context.css_files:
+        filename, attributes = _asset(entry)
+        href = asset_url(filename, assets)
+        if href in seen:
+            continue
+        seen.add(href)
+        attrs = {"rel": "stylesheet", **attributes, "href": href}
+        links.append(html(t"<link {attrs} />"))
+    return links
+
+
+def page_scripts(page_context: PageContext, assets: AssetManifest) -> list[Node]:
+    """``<script>`` elements for the page's ``script_files``.
+
+    An entry without a filename is an inline script; its ``body`` attribute
+    is the script text, as in Sphinx's own ``js_tag``.
+    """
+    scripts = []
+    for entry in page_context.js_files:
+        filename, attributes = _asset(entry)
+        body = attributes.pop("body", "")
+        if filename:
+            attributes["src"] = asset_url(filename, assets)
+        scripts.append(html(t"<script {attributes}>{body}</script>"))
+    return scripts
+
+
 def Head(*, page_context: PageContext, site_config: SiteConfig | None = None) -> Node:
     # Generate the full title using page context and site config
     full_title = make_full_title(page_context=page_context, site_config=site_config)
 
+    # Content-hashed asset URLs, when the build made a manifest
+    assets = site_config.assets if site_config is not None else None
+    if assets is None:
+        assets = AssetManifest()
+    stylesheets = [
+        html(t'<link rel="stylesheet" href={assets.url(name)} />')
+        for name in STYLESHEETS
+    ]
+    stylesheets += page_stylesheets(page_context, assets)
+    scripts = page_scripts(page_context, assets)
+    favicon = assets.url(FAVICON)
+
     result = html(t"""
 <head>
   <meta charset="utf-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1" />
   <title>{full_title}</title>
-  <link rel="stylesheet" href="/_static/tdom-sphinx.css" />
-  <link rel="stylesheet" href="/_static/pico.css" />
-  <link rel="stylesheet" href="/_static/sphinx.css" />
-  <link rel="stylesheet" href="/_static/pygments.css" />
-  <link rel="icon" href="/_static/favicon.ico"  type="image/x-icon" />
+  {stylesheets}
+  <link rel="icon" href={favicon}  type="image/x-icon" />
+  {scripts}
 </head>  
 """)
-    relative_tree(result, PurePosixPath("/" + page_context.pagename))
     return result
+
+
+def with_title(head: Node, full_title: str) -> Node:
+    """Return ``head`` with the text of its ``<title>`` replaced.
+
+    Only the nodes on the way down to the ``<title>`` are copied; every
+    other child, and the attribute dicts, are shared with ``head``. This
+    lets one rendered head serve every page of a directory.
+    """
+    if isinstance(head, Element) and head.tag == "title":
+        return Element("title", {}, [Text(full_title)])
+    if isinstance(head, (Element, Fragment)):
+        for index, child in enumerate(head.children):
+            replaced = with_title(child, full_title)
+            if replaced is not child:
+                children = list(head.children)
+                children[index] = replaced
+                if isinstance(head, Element):
+                    return Element(head.tag, head.attrs, children)
+                return Fragment(children)
+    return head
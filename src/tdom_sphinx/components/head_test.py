@@ -1,6 +1,14 @@
+from dataclasses import replace
+
 from tdom import html
 
-from tdom_sphinx.components.head import Head, make_full_title
+from tdom_sphinx.assets import AssetManifest
+from tdom_sphinx.components.head import (
+    Head,
+    asset_url,
+    make_full_title,
+    with_title,
+)
 
 
 def test_head(page_context, site_config):
@@ -24,3 +32,70 @@ def test_make_full_title_without_site_config(page_context):
     assert (
         make_full_title(page_context=page_context, site_config=None) == "My Test Page"
     )
+
+
+def test_head_links_to_plain_static_urls(page_context, site_config):
+    result_str = str(Head(page_context=page_context, site_config=site_config))
+    assert '<link rel="stylesheet" href="/_static/pico.css" />' in result_str
+    assert 'href="/_static/favicon.ico"' in result_str
+
+
+def test_head_links_to_hashed_assets(page_context, site_config):
+    assets = AssetManifest({"pico.css": "/_static/pico.0123456789abcdef.css"})
+    site_config = replace(site_config, assets=assets)
+
+    result_str = str(Head(page_context=page_context, site_config=site_config))
+    assert 'href="/_static/pico.0123456789abcdef.css"' in result_str
+    # Assets missing from the manifest keep their plain URL
+    assert 'href="/_static/sphinx.css"' in result_str
+
+
+class _Script:
+    """Stands in for Sphinx's ``_JavaScript``."""
+
+    def __init__(self, filename: str, **attributes: str):
+        self.filename = filename
+        self.priority = 500
+        self.attributes = attributes
+
+
+def test_asset_url():
+    assets = AssetManifest({"basic.css": "/_static/basic.0123456789abcdef.css"})
+    assert asset_url("_static/basic.css", assets) == (
+        "/_static/basic.0123456789abcdef.css"
+    )
+    assert asset_url("_static/other.css", assets) == "/_static/other.css"
+    assert asset_url("_images/a.css", assets) == "/_images/a.css"
+    assert asset_url("https://example.com/a.js", assets) == "https://example.com/a.js"
+
+
+def test_head_links_page_css_and_scripts(page_context, site_config):
+    assets = AssetManifest({"doctools.js": "/_static/doctools.0123456789abcdef.js"})
+    page_context = replace(
+        page_context,
+        css_files=("_static/pygments.css", "_static/basic.css", "_static/basic.css"),
+        js_files=(
+            _Script("", body="var DOCUMENTATION_OPTIONS = {};"),
+            _Script("_static/doctools.js", defer="defer"),
+        ),
+    )
+    site_config = replace(site_config, assets=assets)
+
+    result_str = str(Head(page_context=page_context, site_config=site_config))
+    # Already linked by Head, or repeated: linked once
+    assert result_str.count('href="/_static/pygments.css"') == 1
+    assert result_str.count('href="/_static/basic.css"') == 1
+    assert "<script>var DOCUMENTATION_OPTIONS = {};</script>" in result_str
+    assert (
+        '<script defer="defer" src="/_static/doctools.0123456789abcdef.js"></script>'
+        in result_str
+    )
+
+
+def test_with_title_copies_only_the_title(page_context, site_config):
+    head = Head(page_context=page_context, site_config=site_config)
+    retitled = with_title(head, "Other Page - My Test Site")
+
+    assert "<title>Other Page - My Test Site</title>" in str(retitled)
+    assert "<title>My Test Page - My Test Site</title>" in str(head)
+    assert str(retitled).replace("Other Page", "My Test Page") == str(head)
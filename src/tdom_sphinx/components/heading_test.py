@@ -23,19 +23,19 @@ def test_heading_wraps_navbar_and_is_fixed(
     nav_element = get_by_role(container, "navigation")
     assert nav_element.tag == "nav"
 
-    # Brand should come from site_title, and href should be relative to the current page
-    # Since page_context.pagename is "index" and brand href is "/", it becomes "index"
+    # Brand should come from site_title; its href "/" is only made relative
+    # to the current page by BaseLayout
     # Check that the nav contains the expected text
     nav_text = get_text_content(nav_element)
     assert "My Test Site" in nav_text
 
-    # Find all links and check for the brand link with href="index"
+    # Find all links and check for the brand link with href="/"
     all_links = get_all_by_role(container, "link")
     brand_anchor = None
     for link in all_links:
-        if link.attrs.get("href") == "index":
+        if link.attrs.get("href") == "/":
             brand_anchor = link
             break
 
     assert brand_anchor is not None
-    assert brand_anchor.attrs.get("href") == "index"
+    assert brand_anchor.attrs.get("href") == "/"
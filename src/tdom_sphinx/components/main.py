@@ -1,7 +1,7 @@
-from markupsafe import Markup
 from tdom import Node, html
 
 from tdom_sphinx.models import PageContext
+from tdom_sphinx.nodes import RawHTML
 
 
 def Main(*, page_context: PageContext) -> Node:
@@ -9,14 +9,16 @@ def Main(*, page_context: PageContext) -> Node:
 
     Renders a <main> element whose contents are the raw HTML body provided by
     Sphinx in page_context['body'].
-    The body is wrapped in Markup to avoid escaping.
+    The body is wrapped in a RawHTML node, so it is spliced in verbatim
+    without being escaped, copied or parsed.
     """
-    safe_body = Markup(page_context.body)
+    body = page_context.body
+    raw_body = RawHTML(body if isinstance(body, str) else str(body))
 
     return html(
         t"""
 <main>
-  {safe_body}
+  {raw_body}
 </main>
 """
     )
@@ -1,8 +1,11 @@
+from dataclasses import replace
+
 from tdom import html
 
 from tdom_sphinx.aria_testing import get_by_role
 from tdom_sphinx.aria_testing.utils import get_text_content
 from tdom_sphinx.components.main import Main
+from tdom_sphinx.nodes import RawHTML
 
 
 def test_main_includes_body_from_context(page_context):
@@ -18,3 +21,14 @@ def test_main_includes_body_from_context(page_context):
     # The main element should contain the raw HTML from page_context.body
     main_html = str(main_element)
     assert "<p>Hello World</p>" in main_html
+
+
+def test_main_splices_body_without_copying(page_context):
+    body = "<table><tr><td>cell</td></tr></table>"
+    local = replace(page_context, body=body)
+    container = html(t"<{Main} page_context={local} />")
+
+    main_element = get_by_role(container, "main")
+    raw = next(c for c in main_element.children if isinstance(c, RawHTML))
+    assert raw.text is body
+    assert body in str(main_element)
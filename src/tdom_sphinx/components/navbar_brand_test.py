@@ -18,8 +18,8 @@ def test_navbar_brand_renders_brand_link_and_title(page_context):
     # Find the link containing the brand text
     link_element = get_by_role(container, "link")
     assert link_element.tag == "a"
-    # Since page_context.pagename is "index", "/" should be converted to "index" by relative_tree
-    assert link_element.attrs.get("href") == "index"
+    # The href is made relative by BaseLayout, not by the component
+    assert link_element.attrs.get("href") == "/"
 
     # Check that the link contains the expected text
     link_text = get_text_content(link_element).strip()
@@ -1,10 +1,8 @@
 from typing import Sequence
 
-from pathlib import PurePosixPath
 from tdom import Node, html
 
 from tdom_sphinx.models import IconLink, Link
-from tdom_sphinx.url import relative_tree
 
 
 def NavbarLinks(
@@ -18,8 +16,8 @@ def NavbarLinks(
     Renders a list of text links followed by a list of icon buttons.
 
     This version does not use Sphinx pathto; it renders the provided hrefs
-    as-is, then rewrites internal absolute URLs to be relative to the current
-    page by calling relative_tree on the resulting Node.
+    as-is. BaseLayout rewrites internal absolute URLs to be relative to the
+    current page in one pass over the whole document.
     """
 
     link_nodes = [
@@ -44,16 +42,10 @@ def NavbarLinks(
 
     items = [*link_nodes, *button_nodes]
 
-    result = html(
+    return html(
         t"""
 <ul>
   {items}
 </ul>
 """
     )
-
-    # Make hrefs in this subtree relative to the current page
-    current = PurePosixPath("/" + pagename)
-    relative_tree(result, current)
-
-    return result
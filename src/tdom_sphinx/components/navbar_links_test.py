@@ -41,15 +41,15 @@ def test_navbar_links_renders_links_and_buttons(page_context):
 
     for link in all_links:
         href = link.attrs.get("href", "")
-        if href == "docs":
+        if href == "/docs":
             docs_link = link
-        elif href == "about":
+        elif href == "/about":
             about_link = link
 
     assert docs_link is not None
     assert docs_link.tag == "a"
-    assert docs_link.attrs.get("href") == "docs"
+    assert docs_link.attrs.get("href") == "/docs"
 
     assert about_link is not None
     assert about_link.tag == "a"
-    assert about_link.attrs.get("href") == "about"
+    assert about_link.attrs.get("href") == "/about"
@@ -0,0 +1,47 @@
+from tdom import Node, html
+from tdom.nodes import Fragment as TFragment
+
+from tdom_sphinx.models import PageContext
+from tdom_sphinx.page_index import NO_PAGE, PageIndex
+
+
+def _page_link(index: PageIndex, number: int, rel: str | None = None) -> Node:
+    href = "/" + index.target_uri(number)
+    return html(t"<a href={href} rel={rel}>{index.title(number)}</a>")
+
+
+def PageLinks(*, page_context: PageContext) -> Node:
+    """Render a breadcrumb and previous/next links from the page index.
+
+    Renders nothing unless the page context carries the build-wide
+    ``PageIndex`` (``tdom_page_index = True``). Every lookup is by page
+    number, so the links cost the same on a site of any size.
+    Hrefs are site-absolute; BaseLayout makes them relative to the page.
+    """
+    index = page_context.page_index
+    number = NO_PAGE if index is None else index.number(page_context.pagename)
+    if index is None or number == NO_PAGE:
+        return TFragment(children=[])
+
+    crumbs = [
+        html(t"<li>{_page_link(index, n)}</li>") for n in index.ancestors(number)
+    ]
+    pages = [
+        _page_link(index, n, rel)
+        for n, rel in ((index.prev(number), "prev"), (index.next(number), "next"))
+        if n != NO_PAGE
+    ]
+
+    return html(
+        t"""
+<nav aria-label="Breadcrumb">
+  <ol>
+    {crumbs}
+    <li aria-current="page">{index.title(number)}</li>
+  </ol>
+</nav>
+<nav aria-label="Pages">
+  {pages}
+</nav>
+"""
+    )
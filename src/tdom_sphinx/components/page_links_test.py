@@ -0,0 +1,57 @@
+from array import array
+from dataclasses import replace
+
+from tdom import html
+
+from tdom_sphinx.aria_testing import get_all_by_role, get_by_label_text
+from tdom_sphinx.aria_testing.utils import get_text_content
+from tdom_sphinx.components.page_links import PageLinks
+from tdom_sphinx.components.site_aside import SiteAside
+from tdom_sphinx.page_index import NO_PAGE, PageIndex
+
+
+def _page_index() -> PageIndex:
+    docnames = ("index", "guide/index", "guide/intro")
+    return PageIndex(
+        docnames=docnames,
+        titles=("Home", "Guide", "Intro"),
+        target_uris=("index.html", "guide/index.html", "guide/intro.html"),
+        parents=array("i", [NO_PAGE, 0, 1]),
+        prevs=array("i", [NO_PAGE, 0, 1]),
+        nexts=array("i", [1, 2, NO_PAGE]),
+        meta_columns={},
+        numbers={docname: number for number, docname in enumerate(docnames)},
+    )
+
+
+def test_page_links_render_nothing_without_page_index(page_context):
+    container = html(t"<div><{PageLinks} page_context={page_context} /></div>")
+    assert str(container) == "<div></div>"
+
+
+def test_page_links_render_breadcrumb_and_prev_next(page_context):
+    local = replace(page_context, pagename="guide/index", page_index=_page_index())
+    container = html(t"<div><{PageLinks} page_context={local} /></div>")
+
+    breadcrumb = get_by_label_text(container, "Breadcrumb")
+    links = get_all_by_role(breadcrumb, "link")
+    assert [link.attrs["href"] for link in links] == ["/index.html"]
+    assert "Guide" in get_text_content(breadcrumb)
+
+    pages = get_by_label_text(container, "Pages")
+    links = get_all_by_role(pages, "link")
+    assert [(link.attrs["rel"], link.attrs["href"]) for link in links] == [
+        ("prev", "/index.html"),
+        ("next", "/guide/intro.html"),
+    ]
+
+
+def test_page_links_follow_the_site_aside_navigation(page_context):
+    local = replace(page_context, pagename="guide/intro", page_index=_page_index())
+    container = html(t"<{SiteAside} page_context={local} />")
+
+    breadcrumb = get_by_label_text(container, "Breadcrumb")
+    items = get_all_by_role(breadcrumb, "listitem")
+    assert [get_text_content(item) for item in items] == ["Home", "Guide", "Intro"]
+    pages = get_all_by_role(get_by_label_text(container, "Pages"), "link")
+    assert [link.attrs["rel"] for link in pages] == ["prev"]
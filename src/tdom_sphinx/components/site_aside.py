@@ -1,10 +1,9 @@
-from pathlib import PurePosixPath
-
 from tdom import Node, html
 from tdom.nodes import Element as TElement, Fragment as TFragment, Text as TText
 
+from tdom_sphinx.components.page_links import PageLinks
+from tdom_sphinx.instrumentation import timed
 from tdom_sphinx.models import PageContext, SiteConfig
-from tdom_sphinx.url import relative_tree
 
 
 def toc_to_tree(toc_node: Node | None, *, hide_root: bool | None = True, site_title: str | None = None) -> Node:
@@ -208,23 +207,36 @@ def SiteAside(*, page_context: PageContext, site_config: SiteConfig | None = Non
 
     This component renders an <aside> element containing semantic navigation
     generated from the toctree content using toc_to_tree().
-    Uses relative_tree to make hrefs relative to the current page.
+    Hrefs are left as given; BaseLayout makes them relative to the page.
+
+    When the page context carries the build-wide site navigation, that is
+    rendered instead; its hrefs are already relative to the page. The page's
+    own toc, and the hide_root check against the site title, are then not
+    used. With the build-wide page index, <{PageLinks} /> follows the
+    navigation.
     """
+    page_links = PageLinks(page_context=page_context)
+    if page_context.navigation is not None:
+        site_nav = page_context.navigation.render(page_context.pagename)
+        return html(
+            t"""
+<aside id="site-aside">
+  {site_nav}{page_links}
+</aside>
+"""
+        )
+
     # Convert toctree content to semantic navigation HTML
     site_title = site_config.site_title if site_config else None
-    semantic_nav = toc_to_tree(page_context.toc, hide_root=True, site_title=site_title)
+    with timed("toc_to_tree"):
+        semantic_nav = toc_to_tree(
+            page_context.toc, hide_root=True, site_title=site_title
+        )
 
-    result = html(
+    return html(
         t"""
 <aside id="site-aside">
-  {semantic_nav}
+  {semantic_nav}{page_links}
 </aside>
 """
     )
-
-    # Make hrefs in this subtree relative to the current page
-    # This must happen after the HTML is constructed so relative_tree can process the DOM
-    current = PurePosixPath("/" + page_context.pagename)
-    relative_tree(result, current)
-
-    return result
@@ -57,10 +57,10 @@ def test_site_aside_renders_toctree_content():
     links = get_all_by_role(site_aside, "link")
     assert len(links) == 2
 
-    # The URLs should be made relative to the current page
-    assert links[0].attrs["href"] == "docs.html"  # Relative to the current page
+    # The URLs are made relative to the current page by BaseLayout, not here
+    assert links[0].attrs["href"] == "/docs.html"
     assert get_text_content(links[0]) == "Documentation"
-    assert links[1].attrs["href"] == "api.html"  # Relative to the current page
+    assert links[1].attrs["href"] == "/api.html"
     assert get_text_content(links[1]) == "API"
 
 
@@ -0,0 +1,150 @@
+"""Fingerprint page inputs so unchanged pages are neither rendered nor written.
+
+Sphinx hands every outdated page to the builder, including pages whose only
+"change" is a toctree context that renders to the same HTML. With
+``tdom_fingerprint_pages = True`` each page's ``PageContext`` and the
+``SiteConfig`` are hashed before rendering. If the hash matches the one
+recorded in the output directory's manifest for the last build, and the
+output file is still there, the page is skipped.
+
+The manifest also stores a hash of the package's own source and the
+installed versions of tdom-sphinx and tdom; if either changes, every page is
+rendered again.
+
+Sphinx may write pages in worker processes. Fingerprints recorded there are
+appended to a per-process journal file, and the main process merges the
+journals into the manifest when the build finishes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field, fields
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Mapping
+
+from tdom import Node
+
+from tdom_sphinx.journal import WorkerJournal
+from tdom_sphinx.models import PageContext, SiteConfig
+from tdom_sphinx.navigation import SiteNavigation
+from tdom_sphinx.page_index import PageIndex
+
+MANIFEST_NAME = ".tdom-sphinx-fingerprints.json"
+
+PACKAGE_ROOT = Path(__file__).parent
+
+
+def _installed_version(distribution: str) -> str:
+    try:
+        return version(distribution)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@cache
+def code_fingerprint() -> str:
+    """Hash the package's Python source and the installed package versions."""
+    digest = hashlib.blake2b(digest_size=16)
+    for distribution in ("tdom-sphinx", "tdom"):
+        digest.update(f"{distribution}={_installed_version(distribution)}\n".encode())
+    for path in sorted(PACKAGE_ROOT.rglob("*.py")):
+        digest.update(path.relative_to(PACKAGE_ROOT).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _field_text(value: object, pagename: str) -> str:
+    """A stable text form of one PageContext field."""
+    if isinstance(value, Node):
+        return str(value)
+    if isinstance(value, SiteNavigation):
+        # Hash only what the site-wide navigation renders for this page
+        return str(value.render(pagename))
+    if isinstance(value, PageIndex):
+        # Only the page's own row and the pages related to it
+        return value.page_text(pagename)
+    if callable(value):
+        # e.g. Sphinx's toctree() helper, whose repr holds an address
+        return getattr(value, "__qualname__", type(value).__qualname__)
+    if isinstance(value, (tuple, list)):
+        items = ", ".join(_field_text(item, pagename) for item in value)
+        return f"[{items}]"
+    if isinstance(value, Mapping):
+        items = ", ".join(
+            f"{key!r}: {_field_text(item, pagename)}"
+            for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))
+        )
+        return f"{{{items}}}"
+    if hasattr(value, "filename") and hasattr(value, "attributes"):
+        # Sphinx's CSS and JS assets have no __repr__, so theirs holds an
+        # address that changes with every build process
+        attributes = sorted(dict(getattr(value, "attributes")).items())
+        priority = getattr(value, "priority", None)
+        return f"asset({getattr(value, 'filename')!r}, {priority!r}, {attributes!r})"
+    return repr(value)
+
+
+def page_fingerprint(page_context: PageContext, site_config: SiteConfig) -> str:
+    """Hash everything a page's rendered output depends on."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(site_config).encode())
+    for f in fields(page_context):
+        value = getattr(page_context, f.name)
+        digest.update(f"\0{f.name}\0".encode())
+        digest.update(_field_text(value, page_context.pagename).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class PageFingerprints:
+    """The fingerprint manifest for one output directory."""
+
+    outdir: Path
+    code: str
+    journal: WorkerJournal
+    previous: dict[str, str] = field(default_factory=dict)
+    current: dict[str, str] = field(default_factory=dict)
+    skipped: int = 0
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.outdir / MANIFEST_NAME
+
+    @classmethod
+    def load(cls, outdir: Path) -> PageFingerprints:
+        """Read the manifest, ignoring it if it was written by other code."""
+        outdir = Path(outdir)
+        journal = WorkerJournal(outdir, "fingerprints")
+        # Journals left behind by an interrupted build can't be trusted
+        journal.clear()
+        fingerprints = cls(outdir=outdir, code=code_fingerprint(), journal=journal)
+        try:
+            data = json.loads(fingerprints.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return fingerprints
+        if isinstance(data, dict) and data.get("code") == fingerprints.code:
+            fingerprints.previous = dict(data.get("pages", {}))
+        return fingerprints
+
+    def is_unchanged(self, pagename: str, fingerprint: str) -> bool:
+        """True if the page was last written from inputs with this fingerprint."""
+        return self.previous.get(pagename) == fingerprint
+
+    def record(self, pagename: str, fingerprint: str) -> None:
+        """Remember the fingerprint of a page that was just written."""
+        self.current[pagename] = fingerprint
+        if self.journal.in_worker():
+            self.journal.append([[pagename, fingerprint]])
+
+    def save(self) -> None:
+        """Merge worker journals and write the manifest."""
+        pages = {**self.previous, **self.current}
+        pages.update(self.journal.drain())
+        data = {"code": self.code, "pages": pages}
+        self.manifest_path.write_text(
+            json.dumps(data, sort_keys=True), encoding="utf-8"
+        )
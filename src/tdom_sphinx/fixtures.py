@@ -16,6 +16,7 @@ from tdom_sphinx.models import (
     Link,
     NavbarConfig,
     PageContext,
+    RenderSnapshot,
     SiteConfig,
 )
 
@@ -138,7 +139,9 @@ def sphinx_context(sphinx_app: SphinxTestApp, page_context: PageContext) -> dict
         "project": "My Test Site",
         "title": page_context.title,
         "body": page_context.body,
-        "sphinx_app": sphinx_app,
+        "render_snapshot": RenderSnapshot(
+            site_config=getattr(sphinx_app, "site_config")
+        ),
         "page_context": page_context,
     }
 
@@ -0,0 +1,390 @@
+"""Opt-in build instrumentation: timed spans around the render pipeline.
+
+Code paths worth measuring are wrapped in ``with timed("Name"):``. When no
+``Instrumentation`` is installed, ``timed`` returns a shared no-op context
+manager, so the disabled cost is one global lookup and an empty ``with``.
+
+With ``tdom_timings = True`` an ``Instrumentation`` is installed at
+builder-inited. It records every span's name, page, start and duration.
+Spans recorded in ``-j`` write workers go through a ``WorkerJournal``, and at
+build-finished the report is written to ``tdom-timings.json`` and
+``tdom-timings.txt`` in the output directory.
+
+With ``tdom_memory_profile = True`` memory is traced with ``tracemalloc``
+as well. Each span then also records its peak allocation, and each page the
+peak allocation from ``html-page-context`` to the end of
+``TdomBridge.render``. The heaviest pages and components are written to
+``tdom-memory.json`` and ``tdom-memory.txt``.
+
+With ``tdom_trace = True`` the spans are also written as Chrome trace-event
+JSON to ``tdom-trace.json``, for a flame view of the build in Perfetto or
+``chrome://tracing``. Each process gets its own track, so ``-j`` workers
+show up side by side.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import time
+import tracemalloc
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from tdom_sphinx.journal import WorkerJournal
+
+TIMINGS_NAME = "tdom-timings"
+MEMORY_NAME = "tdom-memory"
+TRACE_NAME = "tdom-trace.json"
+
+_NULL_SPAN = nullcontext()
+
+
+class Span(NamedTuple):
+    """One timed call. Times are ``perf_counter_ns`` values.
+
+    ``peak_bytes`` is the most memory allocated during the call, above what
+    was allocated when it started; it is 0 unless memory is traced.
+    """
+
+    name: str
+    page: str | None
+    start_ns: int
+    duration_ns: int
+    pid: int
+    peak_bytes: int = 0
+
+
+class PageMemory(NamedTuple):
+    """Peak allocation while a page was prepared and rendered."""
+
+    page: str
+    peak_bytes: int
+    pid: int
+
+
+@dataclass
+class Instrumentation:
+    """Collects spans, and optionally memory use, for one build."""
+
+    journal: WorkerJournal
+    page_journal: WorkerJournal
+    memory: bool = False
+    spans: list[Span] = field(default_factory=list)
+    pages: list[PageMemory] = field(default_factory=list)
+    page: str | None = None
+    depth: int = 0
+    started_tracemalloc: bool = False
+    # For each open span (and the open page): the highest peak seen inside it
+    # before tracemalloc's one peak was reset for a span nested in it
+    _peaks: list[int] = field(default_factory=list)
+    _page_start: int = 0
+    _page_level: int | None = None
+
+    def _enter_peak(self) -> int:
+        current, peak = tracemalloc.get_traced_memory()
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        self._peaks.append(0)
+        tracemalloc.reset_peak()
+        return current
+
+    def _exit_peak(self, start: int) -> int:
+        peak = max(tracemalloc.get_traced_memory()[1], self._peaks.pop())
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        return peak - start
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Record how long the body of the ``with`` takes."""
+        self.depth += 1
+        memory_start = self._enter_peak() if self.memory else 0
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            peak_bytes = self._exit_peak(memory_start) if self.memory else 0
+            self.depth -= 1
+            self.spans.append(
+                Span(name, self.page, start, end - start, os.getpid(), peak_bytes)
+            )
+            if self.depth == 0 and self.journal.in_worker():
+                self.flush()
+
+    def begin_page(self, pagename: str) -> None:
+        """A page's rendering starts: attribute spans to it, measure memory."""
+        self.page = pagename
+        if self.memory:
+            if self._page_level is not None:
+                # The previous page was never rendered; drop its measurement
+                del self._peaks[self._page_level :]
+            self._page_level = len(self._peaks)
+            self._page_start = self._enter_peak()
+
+    def end_page(self) -> None:
+        """The page is rendered: record its peak allocation."""
+        if self.memory and self.page is not None and self._page_level is not None:
+            peak_bytes = self._exit_peak(self._page_start)
+            self.pages.append(PageMemory(self.page, peak_bytes, os.getpid()))
+            self._page_level = None
+            if self.journal.in_worker():
+                self.flush()
+        self.page = None
+
+    @contextmanager
+    def for_page(self, pagename: str) -> Iterator[None]:
+        """Attribute spans inside the ``with`` to a page."""
+        previous, self.page = self.page, pagename
+        try:
+            yield
+        finally:
+            self.page = previous
+
+    def flush(self) -> None:
+        """Move this worker's spans and pages into its journal files."""
+        if self.spans:
+            self.journal.append(self.spans)
+            self.spans.clear()
+        if self.pages:
+            self.page_journal.append(self.pages)
+            self.pages.clear()
+
+    def collect(self) -> list[Span]:
+        """All spans of the build, including those from write workers."""
+        return [*self.spans, *(Span(*record) for record in self.journal.drain())]
+
+    def collect_pages(self) -> list[PageMemory]:
+        """All page memory records, including those from write workers."""
+        drained = (PageMemory(*record) for record in self.page_journal.drain())
+        return [*self.pages, *drained]
+
+
+_instrumentation: Instrumentation | None = None
+
+
+def get_instrumentation() -> Instrumentation | None:
+    """Return the installed instrumentation, if any."""
+    return _instrumentation
+
+
+def install_instrumentation(outdir: Path, *, memory: bool = False) -> Instrumentation:
+    """Start collecting spans for a build writing to ``outdir``.
+
+    With ``memory``, also start tracemalloc if it isn't tracing already.
+    """
+    global _instrumentation
+    reset_instrumentation()
+    journal = WorkerJournal(Path(outdir), "spans")
+    page_journal = WorkerJournal(Path(outdir), "pages")
+    journal.clear()
+    page_journal.clear()
+    _instrumentation = Instrumentation(
+        journal=journal, page_journal=page_journal, memory=memory
+    )
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _instrumentation.started_tracemalloc = True
+    return _instrumentation
+
+
+def reset_instrumentation() -> None:
+    """Stop collecting spans, and stop tracemalloc if we started it."""
+    global _instrumentation
+    if _instrumentation is not None and _instrumentation.started_tracemalloc:
+        tracemalloc.stop()
+    _instrumentation = None
+
+
+def timed(name: str) -> AbstractContextManager[None]:
+    """Time a block as a span called ``name``, if instrumentation is on."""
+    instrumentation = _instrumentation
+    if instrumentation is None:
+        return _NULL_SPAN
+    return instrumentation.span(name)
+
+
+def begin_page(pagename: str) -> None:
+    """Start measuring a page, if instrumentation is on."""
+    instrumentation = _instrumentation
+    if instrumentation is not None:
+        instrumentation.begin_page(pagename)
+
+
+def end_page() -> None:
+    """Finish measuring the current page, if instrumentation is on."""
+    instrumentation = _instrumentation
+    if instrumentation is not None:
+        instrumentation.end_page()
+
+
+def for_page(pagename: str) -> AbstractContextManager[None]:
+    """Attribute spans inside the block to a page, if instrumentation is on."""
+    instrumentation = _instrumentation
+    if instrumentation is None:
+        return _NULL_SPAN
+    return instrumentation.for_page(pagename)
+
+
+def _percentile(ordered: list[int], q: float) -> int:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def timing_report(spans: list[Span]) -> dict[str, dict[str, float]]:
+    """Count, total, p50 and p99 (in milliseconds) per span name.
+
+    Spans nest, so a span's time includes the spans inside it.
+    """
+    durations: dict[str, list[int]] = {}
+    for span in spans:
+        durations.setdefault(span.name, []).append(span.duration_ns)
+
+    report = {}
+    for name, values in durations.items():
+        values.sort()
+        report[name] = {
+            "count": len(values),
+            "total_ms": round(sum(values) / 1e6, 3),
+            "p50_ms": round(_percentile(values, 0.50) / 1e6, 3),
+            "p99_ms": round(_percentile(values, 0.99) / 1e6, 3),
+        }
+    return dict(sorted(report.items(), key=lambda item: -item[1]["total_ms"]))
+
+
+def format_timing_report(report: dict[str, dict[str, float]]) -> str:
+    """Render a timing report as an aligned text table."""
+    width = max([len("span"), *(len(name) for name in report)])
+    lines = [
+        f"{'span':<{width}}  {'count':>8}  {'total ms':>12}"
+        f"  {'p50 ms':>10}  {'p99 ms':>10}"
+    ]
+    for name, row in report.items():
+        lines.append(
+            f"{name:<{width}}  {row['count']:>8}  {row['total_ms']:>12.3f}"
+            f"  {row['p50_ms']:>10.3f}  {row['p99_ms']:>10.3f}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def write_timing_report(outdir: Path, spans: list[Span]) -> Path:
+    """Write the JSON and text timing reports; return the JSON path."""
+    report = timing_report(spans)
+    json_path = Path(outdir) / f"{TIMINGS_NAME}.json"
+    json_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    text_path = Path(outdir) / f"{TIMINGS_NAME}.txt"
+    text_path.write_text(format_timing_report(report), encoding="utf-8")
+    return json_path
+
+
+def memory_report(
+    pages: list[PageMemory], spans: list[Span], top: int = 10
+) -> dict[str, list[dict[str, object]]]:
+    """The ``top`` pages by peak allocation, and each span's peaks in KiB.
+
+    A span's peak includes the spans inside it, as with timings.
+    """
+    heaviest = sorted(pages, key=lambda page: -page.peak_bytes)[:top]
+
+    by_name: dict[str, list[Span]] = {}
+    for span in spans:
+        by_name.setdefault(span.name, []).append(span)
+
+    components = []
+    for name, calls in by_name.items():
+        largest = max(calls, key=lambda span: span.peak_bytes)
+        total = sum(span.peak_bytes for span in calls)
+        components.append(
+            {
+                "name": name,
+                "count": len(calls),
+                "mean_kb": round(total / len(calls) / 1024, 1),
+                "max_kb": round(largest.peak_bytes / 1024, 1),
+                "max_page": largest.page,
+            }
+        )
+    components.sort(key=lambda row: -row["max_kb"])
+
+    return {
+        "pages": [
+            {"page": page.page, "peak_kb": round(page.peak_bytes / 1024, 1)}
+            for page in heaviest
+        ],
+        "components": components,
+    }
+
+
+def format_memory_report(report: dict[str, list[dict[str, object]]]) -> str:
+    """Render a memory report as two aligned text tables."""
+    lines = [f"{'peak KiB':>12}  page"]
+    for row in report["pages"]:
+        lines.append(f"{row['peak_kb']:>12.1f}  {row['page']}")
+    lines.append("")
+    lines.append(f"{'max KiB':>12}  {'mean KiB':>10}  {'count':>8}  span (page of max)")
+    for row in report["components"]:
+        lines.append(
+            f"{row['max_kb']:>12.1f}  {row['mean_kb']:>10.1f}  {row['count']:>8}"
+            f"  {row['name']} ({row['max_page']})"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def write_memory_report(
+    outdir: Path, pages: list[PageMemory], spans: list[Span], top: int = 10
+) -> Path:
+    """Write the JSON and text memory reports; return the JSON path."""
+    report = memory_report(pages, spans, top)
+    json_path = Path(outdir) / f"{MEMORY_NAME}.json"
+    json_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    text_path = Path(outdir) / f"{MEMORY_NAME}.txt"
+    text_path.write_text(format_memory_report(report), encoding="utf-8")
+    return json_path
+
+
+def trace_events(spans: list[Span], main_pid: int) -> list[dict[str, object]]:
+    """Chrome trace events: one complete ("X") event per span.
+
+    ``perf_counter_ns`` is a system-wide monotonic clock on Linux and macOS,
+    so spans from forked workers line up with the main process.
+    """
+    events: list[dict[str, object]] = []
+    for pid in sorted({span.pid for span in spans} | {main_pid}):
+        name = "sphinx" if pid == main_pid else f"write worker {pid}"
+        events.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": pid,
+                "args": {"name": name},
+            }
+        )
+    for span in sorted(spans, key=lambda span: span.start_ns):
+        args: dict[str, object] = {"page": span.page}
+        if span.peak_bytes:
+            args["peak_bytes"] = span.peak_bytes
+        events.append(
+            {
+                "name": span.name,
+                "cat": "tdom_sphinx",
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": span.duration_ns / 1000,
+                "pid": span.pid,
+                "tid": span.pid,
+                "args": args,
+            }
+        )
+    return events
+
+
+def write_trace(outdir: Path, spans: list[Span], main_pid: int) -> Path:
+    """Write the spans as a Chrome trace-event file; return its path."""
+    path = Path(outdir) / TRACE_NAME
+    trace = {"traceEvents": trace_events(spans, main_pid), "displayTimeUnit": "ms"}
+    path.write_text(json.dumps(trace) + "\n", encoding="utf-8")
+    return path
@@ -0,0 +1,52 @@
+"""Hand records from forked write workers back to the main Sphinx process.
+
+With ``sphinx-build -j N`` pages are written in forked processes that exit
+when their chunk is done, so anything they collect in memory is lost. A
+``WorkerJournal`` lets them append JSON records to a per-process file in
+the output directory; the main process drains those files at the end of
+the build.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+
+@dataclass
+class WorkerJournal:
+    """Per-process JSON-lines files named ``.tdom-sphinx-<name>.<pid>.jsonl``."""
+
+    directory: Path
+    name: str
+    owner_pid: int = field(default_factory=os.getpid)
+
+    @property
+    def pattern(self) -> str:
+        return f".tdom-sphinx-{self.name}.*.jsonl"
+
+    def in_worker(self) -> bool:
+        """True when running in a process forked from the owner."""
+        return os.getpid() != self.owner_pid
+
+    def append(self, records: Iterable[Any]) -> None:
+        """Append records to this process's journal file."""
+        path = self.directory / f".tdom-sphinx-{self.name}.{os.getpid()}.jsonl"
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+
+    def drain(self) -> Iterator[Any]:
+        """Yield every record from every journal file, deleting the files."""
+        for path in sorted(self.directory.glob(self.pattern)):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+            path.unlink()
+
+    def clear(self) -> None:
+        """Delete journal files, e.g. ones left behind by an interrupted build."""
+        for path in self.directory.glob(self.pattern):
+            path.unlink()
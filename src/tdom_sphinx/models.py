@@ -1,8 +1,14 @@
 from dataclasses import dataclass
-from typing import Iterable, List, Protocol
+from typing import TYPE_CHECKING, Iterable, List, Protocol
 
 from tdom import Node
 
+if TYPE_CHECKING:
+    from tdom_sphinx.assets import AssetManifest
+    from tdom_sphinx.compiled_layout import CompiledLayout
+    from tdom_sphinx.navigation import SiteNavigation
+    from tdom_sphinx.page_index import PageIndex
+
 
 class _FunctionView(Protocol):
     def __call__(self, context: dict) -> str: ...
@@ -44,7 +50,9 @@ class PageContext:
     builder: str = "html"
     meta: object = None
     metatags: str = ""
+    navigation: "SiteNavigation | None" = None
     next: object | None = None
+    page_index: "PageIndex | None" = None
     parents: object = None
     prev: object | None = None
     rellinks: tuple = tuple()
@@ -81,3 +89,17 @@ class SiteConfig:
     root_url: str = "/"
     copyright: str | None = None
     make_relative: bool = True
+    assets: "AssetManifest | None" = None
+
+
+@dataclass(frozen=True)
+class RenderSnapshot:
+    """The build-wide inputs the template bridge renders pages with.
+
+    Created once at builder-inited and put in each page's context instead of
+    the Sphinx app. It holds only plain, picklable data, so pages can be
+    rendered in parallel write workers without reaching back into the app.
+    """
+
+    site_config: SiteConfig
+    compiled_layout: "CompiledLayout | None" = None
@@ -0,0 +1,171 @@
+"""Build-wide site navigation, computed once per build.
+
+``SiteAside`` normally re-parses each page's toc HTML and rebuilds the
+navigation tree for every page. With ``tdom_site_navigation = True`` the
+navigation is instead built once from the Sphinx environment's toctrees at
+``env-updated``. Its HTML is serialized once per page directory (hrefs are
+relative to the directory) and each page only marks its own links with
+``aria-current="page"``.
+
+The aside then differs from the default one. It lists the whole site,
+starting below the root document, instead of the page's own ``toc``, so
+the sections of the current page are not listed. The root document is
+never shown. The default aside only hides it when its title matches the
+site title (``hide_root``).
+"""
+
+from __future__ import annotations
+
+import posixpath
+from dataclasses import dataclass, field
+from typing import Iterator, Mapping, Sequence
+
+from markupsafe import escape
+from sphinx.builders import Builder
+from sphinx.environment import BuildEnvironment
+
+from tdom_sphinx.chrome import page_directory
+from tdom_sphinx.nodes import RawHTML
+from tdom_sphinx.url import relative_href
+
+CURRENT_ATTR = ' aria-current="page"'
+
+
+@dataclass(frozen=True)
+class NavEntry:
+    """A document in the site navigation and the documents it includes."""
+
+    docname: str
+    title: str
+    children: tuple[NavEntry, ...] = ()
+
+
+def build_site_navigation(env: BuildEnvironment, builder: Builder) -> SiteNavigation:
+    """Build the site navigation from a Sphinx environment's toctrees."""
+    titles = {docname: title.astext() for docname, title in env.titles.items()}
+    entries = build_nav_entries(env.config.root_doc, env.toctree_includes, titles)
+    # Resolve URIs now so the navigation holds only plain, picklable data
+    target_uris = {
+        entry.docname: builder.get_target_uri(entry.docname)
+        for entry in iter_entries(entries)
+    }
+    return SiteNavigation(entries=entries, target_uris=target_uris)
+
+
+def iter_entries(entries: Sequence[NavEntry]) -> Iterator[NavEntry]:
+    """Yield every entry in the tree, depth first."""
+    for entry in entries:
+        yield entry
+        yield from iter_entries(entry.children)
+
+
+def build_nav_entries(
+    root_doc: str,
+    toctree_includes: Mapping[str, Sequence[str]],
+    titles: Mapping[str, str],
+) -> tuple[NavEntry, ...]:
+    """Turn Sphinx's toctree includes into a tree of NavEntry below root_doc.
+
+    Documents already on the current path are skipped, so recursive
+    toctrees cannot loop.
+    """
+
+    def entries(docname: str, path: frozenset[str]) -> tuple[NavEntry, ...]:
+        result = []
+        for child in toctree_includes.get(docname, ()):
+            if child in path:
+                continue
+            result.append(
+                NavEntry(
+                    docname=child,
+                    title=titles.get(child, child),
+                    children=entries(child, path | {child}),
+                )
+            )
+        return tuple(result)
+
+    return entries(root_doc, frozenset([root_doc]))
+
+
+@dataclass(frozen=True)
+class RenderedNav:
+    """Navigation HTML for one directory, with where each link's tag starts.
+
+    A document can appear more than once (included by several toctrees),
+    so each docname maps to the offsets of all its links, in order.
+    """
+
+    html: str
+    link_offsets: Mapping[str, Sequence[int]]
+
+
+@dataclass
+class SiteNavigation:
+    """The site navigation, rendered lazily once per page directory."""
+
+    entries: tuple[NavEntry, ...]
+    target_uris: Mapping[str, str]
+    rendered: dict[str, RenderedNav] = field(default_factory=dict)
+
+    def render(self, pagename: str) -> RawHTML:
+        """Return the navigation HTML for a page, with its links marked current."""
+        nav = self.rendered_for(page_directory(pagename))
+        offsets = nav.link_offsets.get(pagename)
+        if not offsets:
+            return RawHTML(nav.html)
+        parts = []
+        start = 0
+        for offset in offsets:
+            parts.append(nav.html[start:offset])
+            parts.append(CURRENT_ATTR)
+            start = offset
+        parts.append(nav.html[start:])
+        return RawHTML("".join(parts))
+
+    def rendered_for(self, directory: str) -> RenderedNav:
+        """Return the navigation rendered for a directory, rendering it once."""
+        nav = self.rendered.get(directory)
+        if nav is None:
+            nav = self._render_directory(directory)
+            self.rendered[directory] = nav
+        return nav
+
+    def _render_directory(self, directory: str) -> RenderedNav:
+        if not self.entries:
+            return RenderedNav(html="", link_offsets={})
+
+        current = posixpath.join(directory, "index")
+        parts: list[str] = []
+        offsets: dict[str, list[int]] = {}
+        length = 0
+
+        def emit(s: str) -> None:
+            nonlocal length
+            parts.append(s)
+            length += len(s)
+
+        def link(entry: NavEntry) -> None:
+            href = relative_href(current, "/" + self.target_uris[entry.docname])
+            emit("<a")
+            # The current page's aria-current attribute goes right here
+            offsets.setdefault(entry.docname, []).append(length)
+            emit(f' href="{escape(href)}">{escape(entry.title)}</a>')
+
+        def item(entry: NavEntry) -> None:
+            if not entry.children:
+                link(entry)
+                return
+            emit('<details open="open"><summary>')
+            link(entry)
+            emit("</summary><ul>")
+            for child in entry.children:
+                emit("<li>")
+                item(child)
+                emit("</li>")
+            emit("</ul></details>")
+
+        emit('<nav role="navigation" aria-label="Table of contents">')
+        for entry in self.entries:
+            item(entry)
+        emit("</nav>")
+        return RenderedNav(html="".join(parts), link_offsets=offsets)
@@ -0,0 +1,71 @@
+"""Node types tdom_sphinx adds on top of tdom's own."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from tdom import Fragment, Node, Text
+
+from tdom_sphinx.utils import html_string_to_tdom
+
+
+@dataclass(slots=True)
+class RawHTML(Text):
+    """Trusted HTML that is spliced into the output verbatim.
+
+    Unlike ``Text(Markup(...))``, the string is neither escaped nor copied
+    when serialized, and it is never parsed into child nodes. Walkers see it
+    as a ``Text`` node, so text extraction keeps working.
+    """
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class LazyHTML(Fragment):
+    """An HTML string that is parsed into children only when they are used.
+
+    Until ``children`` is read, the node serializes to its source string
+    verbatim and nothing is parsed. Reading ``children`` (as walkers and
+    tree transforms do) parses the source once with ``html_string_to_tdom``;
+    from then on the node serializes its children, so changes made to them
+    show up in the output.
+
+    The source stays unparsed when the node is put in a tree directly, e.g.
+    ``Element("main", children=[node])``, or reaches a template inside a
+    ``SafeNode``, which tdom interpolates through ``__html__``. It is parsed
+    when the node itself is interpolated into a t-string: tdom flattens
+    fragments into their parent by reading ``children``.
+    """
+
+    __slots__ = ("source", "_parsed")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._parsed: list[Node] | None = None
+
+    @property
+    def is_parsed(self) -> bool:
+        return self._parsed is not None
+
+    @property
+    def children(self) -> list[Node]:  # type: ignore[override]
+        if self._parsed is None:
+            parsed = html_string_to_tdom(self.source)
+            if isinstance(parsed, Fragment):
+                self._parsed = list(parsed.children)
+            else:
+                self._parsed = [parsed]
+        return self._parsed
+
+    @children.setter
+    def children(self, children: list[Node]) -> None:
+        self._parsed = list(children)
+
+    def __str__(self) -> str:
+        if self._parsed is None:
+            return self.source
+        return "".join(str(child) for child in self._parsed)
+
+    def __repr__(self) -> str:
+        return f"LazyHTML({self.source!r}, parsed={self.is_parsed})"
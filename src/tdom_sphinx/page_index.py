@@ -0,0 +1,155 @@
+"""A build-wide, columnar index of page titles, relations and metadata.
+
+Breadcrumbs and prev/next links need to look at other pages than the one
+being rendered. With ``tdom_page_index = True`` a ``PageIndex`` is built
+once at ``env-updated`` from the Sphinx environment and handed to every
+page as ``PageContext.page_index``; ``components.page_links.PageLinks``
+renders a page's breadcrumb and previous/next links from it.
+
+Pages are numbered in reading order (Sphinx's prev/next chain from the
+root document, then any remaining documents by name). Each property is one
+column indexed by page number: strings are interned tuples, and the parent,
+previous and next page numbers are ``array("i")`` columns with ``-1`` for
+"none". Metadata is stored per key as a sparse ``{page number: value}``
+mapping, since most pages set few keys. Every lookup is O(1), and the
+index grows by a few machine words per page.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Iterator, Mapping
+
+from sphinx.builders import Builder
+from sphinx.environment import BuildEnvironment
+
+NO_PAGE = -1
+
+
+@dataclass(frozen=True, eq=False)
+class PageIndex:
+    """Columns of page data, indexed by page number."""
+
+    docnames: tuple[str, ...]
+    titles: tuple[str, ...]
+    target_uris: tuple[str, ...]
+    parents: array
+    prevs: array
+    nexts: array
+    meta_columns: Mapping[str, Mapping[int, str]]
+    numbers: Mapping[str, int]
+
+    def __len__(self) -> int:
+        return len(self.docnames)
+
+    def number(self, docname: str) -> int:
+        """The page number of a document, or ``NO_PAGE``."""
+        return self.numbers.get(docname, NO_PAGE)
+
+    def title(self, number: int) -> str:
+        return self.titles[number]
+
+    def target_uri(self, number: int) -> str:
+        return self.target_uris[number]
+
+    def parent(self, number: int) -> int:
+        return self.parents[number]
+
+    def prev(self, number: int) -> int:
+        return self.prevs[number]
+
+    def next(self, number: int) -> int:
+        return self.nexts[number]
+
+    def meta(self, number: int, key: str, default: str | None = None) -> str | None:
+        """One metadata value of a page."""
+        column = self.meta_columns.get(key)
+        if column is None:
+            return default
+        return column.get(number, default)
+
+    def ancestors(self, number: int) -> list[int]:
+        """The page numbers from the top-level page down to the page's parent."""
+        result = []
+        parent = self.parents[number]
+        while parent != NO_PAGE and parent not in result:
+            result.append(parent)
+            parent = self.parents[parent]
+        result.reverse()
+        return result
+
+    def iter_pages(self) -> Iterator[int]:
+        """Page numbers in reading order."""
+        return iter(range(len(self.docnames)))
+
+    def page_text(self, docname: str) -> str:
+        """What this index can contribute to a page, as stable text.
+
+        Used by page fingerprinting instead of hashing the whole index.
+        """
+        number = self.number(docname)
+        if number == NO_PAGE:
+            return ""
+        related = [*self.ancestors(number), self.prev(number), self.next(number)]
+        rows = [
+            (self.docnames[n], self.titles[n], self.target_uris[n])
+            for n in related
+            if n != NO_PAGE
+        ]
+        meta = sorted(
+            (key, column[number])
+            for key, column in self.meta_columns.items()
+            if number in column
+        )
+        return repr((rows, meta))
+
+
+def build_page_index(env: BuildEnvironment, builder: Builder) -> PageIndex:
+    """Build the page index from a Sphinx environment."""
+    relations = env.collect_relations()
+
+    # Reading order: the prev/next chain from the root, then everything else
+    ordered: list[str] = []
+    seen: set[str] = set()
+    docname: str | None = env.config.root_doc
+    while docname is not None and docname not in seen and docname in env.all_docs:
+        ordered.append(docname)
+        seen.add(docname)
+        docname = relations.get(docname, (None, None, None))[2]
+    ordered.extend(sorted(set(env.all_docs) - seen))
+
+    numbers = {sys.intern(docname): number for number, docname in enumerate(ordered)}
+
+    def number_of(docname: str | None) -> int:
+        return numbers.get(docname, NO_PAGE) if docname else NO_PAGE
+
+    parents = array("i")
+    prevs = array("i")
+    nexts = array("i")
+    meta_columns: dict[str, dict[int, str]] = {}
+    for number, docname in enumerate(ordered):
+        parent, prev, next_ = relations.get(docname, (None, None, None))
+        parents.append(number_of(parent))
+        prevs.append(number_of(prev))
+        nexts.append(number_of(next_))
+        for key, value in env.metadata.get(docname, {}).items():
+            column = meta_columns.setdefault(sys.intern(key), {})
+            column[number] = sys.intern(str(value))
+
+    titles = tuple(
+        sys.intern(env.titles[docname].astext()) if docname in env.titles else ""
+        for docname in ordered
+    )
+    target_uris = tuple(builder.get_target_uri(docname) for docname in ordered)
+    return PageIndex(
+        docnames=tuple(numbers),
+        titles=titles,
+        target_uris=target_uris,
+        parents=parents,
+        prevs=prevs,
+        nexts=nexts,
+        meta_columns=meta_columns,
+        numbers=numbers,
+    )
@@ -0,0 +1,129 @@
+"""Stream rendered pages to disk instead of materializing the output string.
+
+Sphinx's HTML builder asks the template bridge for the whole page as one
+string and then writes it. With ``tdom_stream_pages = True`` the builder's
+``handle_page`` is wrapped by a ``PageWriter``: the bridge hands it the
+rendered tdom tree, and the writer serializes it chunk by chunk straight
+into the output file. Sphinx's own write is pointed at ``os.devnull``.
+
+The writer is also installed for ``tdom_fingerprint_pages``: a page the
+bridge skipped because its inputs are unchanged has nothing deferred, so
+its existing output file is left alone.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+from sphinx.builders.html import StandaloneHTMLBuilder
+from sphinx.util import logging
+from tdom import Node
+
+from tdom_sphinx.fingerprint import PageFingerprints
+from tdom_sphinx.instrumentation import for_page, timed
+from tdom_sphinx.serialize import iter_html
+from tdom_sphinx.tree_stats import get_tree_stats_collector
+
+logger = logging.getLogger(__name__)
+
+
+class PageWriter:
+    """Writes pages for an HTML builder from trees deferred by the bridge."""
+
+    def __init__(
+        self,
+        builder: StandaloneHTMLBuilder,
+        fingerprints: PageFingerprints | None = None,
+    ) -> None:
+        self.builder = builder
+        self.fingerprints = fingerprints
+        self.pending: dict[str, tuple[Node | str, str | None]] = {}
+        self._handle_page: Callable[..., None] = builder.handle_page
+
+    @classmethod
+    def install(
+        cls,
+        builder: StandaloneHTMLBuilder,
+        fingerprints: PageFingerprints | None = None,
+    ) -> PageWriter:
+        """Wrap the builder's ``handle_page`` with a new writer."""
+        writer = cls(builder, fingerprints)
+        builder.handle_page = writer.handle_page  # type: ignore[method-assign]
+        return writer
+
+    def is_unchanged(self, pagename: str, fingerprint: str) -> bool:
+        """True if the page's output on disk was written from the same inputs."""
+        if self.fingerprints is None:
+            return False
+        if not self.fingerprints.is_unchanged(pagename, fingerprint):
+            return False
+        if not self.builder.get_output_path(pagename).exists():
+            return False
+        self.fingerprints.skipped += 1
+        return True
+
+    def defer(
+        self, pagename: str, output: Node | str, fingerprint: str | None = None
+    ) -> None:
+        """Called by the bridge: keep the page output until it is written."""
+        self.pending[pagename] = (output, fingerprint)
+
+    def handle_page(
+        self,
+        pagename: str,
+        addctx: dict[str, Any],
+        templatename: str = "page.html",
+        *,
+        outfilename: Path | None = None,
+        event_arg: Any = None,
+    ) -> None:
+        """Let Sphinx prepare and render the page, then write it ourselves."""
+        if outfilename:
+            output_path = Path(outfilename)
+        else:
+            output_path = self.builder.get_output_path(pagename)
+
+        self._handle_page(
+            pagename,
+            addctx,
+            templatename,
+            outfilename=Path(os.devnull),
+            event_arg=event_arg,
+        )
+
+        # Nothing deferred means Sphinx gave up on rendering this page, or
+        # the bridge skipped it as unchanged
+        deferred = self.pending.pop(pagename, None)
+        if deferred is None:
+            return
+        output, fingerprint = deferred
+        with for_page(pagename), timed("serialize"):
+            written = self.write(output_path, output)
+        # Opt-in: measure the page, taking its size from the file just written
+        collector = get_tree_stats_collector()
+        if written and collector is not None:
+            collector.record(pagename, output, output_path.stat().st_size)
+        if written and fingerprint is not None:
+            assert self.fingerprints is not None
+            self.fingerprints.record(pagename, fingerprint)
+
+    def write(self, output_path: Path, output: Node | str) -> bool:
+        """Write a page, serializing trees in chunks. Return True on success."""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(
+                output_path,
+                "w",
+                encoding=self.builder.config.html_output_encoding,
+                errors="xmlcharrefreplace",
+            ) as f:
+                if isinstance(output, str):
+                    f.write(output)
+                else:
+                    f.writelines(iter_html(output))
+        except OSError as err:
+            logger.warning("error writing file %s: %s", output_path, err)
+            return False
+        return True
@@ -0,0 +1,145 @@
+"""Content-addressed cache of parsed HTML strings.
+
+The same HTML is parsed many times in a build: every page's toctree
+snippet, and any string ``tdom_safe.safe_node`` is given that looks like
+HTML. ``html_string_to_tdom`` looks strings up here by a BLAKE2b digest of
+their content, so a repeated parse becomes a hash and a copy. Only
+strings up to ``PARSE_CACHE_MAX_SOURCE`` bytes are cached: the small
+snippets are the ones that repeat, and a large page body would only hold
+memory without ever being hit.
+
+Callers are free to mutate the trees they get back (``relative_tree``
+rewrites attributes in place), so the cached tree is never handed out.
+A miss stores a clone and returns the fresh parse; each hit returns a
+clone with fresh elements, attribute dicts and child lists. ``Text`` nodes
+are shared, since nothing in tdom_sphinx modifies a text node in place.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Callable, NamedTuple
+
+from tdom import Element, Fragment, Node
+
+PARSE_CACHE_SIZE = 1024
+PARSE_CACHE_BYTES = 4 * 1024 * 1024
+PARSE_CACHE_MAX_SOURCE = 8 * 1024
+
+
+def clone_tree(node: Node) -> Node:
+    """Copy the elements and fragments of a tree, sharing its leaves."""
+    if not isinstance(node, (Element, Fragment)):
+        return node
+    clone = _shallow_copy(node)
+    stack = [clone]
+    while stack:
+        parent = stack.pop()
+        children = parent.children
+        for index, child in enumerate(children):
+            if isinstance(child, (Element, Fragment)):
+                children[index] = child = _shallow_copy(child)
+                stack.append(child)
+    return clone
+
+
+def _shallow_copy(node: Element | Fragment) -> Element | Fragment:
+    if isinstance(node, Element):
+        return Element(node.tag, attrs=dict(node.attrs), children=list(node.children))
+    return Fragment(children=list(node.children))
+
+
+class ParseCacheInfo(NamedTuple):
+    """Hit rate and size of a ``ParseCache``."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    source_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class ParseCache:
+    """LRU cache of parsed trees keyed by a digest of the HTML.
+
+    Bounded by entry count and by the total size of the cached HTML strings,
+    which is a proxy for the memory the trees hold. Strings longer than
+    ``max_source_bytes`` are parsed without being cached.
+    """
+
+    max_entries: int = PARSE_CACHE_SIZE
+    max_bytes: int = PARSE_CACHE_BYTES
+    max_source_bytes: int = PARSE_CACHE_MAX_SOURCE
+    entries: OrderedDict[bytes, tuple[Node, int]] = field(default_factory=OrderedDict)
+    source_bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def parse(self, html_string: str, parse: Callable[[str], Node]) -> Node:
+        """Return a clone of the cached tree for the HTML, parsing on a miss."""
+        limit = min(self.max_bytes, self.max_source_bytes)
+        if len(html_string) > limit or self.max_entries <= 0:
+            # UTF-8 is at least one byte per character: too big to cache
+            self.misses += 1
+            return parse(html_string)
+        encoded = html_string.encode("utf-8", "surrogatepass")
+        key = blake2b(encoded, digest_size=16).digest()
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return clone_tree(entry[0])
+
+        self.misses += 1
+        node = parse(html_string)
+        size = len(encoded)
+        if size <= limit:
+            self.entries[key] = (clone_tree(node), size)
+            self.source_bytes += size
+            self._evict()
+        return node
+
+    def _evict(self) -> None:
+        while (
+            len(self.entries) > self.max_entries or self.source_bytes > self.max_bytes
+        ):
+            _, (_, size) = self.entries.popitem(last=False)
+            self.source_bytes -= size
+            self.evictions += 1
+
+    def info(self) -> ParseCacheInfo:
+        """Counters and current size."""
+        return ParseCacheInfo(
+            self.hits, self.misses, self.evictions, len(self.entries), self.source_bytes
+        )
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self.entries.clear()
+        self.source_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+# Global cache instance
+_parse_cache = ParseCache()
+
+
+def get_parse_cache() -> ParseCache:
+    """Get the global parse cache."""
+    return _parse_cache
+
+
+def reset_parse_cache() -> None:
+    """Reset the global parse cache (useful for testing)."""
+    _parse_cache.clear()
@@ -0,0 +1,66 @@
+"""Chunked serialization of tdom trees.
+
+``str(node)`` builds the whole document as one string, recursively. The
+serializer here walks the tree with an explicit stack and yields the HTML in
+chunks, so callers can write a page to disk without ever holding the full
+output string. Joining the chunks gives exactly ``str(node)``.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+from markupsafe import escape
+from tdom import Element, Fragment, Node, Text
+
+from tdom_sphinx.nodes import LazyHTML
+
+
+def _attrs_html(attrs: dict[str, str | None]) -> str:
+    """Serialize attributes the same way tdom's Element does."""
+    return "".join(
+        f" {key}" if value is None else f' {key}="{escape(value)}"'
+        for key, value in attrs.items()
+    )
+
+
+def iter_html(node: Node) -> Iterator[str]:
+    """Yield the HTML for a tdom tree in document order.
+
+    Element open and close tags and text nodes are yielded as separate
+    chunks. Node types this module does not know about are serialized with
+    ``str()``.
+    """
+    # Items are either nodes still to visit or closing tags to emit
+    stack: list[Node | str] = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif type(item) is Text:
+            yield escape(item.text)
+        elif isinstance(item, Element):
+            tag = item.tag
+            attrs = _attrs_html(item.attrs)
+            if item.is_void:
+                yield f"<{tag}{attrs} />"
+            elif not item.children:
+                yield f"<{tag}{attrs}></{tag}>"
+            elif item.is_content:
+                # Content elements (script, style, title, ...) are not escaped
+                yield f"<{tag}{attrs}>"
+                yield "".join(
+                    child.text if isinstance(child, Text) else str(child)
+                    for child in item.children
+                )
+                yield f"</{tag}>"
+            else:
+                yield f"<{tag}{attrs}>"
+                stack.append(f"</{tag}>")
+                stack.extend(reversed(item.children))
+        elif isinstance(item, LazyHTML) and not item.is_parsed:
+            yield item.source
+        elif isinstance(item, Fragment):
+            stack.extend(reversed(item.children))
+        else:
+            yield str(item)
@@ -5,15 +5,48 @@ Separated from package __init__ to keep responsibilities clear and ease testing.
 
 from __future__ import annotations
 
+from dataclasses import replace
 from typing import Any, Mapping
 
 from markupsafe import Markup
 from sphinx.application import Sphinx
+from sphinx.builders import Builder
+from sphinx.builders.html import StandaloneHTMLBuilder
+from sphinx.environment import BuildEnvironment
+from sphinx.util import logging
 
-from tdom_sphinx.models import PageContext, Rellink, SiteConfig
+from tdom_sphinx.assets import AssetManifest, install_asset_manifest
+from tdom_sphinx.chrome import page_directory, reset_chrome_cache
+from tdom_sphinx.compiled_layout import CompiledLayout
+from tdom_sphinx.fingerprint import PageFingerprints
+from tdom_sphinx.instrumentation import (
+    begin_page,
+    for_page,
+    get_instrumentation,
+    install_instrumentation,
+    reset_instrumentation,
+    timed,
+    write_memory_report,
+    write_timing_report,
+    write_trace,
+)
+from tdom_sphinx.models import PageContext, Rellink, RenderSnapshot, SiteConfig
+from tdom_sphinx.navigation import SiteNavigation, build_site_navigation
+from tdom_sphinx.page_index import PageIndex, build_page_index
+from tdom_sphinx.page_writer import PageWriter
+from tdom_sphinx.parse_cache import get_parse_cache, reset_parse_cache
+from tdom_sphinx.tree_stats import (
+    get_tree_stats_collector,
+    install_tree_stats_collector,
+    reset_tree_stats_collector,
+    write_tree_stats,
+)
+from tdom_sphinx.template_bridge import TdomBridge
 from tdom_sphinx.utils import html_string_to_tdom
 from tdom import Node
 
+logger = logging.getLogger(__name__)
+
 
 def _parse_toc(toc_html: str | object | None) -> Node | None:
     """Parse toctree HTML into a tdom Node.
@@ -35,8 +68,15 @@ def make_page_context(
     templatename: str,
     toc_num_entries: Mapping[str, int],
     document_metadata: Mapping[str, object],
+    navigation: SiteNavigation | None = None,
+    page_index: PageIndex | None = None,
 ) -> PageContext:
-    """Given some Sphinx context information, make a PageContext."""
+    """Given some Sphinx context information, make a PageContext.
+
+    With a ``page_index`` the layout reads related pages from it, so the
+    per-page copies of Sphinx's rellinks, prev and next are left out.
+    """
+    related = context if page_index is None else {}
     rellinks = tuple(
         Rellink(
             pagename=link[0],
@@ -44,14 +84,14 @@ def make_page_context(
             title=link[1],
             accesskey=link[2],
         )
-        for link in context.get("rellinks", ())
+        for link in related.get("rellinks", ())
     )
 
     display_toc = (
         toc_num_entries[pagename] > 1 if "pagename" in toc_num_entries else False
     )
     ccf = context.get("css_files")
-    jcf = context.get("css_files")
+    jcf = context.get("script_files")
     # TODO Convert these to Path
     css_files = tuple(ccf) if ccf else ()
     js_files = tuple(jcf) if jcf else ()
@@ -62,10 +102,12 @@ def make_page_context(
         js_files=js_files,
         meta=document_metadata,
         metatags=context.get("metatags", ""),
-        next=context.get("next"),
+        navigation=navigation,
+        next=related.get("next"),
+        page_index=page_index,
         page_source_suffix=context.get("page_source_suffix", "html"),
         pagename=pagename,
-        prev=context.get("prev"),
+        prev=related.get("prev"),
         sourcename=context.get("sourcename"),
         templatename=templatename,
         rellinks=rellinks,
@@ -83,26 +125,107 @@ def _on_html_page_context(
     context: dict,
     doctree,
 ) -> None:
-    """Inject the Sphinx app and selected config into the page context.
+    """Inject the render inputs for the Template Bridge into the page context.
 
-    - Ensure ``context['sphinx_app']`` is available for the Template Bridge.
+    - Attach the build's ``RenderSnapshot`` as ``context['render_snapshot']``.
     - Build a normalized ``PageContext`` and attach it as ``context['page_context']``.
     """
-    # For our Template Bridge
-    context.setdefault("sphinx_app", app)
+    # Per-page memory is measured from here to the end of TdomBridge.render
+    begin_page(pagename)
 
-    # ---- Build and attach PageContext
-    page_ctx = make_page_context(
-        context=context,
-        pagename=pagename,
-        templatename=templatename,
-        toc_num_entries=app.env.toc_num_entries,
-        document_metadata=app.env.metadata[pagename],
+    with for_page(pagename), timed("html-page-context"):
+        # For our Template Bridge
+        context["render_snapshot"] = getattr(app, "render_snapshot", None)
+
+        # ---- Build and attach PageContext
+        with timed("make_page_context"):
+            page_ctx = make_page_context(
+                context=context,
+                pagename=pagename,
+                templatename=templatename,
+                toc_num_entries=app.env.toc_num_entries,
+                document_metadata=app.env.metadata[pagename],
+                navigation=getattr(app, "site_navigation", None),
+                page_index=getattr(app, "page_index", None),
+            )
+        context["page_context"] = page_ctx
+
+
+def _on_env_updated(app: Sphinx, env: BuildEnvironment) -> None:
+    """Build the site navigation and page index once the environment is up to date.
+
+    Only done when ``tdom_site_navigation`` or ``tdom_page_index`` is
+    enabled. Pages then render their aside from the shared navigation
+    instead of their own toc HTML, and can look up other pages in the index.
+    """
+    navigation = None
+    if getattr(app.config, "tdom_site_navigation", False):
+        navigation = build_site_navigation(env, app.builder)
+    setattr(app, "site_navigation", navigation)
+
+    page_index = None
+    if getattr(app.config, "tdom_page_index", False):
+        page_index = build_page_index(env, app.builder)
+    setattr(app, "page_index", page_index)
+
+
+def _on_write_started(app: Sphinx, builder: Builder) -> None:
+    """Fill the per-directory render caches before any page is written.
+
+    With ``sphinx-build -j N`` every chunk of pages is written in a forked
+    process that inherits these caches; without this, each worker would
+    compile the same skeletons and navigation again.
+
+    With the asset manifest, the caches are warmed once the manifest is
+    built instead, since that replaces the SiteConfig they are built for.
+    """
+    if _uses_asset_manifest(app, builder):
+        return
+    _warm_render_caches(app, builder)
+
+
+def _uses_asset_manifest(app: Sphinx, builder: Builder | None) -> bool:
+    """Whether pages link to content-hashed assets in this build."""
+    return bool(getattr(app.config, "tdom_asset_manifest", False)) and isinstance(
+        builder, StandaloneHTMLBuilder
     )
-    context["page_context"] = page_ctx
+
+
+def _warm_render_caches(app: Sphinx, builder: Builder) -> None:
+    """Compile skeletons and render navigation for every page directory."""
+    # One document per directory is enough to warm everything keyed on it
+    by_directory: dict[str, str] = {}
+    for docname in sorted(builder.env.found_docs):
+        by_directory.setdefault(page_directory(docname), docname)
+
+    compiled_layout = getattr(app, "compiled_layout", None)
+    if compiled_layout is not None:
+        assets = _builder_assets(builder)
+        for docname in by_directory.values():
+            compiled_layout.skeleton_for(docname, *assets)
+
+    navigation = getattr(app, "site_navigation", None)
+    if navigation is not None:
+        for directory in by_directory:
+            navigation.rendered_for(directory)
 
 
 def _on_builder_inited(app: Sphinx) -> None:
+    """Start instrumentation, if enabled, then set up the build."""
+    # Time the render pipeline, trace it or its memory, if enabled
+    timings = getattr(app.config, "tdom_timings", False)
+    trace = getattr(app.config, "tdom_trace", False)
+    memory_profile = getattr(app.config, "tdom_memory_profile", False)
+    if timings or trace or memory_profile:
+        install_instrumentation(app.outdir, memory=memory_profile)
+    else:
+        reset_instrumentation()
+
+    with timed("builder-inited"):
+        _setup_build(app)
+
+
+def _setup_build(app: Sphinx) -> None:
     """Create a SiteConfig once at builder init and attach to the app.
 
     We derive defaults from Sphinx config where not provided explicitly in
@@ -126,11 +249,121 @@ def _on_builder_inited(app: Sphinx) -> None:
         root_url = html_baseurl or "/"
         copyright = sphinx_copyright
 
+    # Chrome rendered for a previous build's SiteConfig is no longer valid
+    reset_chrome_cache()
+    reset_parse_cache()
+
+    # Measure the size of every rendered page, if enabled
+    if getattr(app.config, "tdom_tree_stats", False):
+        install_tree_stats_collector(app.outdir)
+    else:
+        reset_tree_stats_collector()
+    setattr(app, "tree_stats", None)
+
+    site_config = SiteConfig(
+        navbar=navbar, site_title=site_title, root_url=root_url, copyright=copyright
+    )
+
+    _use_site_config(app, site_config)
+
+    # Load the fingerprints of the last build's pages, if enabled
+    page_fingerprints = None
+    builder = getattr(app, "builder", None)
+    is_html = isinstance(builder, StandaloneHTMLBuilder)
+    if getattr(app.config, "tdom_fingerprint_pages", False) and is_html:
+        page_fingerprints = PageFingerprints.load(app.outdir)
+    setattr(app, "page_fingerprints", page_fingerprints)
+
+    # Write pages ourselves when streaming or skipping unchanged pages
+    page_writer = None
+    if is_html and (
+        getattr(app.config, "tdom_stream_pages", False) or page_fingerprints is not None
+    ):
+        page_writer = PageWriter.install(builder, page_fingerprints)
+    setattr(app, "page_writer", page_writer)
+    templates = getattr(builder, "templates", None)
+    if isinstance(templates, TdomBridge):
+        templates.page_writer = page_writer
+
+    # Link to content-hashed assets once Sphinx has copied them, if enabled
+    if getattr(app.config, "tdom_asset_manifest", False) and is_html:
+
+        def use_manifest(manifest: AssetManifest) -> None:
+            site_config = getattr(app, "site_config")
+            _use_site_config(app, replace(site_config, assets=manifest))
+            _warm_render_caches(app, builder)
+
+        install_asset_manifest(builder, use_manifest)
+
+
+def _builder_assets(builder: Builder) -> tuple[tuple, tuple]:
+    """The css_files and script_files most pages get, sorted as Sphinx does."""
+
+    def by_priority(name: str) -> tuple:
+        return tuple(sorted(getattr(builder, name, ()), key=lambda a: a.priority))
+
+    return by_priority("_css_files"), by_priority("_js_files")
+
+
+def _use_site_config(app: Sphinx, site_config: SiteConfig) -> None:
+    """Attach a SiteConfig, and everything rendered from it, to the app."""
     # Store on the app for retrieval by the template bridge and others
-    setattr(
-        app,
-        "site_config",
-        SiteConfig(
-            navbar=navbar, site_title=site_title, root_url=root_url, copyright=copyright
-        ),
+    setattr(app, "site_config", site_config)
+
+    # Serialize the static parts of the layout once, if enabled
+    compiled_layout = None
+    if getattr(app.config, "tdom_compiled_layout", False):
+        compiled_layout = CompiledLayout(site_config)
+        compiled_layout.skeleton_for(app.config.root_doc, *_builder_assets(app.builder))
+    setattr(app, "compiled_layout", compiled_layout)
+
+    # Everything the bridge needs per page, without the app itself
+    render_snapshot = RenderSnapshot(
+        site_config=site_config, compiled_layout=compiled_layout
     )
+    setattr(app, "render_snapshot", render_snapshot)
+
+
+def _on_build_finished(app: Sphinx, exception: Exception | None) -> None:
+    """Save the fingerprints and write the reports of this build."""
+    page_fingerprints = getattr(app, "page_fingerprints", None)
+    if page_fingerprints is not None:
+        page_fingerprints.save()
+
+    parse_cache = get_parse_cache().info()
+    logger.verbose(
+        "tdom-sphinx parse cache: %d hits, %d misses (%.0f%%), %d entries, %d KiB",
+        parse_cache.hits,
+        parse_cache.misses,
+        parse_cache.hit_rate * 100,
+        parse_cache.entries,
+        parse_cache.source_bytes // 1024,
+    )
+
+    instrumentation = get_instrumentation()
+    if instrumentation is not None:
+        spans = instrumentation.collect()
+        if getattr(app.config, "tdom_timings", False):
+            report_path = write_timing_report(app.outdir, spans)
+            logger.info("tdom-sphinx timings written to %s", report_path)
+        if getattr(app.config, "tdom_trace", False):
+            main_pid = instrumentation.journal.owner_pid
+            trace_path = write_trace(app.outdir, spans, main_pid)
+            logger.info("tdom-sphinx trace written to %s", trace_path)
+        if instrumentation.memory:
+            report_path = write_memory_report(
+                app.outdir,
+                instrumentation.collect_pages(),
+                spans,
+                top=getattr(app.config, "tdom_memory_top", 10),
+            )
+            logger.info("tdom-sphinx memory report written to %s", report_path)
+        reset_instrumentation()
+
+    collector = get_tree_stats_collector()
+    if collector is not None:
+        tree_stats = collector.collect()
+        setattr(app, "tree_stats", tree_stats)
+        stats_path = write_tree_stats(app.outdir, tree_stats)
+        logger.info("tdom-sphinx tree statistics written to %s", stats_path)
+        reset_tree_stats_collector()
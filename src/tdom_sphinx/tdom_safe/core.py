@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from typing import Union, Any
 
 from tdom import Node, Text, Fragment
-from tdom_sphinx.utils import html_string_to_tdom
+from tdom_sphinx.nodes import LazyHTML
 from .escaping import EscapeWalker, UnescapeWalker
 
 
@@ -72,16 +72,20 @@ def escape_node(input_value: Union[Node, str, Any]) -> SafeNode:
 
 
 def safe_node(input_value: Union[Node, str]) -> SafeNode:
-    """Mark content as safe without escaping."""
+    """Mark content as safe without escaping.
+
+    A string that looks like HTML is wrapped in a ``LazyHTML`` node, so it
+    serializes exactly as written, not normalized by a parse, until
+    something walks into its children.
+    """
     if isinstance(input_value, SafeNode):
         return input_value
     elif isinstance(input_value, Node):
         return SafeNode(input_value, True)
     elif isinstance(input_value, str):
-        # Check if it looks like HTML and parse if so
+        # HTML is parsed only if something walks into it
         if _looks_like_html(input_value):
-            parsed_node = html_string_to_tdom(input_value)
-            return SafeNode(parsed_node, True)
+            return SafeNode(LazyHTML(input_value), True)
         else:
             # Plain text - convert to Text node without escaping
             text_node = Text(input_value)
@@ -72,6 +72,17 @@ def test_safe_node_with_html():
     assert "</em>" in result_str
 
 
+def test_safe_node_with_html_serializes_source_until_walked():
+    """Test that HTML strings are kept as written until something walks them."""
+    html_content = "<p CLASS=lead>One<br>two</p>"
+    safe = safe_node(html_content)
+    assert str(safe) == html_content
+
+    # Walking the tree parses it, and the output is normalized from then on
+    assert count_nodes(safe.node) == 4
+    assert str(safe) == '<p class="lead">One<br />two</p>'
+
+
 def test_safe_node_combination():
     """Test combining safe nodes."""
     safe1 = safe_node("<em>emphasis</em>")
@@ -2,7 +2,11 @@
 
 from sphinx.jinja2glue import BuiltinTemplateLoader
 
-from tdom_sphinx.models import PageContext, SiteConfig
+from tdom_sphinx.fingerprint import page_fingerprint
+from tdom_sphinx.instrumentation import end_page, for_page, timed
+from tdom_sphinx.models import PageContext, RenderSnapshot
+from tdom_sphinx.page_writer import PageWriter
+from tdom_sphinx.tree_stats import get_tree_stats_collector
 from tdom_sphinx.views import DefaultView
 
 
@@ -12,12 +16,53 @@ class TdomBridge(BuiltinTemplateLoader):
     If anything goes wrong, it falls back to the default BuiltinTemplateLoader.
     """
 
+    # Set at builder-inited when pages are written by a PageWriter
+    page_writer: PageWriter | None = None
+
     def render(self, template, context: dict) -> str:
-        # Expect the builder-init event to put Sphinx app into context
-        sphinx_app = context.get("sphinx_app")
+        # Expect the html-page-context event to put the render inputs into context
+        render_snapshot: RenderSnapshot = context["render_snapshot"]
         page_context: PageContext = context["page_context"]
-        # Get SiteConfig from the app, created during builder-inited
-        site_config: SiteConfig = getattr(sphinx_app, "site_config")
-        view = DefaultView(page_context=page_context, site_config=site_config)
-        result = view()
-        return str(result)
+        try:
+            with for_page(page_context.pagename), timed("TdomBridge.render"):
+                return self._render(render_snapshot, page_context)
+        finally:
+            end_page()
+
+    def _render(
+        self, render_snapshot: RenderSnapshot, page_context: PageContext
+    ) -> str:
+        site_config = render_snapshot.site_config
+        page_writer = self.page_writer
+
+        # Opt-in fingerprinting: leave pages built from the same inputs alone
+        fingerprint = None
+        if page_writer is not None and page_writer.fingerprints is not None:
+            fingerprint = page_fingerprint(page_context, site_config)
+            if page_writer.is_unchanged(page_context.pagename, fingerprint):
+                return ""
+
+        # Opt-in fast path: fill the slots of the precompiled layout
+        compiled_layout = render_snapshot.compiled_layout
+        if compiled_layout is not None:
+            result = compiled_layout.render(page_context)
+        else:
+            view = DefaultView(page_context=page_context, site_config=site_config)
+            result = view()
+
+        # The page writer, when installed, writes the output to disk itself
+        # and records its tree stats
+        if page_writer is not None:
+            page_writer.defer(page_context.pagename, result, fingerprint)
+            return ""
+
+        with timed("serialize"):
+            output = str(result)
+
+        # Opt-in: measure the size of the rendered page
+        collector = get_tree_stats_collector()
+        if collector is not None:
+            collector.record(
+                page_context.pagename, result, len(output.encode("utf-8"))
+            )
+        return output
@@ -0,0 +1,147 @@
+"""Opt-in statistics about the size of each rendered page.
+
+With ``tdom_tree_stats = True`` the bridge records a ``TreeStats`` row for
+every page it renders: node count, element depth, text and attribute
+totals, and the size of the serialized output. At build-finished the rows
+are stored as ``app.tree_stats`` and written to ``tdom-tree-stats.csv`` in
+the output directory, so pages whose trees grow out of proportion are easy
+to spot and compare between builds.
+
+Pages rendered with ``tdom_compiled_layout`` are filled into a serialized
+skeleton, so only their output size is known; their tree columns are
+``None``, written as empty cells in the CSV.
+The output size is taken from whatever serialized the page: the bridge's
+string, or the file the ``PageWriter`` wrote. Measuring never serializes a
+page a second time.
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import NamedTuple
+
+from tdom import Element, Fragment, Node, Text
+
+from tdom_sphinx.journal import WorkerJournal
+from tdom_sphinx.nodes import LazyHTML, RawHTML
+from tdom_sphinx.serialize import iter_html
+from tdom_sphinx.utils import html_string_to_tdom
+
+TREE_STATS_NAME = "tdom-tree-stats.csv"
+
+
+class TreeStats(NamedTuple):
+    """Size of one rendered page; tree columns are ``None`` when unknown."""
+
+    page: str
+    nodes: int | None
+    max_depth: int | None
+    text_bytes: int | None
+    attributes: int | None
+    output_bytes: int
+
+
+def tree_stats(
+    page: str, output: Node | str, output_bytes: int | None = None
+) -> TreeStats:
+    """Measure a rendered page, given as a tree or as serialized HTML.
+
+    Nodes are counted as ``tdom_safe.utils.count_nodes`` does: fragments are
+    transparent. Depth counts nested elements. Byte sizes are UTF-8.
+    Markup held as a string, in ``RawHTML`` or an unparsed ``LazyHTML``
+    (such as the page body), is measured by parsing a copy of it, so the
+    node itself is left as it was. Serialized HTML has no tree to measure;
+    its tree columns are ``None``.
+
+    Pass ``output_bytes`` when the page has already been serialized; only
+    without it is a tree serialized to measure its size.
+    """
+    if isinstance(output, str):
+        if output_bytes is None:
+            output_bytes = len(output.encode("utf-8"))
+        return TreeStats(page, None, None, None, None, output_bytes)
+
+    nodes = max_depth = text_bytes = attributes = 0
+    stack: list[tuple[Node, int]] = [(output, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if type(node) is RawHTML:
+            stack.append((html_string_to_tdom(node.text), depth))
+        elif isinstance(node, Text):
+            nodes += 1
+            text_bytes += len(node.text.encode("utf-8"))
+        elif isinstance(node, Element):
+            nodes += 1
+            depth += 1
+            max_depth = max(max_depth, depth)
+            attributes += len(node.attrs)
+            stack.extend((child, depth) for child in node.children)
+        elif isinstance(node, LazyHTML) and not node.is_parsed:
+            stack.append((html_string_to_tdom(node.source), depth))
+        elif isinstance(node, Fragment):
+            stack.extend((child, depth) for child in node.children)
+        else:
+            nodes += 1
+
+    if output_bytes is None:
+        output_bytes = sum(len(chunk.encode("utf-8")) for chunk in iter_html(output))
+    return TreeStats(page, nodes, max_depth, text_bytes, attributes, output_bytes)
+
+
+@dataclass
+class TreeStatsCollector:
+    """Collects ``TreeStats`` rows for one build, including -j workers."""
+
+    journal: WorkerJournal
+    rows: list[TreeStats] = field(default_factory=list)
+
+    def record(
+        self, page: str, output: Node | str, output_bytes: int | None = None
+    ) -> TreeStats:
+        """Measure a page and keep its row."""
+        stats = tree_stats(page, output, output_bytes)
+        if self.journal.in_worker():
+            self.journal.append([stats])
+        else:
+            self.rows.append(stats)
+        return stats
+
+    def collect(self) -> list[TreeStats]:
+        """All rows of the build, sorted by page name."""
+        drained = (TreeStats(*record) for record in self.journal.drain())
+        return sorted([*self.rows, *drained])
+
+
+_collector: TreeStatsCollector | None = None
+
+
+def get_tree_stats_collector() -> TreeStatsCollector | None:
+    """Return the installed collector, if any."""
+    return _collector
+
+
+def install_tree_stats_collector(outdir: Path) -> TreeStatsCollector:
+    """Start collecting tree statistics for a build writing to ``outdir``."""
+    global _collector
+    journal = WorkerJournal(Path(outdir), "tree-stats")
+    journal.clear()
+    _collector = TreeStatsCollector(journal=journal)
+    return _collector
+
+
+def reset_tree_stats_collector() -> None:
+    """Stop collecting tree statistics."""
+    global _collector
+    _collector = None
+
+
+def write_tree_stats(outdir: Path, rows: list[TreeStats]) -> Path:
+    """Write the rows as CSV with a header line; return the path."""
+    path = Path(outdir) / TREE_STATS_NAME
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(TreeStats._fields)
+        writer.writerows(rows)
+    return path
@@ -5,18 +5,34 @@ and pattern matching transformations similar to XSLT, but with modern Python
 syntax and type safety.
 """
 
-from .core import template, apply_templates, select, value_of, copy_of, html
-from .registry import TemplateRegistry, TemplateContext
-from .patterns import PatternMatcher
+from .core import (
+    CloseTag,
+    OpenTag,
+    apply_templates,
+    copy_of,
+    html,
+    iter_apply_templates,
+    select,
+    template,
+    value_of,
+)
+from .registry import TemplateRegistry, TemplateContext, VariableScope
+from .patterns import CompiledPattern, PatternMatcher, compile_pattern
 
 __all__ = [
     "template",
     "apply_templates",
+    "iter_apply_templates",
     "select",
     "value_of",
     "copy_of",
     "html",
+    "OpenTag",
+    "CloseTag",
     "TemplateRegistry",
     "TemplateContext",
+    "VariableScope",
     "PatternMatcher",
+    "CompiledPattern",
+    "compile_pattern",
 ]
@@ -2,22 +2,30 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from functools import wraps
 from string.templatelib import Template
-from typing import Callable, List, Optional, Union
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
+from markupsafe import escape
 from tdom import Element, Fragment, Node, Text
 from tdom import html as tdom_html
 
 from .patterns import PatternMatcher
-from .registry import TemplateContext, get_global_registry
+from .registry import (
+    TemplateContext,
+    TemplateInfo,
+    VariableScope,
+    get_global_registry,
+)
 
 
 def template(pattern: str, priority: int = 0, mode: Optional[str] = None) -> Callable:
     """Decorator to register a template function with a pattern.
 
     Args:
-        pattern: The pattern to match (e.g., "person", "*", "text()")
+        pattern: The pattern to match (e.g., "person", "*", "text()",
+            "list/item[@class='new']"), compiled when the template is registered
         priority: Template priority (higher priority templates match first)
         mode: Optional mode for template processing
 
@@ -48,47 +56,241 @@ def apply_templates(
 ) -> Node:
     """Apply templates to nodes recursively.
 
+    Nodes no template matches are copied, with templates applied to their
+    children. That descent keeps its own stack instead of recursing, so
+    trees nested deeper than Python's recursion limit can be transformed;
+    only templates that call ``apply_templates`` themselves recurse.
+
     Args:
         nodes: Node or list of nodes to process
         mode: Optional mode for template selection
-        context: Template context (created if not provided)
+        context: Template context (created if not provided). The nodes are
+            taken to be children of ``context.current_node`` when matching
+            patterns with parent steps, like ``"list/item"``.
 
     Returns:
         Transformed node tree
     """
-    if context is None:
-        context = TemplateContext(mode=mode)
+    registry = get_global_registry()
+    frame, path = _first_frame(nodes, mode, context)
+    stack: List[_Frame] = []
+
+    while True:
+        if frame.index == len(frame.nodes):
+            # Every node of the frame is done; rebuild the node it belongs to
+            result = _combine(frame.results)
+            if not stack:
+                return result
+            owner = frame.owner
+            frame = stack.pop()
+            path.pop()
+            children = result.children if isinstance(result, Fragment) else [result]
+            if isinstance(owner, Element):
+                frame.results.append(
+                    Element(tag=owner.tag, attrs=owner.attrs.copy(), children=children)
+                )
+            else:
+                frame.results.append(Fragment(children=children))
+            continue
+
+        node = frame.advance()
 
+        # Find matching template
+        template_info = registry.find_template(node, frame.mode, path)
+
+        if template_info is not None:
+            result = frame.apply(template_info, path)
+            if result is not None:
+                frame.results.append(result)
+        elif isinstance(node, (Element, Fragment)) and node.children:
+            # Default behavior: copy the node and apply templates to children
+            stack.append(frame)
+            path.append(node)
+            frame = frame.child_frame(node)
+        elif isinstance(node, Element):
+            frame.results.append(
+                Element(tag=node.tag, attrs=node.attrs.copy(), children=[])
+            )
+        elif isinstance(node, Fragment):
+            frame.results.append(Fragment(children=[]))
+        else:
+            frame.results.append(node)
+
+
+def iter_apply_templates(
+    nodes: Union[Node, List[Node]],
+    mode: Optional[str] = None,
+    context: Optional[TemplateContext] = None,
+) -> Iterator[Node]:
+    """Apply templates to nodes, yielding the output as it is produced.
+
+    The output is that of ``apply_templates``, in document order, without
+    the tree around it: each template's result is yielded as the template
+    returns, and an element no template matches is yielded as an
+    ``OpenTag`` before the output for its children and a ``CloseTag``
+    after. Serializing the nodes one at a time, e.g. with
+    ``tdom_sphinx.serialize.iter_html``, gives ``str(apply_templates(...))``
+    while only one template's output is held in memory.
+
+    Unmatched elements with raw text content (``script``, ``style``,
+    ``textarea``, ``title``) are yielded whole, as their content is
+    serialized differently.
+
+    Args:
+        nodes: Node or list of nodes to process
+        mode: Optional mode for template selection
+        context: Template context, as for ``apply_templates``
+
+    Yields:
+        Output nodes, ``OpenTag`` and ``CloseTag`` markers
+    """
     registry = get_global_registry()
+    frame, path = _first_frame(nodes, mode, context)
+    stack: List[_Frame] = []
+
+    while True:
+        if frame.index == len(frame.nodes):
+            if not stack:
+                return
+            owner = frame.owner
+            frame = stack.pop()
+            path.pop()
+            if isinstance(owner, Element):
+                yield CloseTag(owner.tag)
+            continue
+
+        node = frame.advance()
+        template_info = registry.find_template(node, frame.mode, path)
+
+        if template_info is not None:
+            result = frame.apply(template_info, path)
+            if result is not None:
+                yield result
+        elif isinstance(node, Element) and node.children and node.is_content:
+            frame.context.ancestors = frame.ancestors_tuple(path)
+            result = apply_templates(node.children, frame.context.mode, frame.context)
+            children = result.children if isinstance(result, Fragment) else [result]
+            yield Element(tag=node.tag, attrs=node.attrs.copy(), children=children)
+        elif isinstance(node, (Element, Fragment)) and node.children:
+            if isinstance(node, Element):
+                yield OpenTag(node.tag, node.attrs.copy())
+            stack.append(frame)
+            path.append(node)
+            frame = frame.child_frame(node)
+        elif isinstance(node, Element):
+            yield Element(tag=node.tag, attrs=node.attrs.copy(), children=[])
+        elif not isinstance(node, Fragment):
+            yield node
+
+
+@dataclass(slots=True)
+class OpenTag(Node):
+    """The start tag of an element whose content is yielded after it."""
+
+    tag: str
+    attrs: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        # Attributes are serialized as tdom's Element does
+        attrs = "".join(
+            f" {key}" if value is None else f' {key}="{escape(value)}"'
+            for key, value in self.attrs.items()
+        )
+        return f"<{self.tag}{attrs}>"
+
+
+@dataclass(slots=True)
+class CloseTag(Node):
+    """The end tag of an element whose content was yielded before it."""
+
+    tag: str
+
+    def __str__(self) -> str:
+        return f"</{self.tag}>"
+
+
+@dataclass(slots=True)
+class _Frame:
+    """A list of nodes ``apply_templates`` is working through."""
+
+    nodes: Sequence[Node]
+    mode: Optional[str]
+    context: TemplateContext
+    # The unmatched element or fragment these are the children of
+    owner: Optional[Node] = None
+    index: int = 0
+    results: List[Node] = field(default_factory=list)
+    # The nodes above these, made into a tuple for the first template called
+    ancestors: Optional[Tuple[Node, ...]] = None
+    # The context's own variables, restored if a template replaces them
+    variables: VariableScope = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.variables = self.context.variables
+
+    def advance(self) -> Node:
+        """Move the context to the next node and return it."""
+        node = self.nodes[self.index]
+        self.index += 1
+        # One context for the whole list, moved from node to node; variables
+        # a template sets are dropped before its next sibling, as with a copy
+        context = self.context
+        context.current_node = node
+        context.position = self.index
+        if context.variables is not self.variables:
+            context.variables = self.variables
+        self.variables.reset()
+        return node
+
+    def ancestors_tuple(self, path: List[Node]) -> Tuple[Node, ...]:
+        """The nodes above this frame's, as a tuple for the context."""
+        if self.ancestors is None:
+            self.ancestors = tuple(path)
+        return self.ancestors
+
+    def apply(self, template_info: TemplateInfo, path: List[Node]) -> Optional[Node]:
+        """Apply a template to the current node; return its result as a node."""
+        context = self.context
+        context.ancestors = self.ancestors_tuple(path)
+        result = template_info.function(context.current_node, context)
+        if isinstance(result, Node) or result is None:
+            return result
+        # Convert other types to text nodes
+        return Text(str(result))
+
+    def child_frame(self, node: Node) -> _Frame:
+        """A frame for the children of the current, unmatched node."""
+        children = node.children
+        return _Frame(
+            children,
+            self.context.mode,
+            self.context.copy(size=len(children)),
+            owner=node,
+        )
+
+
+def _first_frame(
+    nodes: Union[Node, List[Node]],
+    mode: Optional[str],
+    context: Optional[TemplateContext],
+) -> Tuple[_Frame, List[Node]]:
+    """The frame for the nodes passed in, and the path of nodes above them."""
+    if context is None:
+        context = TemplateContext(mode=mode)
 
     # Handle single node
     if isinstance(nodes, Node):
         nodes = [nodes]
 
-    results: List[Node] = []
-
-    for i, node in enumerate(nodes):
-        # Update context for current node
-        node_context = context.copy(current_node=node, position=i + 1, size=len(nodes))
+    # The nodes above those of the current frame, from the top down
+    path = list(context.ancestors)
+    if context.current_node is not None:
+        path.append(context.current_node)
+    return _Frame(nodes, mode, context.copy(size=len(nodes))), path
 
-        # Find matching template
-        template_info = registry.find_template(node, mode)
-
-        if template_info:
-            # Apply the template
-            result = template_info.function(node, node_context)
-            if isinstance(result, Node):
-                results.append(result)
-            elif result is not None:
-                # Convert other types to text nodes
-                results.append(Text(str(result)))
-        else:
-            # Default behavior: copy the node and apply templates to children
-            result = _default_template(node, node_context)
-            if result:
-                results.append(result)
 
-    # Return single node or fragment
+def _combine(results: List[Node]) -> Node:
+    """Return single node or fragment."""
     if len(results) == 1:
         return results[0]
     elif len(results) == 0:
@@ -97,44 +299,13 @@ def apply_templates(
         return Fragment(children=results)
 
 
-def _default_template(node: Node, context: TemplateContext) -> Optional[Node]:
-    """Default template behavior for unmatched nodes."""
-    if isinstance(node, Text):
-        return node
-    elif isinstance(node, Element):
-        # Apply templates to children
-        transformed_children = []
-        if node.children:
-            child_result = apply_templates(node.children, context.mode, context)
-            if isinstance(child_result, Fragment):
-                transformed_children = child_result.children
-            else:
-                transformed_children = [child_result]
-
-        return Element(
-            tag=node.tag, attrs=node.attrs.copy(), children=transformed_children
-        )
-    elif isinstance(node, Fragment):
-        # Apply templates to children
-        transformed_children = []
-        if node.children:
-            child_result = apply_templates(node.children, context.mode, context)
-            if isinstance(child_result, Fragment):
-                transformed_children = child_result.children
-            else:
-                transformed_children = [child_result]
-
-        return Fragment(children=transformed_children)
-
-    return node
-
-
 def select(node: Node, selector: str) -> List[Node]:
-    """Select nodes using a simple selector syntax.
+    """Select nodes using the pattern language of templates.
 
     Args:
         node: Root node to search from
-        selector: Selector string (e.g., "name", "*", ".")
+        selector: Selector string (e.g., "name", "*", ".", "items//item[2]",
+            "a/@href")
 
     Returns:
         List of matching nodes
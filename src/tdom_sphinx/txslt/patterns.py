@@ -1,57 +1,370 @@
-"""Pattern matching engine for TXSLT node selection."""
+"""Pattern matching engine for TXSLT node selection.
+
+Template patterns and ``select`` expressions use a small XPath-like
+language:
+
+- ``person``, ``*`` (any element), ``text()``, ``node()`` (any node),
+  ``element()`` and ``.`` (the context node itself)
+- ``a/b``: a ``b`` element whose parent is an ``a`` element
+- ``a//b``: a ``b`` element anywhere below an ``a`` element
+- ``/a``: an ``a`` element at the top of the tree
+- ``@href``: an attribute, as the last step of a ``select`` expression
+- ``[@href]``, ``[@class='x']``, ``[@class!='x']``: attribute predicates
+- ``[2]``, ``[last()]``: position among the nodes the step selects
+
+Each pattern is compiled once into a ``CompiledPattern``, and compiled
+patterns are cached by their source, so templates and ``select`` calls
+with the same pattern share one.
+"""
 
 from __future__ import annotations
 
-from typing import List, Optional
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 from tdom import Node, Element, Fragment, Text
 
+PATTERN_CACHE_SIZE = 1024
+SIBLING_CACHE_SIZE = 1024
 
-class PatternMatcher:
-    """Engine for matching nodes against XPath-like patterns."""
+# Position of [last()] in a Predicate
+LAST = -1
 
-    @staticmethod
-    def matches(node: Node, pattern: str) -> bool:
-        """Check if a node matches the given pattern."""
-        if pattern == "*":
-            return True
-        if pattern == "node()":
-            return True
-        if pattern == "text()" and isinstance(node, Text):
-            return True
-        if pattern == "element()" and isinstance(node, Element):
+_NAME = r"[A-Za-z_][\w.:-]*"
+_STEP = re.compile(
+    rf"\.|@(?P<attribute>{_NAME})|text\(\)|node\(\)|element\(\)|\*|{_NAME}"
+)
+_PREDICATE = re.compile(
+    rf"""\[\s*(?:
+        (?P<position>\d+)
+        | (?P<last>last\(\))
+        | @(?P<attribute>{_NAME})
+          (?:\s*(?P<op>!?=)\s*(?:'(?P<single>[^']*)'|"(?P<double>[^"]*)"))?
+    )\s*\]""",
+    re.VERBOSE,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Predicate:
+    """A ``[...]`` filter on a step: an attribute test or a position."""
+
+    attribute: Optional[str] = None
+    value: Optional[str] = None
+    negate: bool = False
+    position: Optional[int] = None
+
+    def test(self, node: Node) -> bool:
+        """Check an attribute predicate against a node."""
+        if not isinstance(node, Element) or self.attribute not in node.attrs:
+            return False
+        if self.value is None:
             return True
+        actual = node.attrs[self.attribute] or ""
+        return (actual == self.value) != self.negate
 
-        # Element tag name matching
-        if isinstance(node, Element):
-            return node.tag == pattern
 
-        return False
+@dataclass(frozen=True, slots=True)
+class Step:
+    """One step of a pattern, with the axis that leads to it.
 
-    @staticmethod
-    def select_nodes(root: Node, selector: str) -> List[Node]:
-        """Select nodes from root using a simple selector syntax."""
-        # Simple implementation for basic selectors
-        if selector == ".":
-            return [root]
-        if selector == "*":
-            return PatternMatcher._get_all_children(root)
-
-        # Child element selection by tag name
-        if isinstance(root, Element):
-            return [
-                child
-                for child in root.children
-                if isinstance(child, Element) and child.tag == selector
-            ]
-        elif isinstance(root, Fragment):
+    ``test`` is a tag name, ``*``, ``element()``, ``text()``, ``node()``,
+    ``.`` or ``@name``. ``descendant`` is true for a step after ``//``.
+    """
+
+    test: str
+    descendant: bool = False
+    predicates: tuple[Predicate, ...] = ()
+    # "tag", "element", "text", "node" or "attribute", derived from test
+    kind: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.test in ("*", "element()"):
+            kind = "element"
+        elif self.test == "text()":
+            kind = "text"
+        elif self.test in ("node()", "."):
+            kind = "node"
+        elif self.test.startswith("@"):
+            kind = "attribute"
+        else:
+            kind = "tag"
+        object.__setattr__(self, "kind", kind)
+
+    @property
+    def tag(self) -> Optional[str]:
+        """The tag name this step tests for, if it tests for one."""
+        return self.test if self.kind == "tag" else None
+
+    def node_test(self, node: Node) -> bool:
+        """Check the node test of this step, without its predicates."""
+        kind = self.kind
+        if kind == "tag":
+            return isinstance(node, Element) and node.tag == self.test
+        if kind == "element":
+            return isinstance(node, Element)
+        if kind == "text":
+            return isinstance(node, Text)
+        return kind == "node"
+
+    def filter(self, candidates: List[Node]) -> List[Node]:
+        """Apply the predicates, in order, to the nodes the step selected."""
+        for predicate in self.predicates:
+            if predicate.position is None:
+                candidates = [node for node in candidates if predicate.test(node)]
+                continue
+            if predicate.position == LAST:
+                index = len(candidates) - 1
+            else:
+                index = predicate.position - 1
+            candidates = [candidates[index]] if 0 <= index < len(candidates) else []
+        return candidates
+
+    def matches(
+        self,
+        node: Node,
+        parent: Optional[Node],
+        selections: Optional[SiblingSelections] = None,
+    ) -> bool:
+        """Check whether the step, taken from ``parent``, selects ``node``."""
+        if not self.node_test(node):
+            return False
+        if not self.predicates:
+            return True
+        if all(predicate.position is None for predicate in self.predicates):
+            return all(predicate.test(node) for predicate in self.predicates)
+        # A position is relative to the siblings that pass the node test
+        if not isinstance(parent, (Element, Fragment)):
+            return bool(self.filter([node]))
+        if selections is not None:
+            return selections.selects(self, parent, node)
+        return any(selected is node for selected in self.select_children(parent))
+
+    def select_children(self, parent: Element | Fragment) -> List[Node]:
+        """The children of ``parent`` this step selects."""
+        candidates = [child for child in parent.children if self.node_test(child)]
+        return self.filter(candidates)
+
+    def select(self, context: Node) -> List[Node]:
+        """The nodes this step selects from a context node."""
+        if self.kind == "attribute":
+            name = self.test[1:]
+            owners = _descendants_or_self(context) if self.descendant else (context,)
             return [
-                child
-                for child in root.children
-                if isinstance(child, Element) and child.tag == selector
+                Text(owner.attrs[name] or "")
+                for owner in owners
+                if isinstance(owner, Element) and name in owner.attrs
             ]
+        if self.test == ".":
+            if self.descendant:
+                return self.filter(list(_descendants_or_self(context)))
+            return self.filter([context])
 
-        return []
+        parents = _descendants_or_self(context) if self.descendant else (context,)
+        selected: List[Node] = []
+        for parent in parents:
+            if not isinstance(parent, (Element, Fragment)):
+                continue
+            selected.extend(self.select_children(parent))
+        return selected
+
+
+class SiblingSelections:
+    """Which children of a parent each positional step selects.
+
+    Whether ``li[1]`` or ``li[last()]`` matches a node depends on its
+    siblings. Working that out once per parent and step, instead of once
+    per node, keeps matching the children of a parent linear in their
+    number. Entries keep their parent and step, so a reused ``id()`` can't
+    give a wrong answer; the cache is emptied when it holds ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = SIBLING_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._selected: Dict[Tuple[int, int], Tuple[Node, Step, Set[int]]] = {}
+
+    def selects(self, step: Step, parent: Element | Fragment, node: Node) -> bool:
+        """Check whether ``step`` taken from ``parent`` selects ``node``."""
+        key = (id(parent), id(step))
+        entry = self._selected.get(key)
+        if entry is None or entry[0] is not parent or entry[1] is not step:
+            if len(self._selected) >= self.max_entries:
+                self._selected.clear()
+            selected = {id(child) for child in step.select_children(parent)}
+            entry = self._selected[key] = (parent, step, selected)
+        return id(node) in entry[2]
+
+    def clear(self) -> None:
+        """Forget every parent."""
+        self._selected.clear()
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPattern:
+    """A parsed pattern, ready to match nodes or select them."""
+
+    source: str
+    steps: tuple[Step, ...]
+    absolute: bool = False
+
+    @property
+    def last(self) -> Step:
+        """The step a matching node has to pass itself."""
+        return self.steps[-1]
+
+    def matches(
+        self,
+        node: Node,
+        ancestors: Sequence[Node] = (),
+        selections: Optional[SiblingSelections] = None,
+    ) -> bool:
+        """Check if a node matches, given its ancestors from the top down.
+
+        Steps before the last are checked against ``ancestors``; without
+        them, only single-step patterns can match. Pass ``selections`` when
+        matching many siblings against positional predicates.
+        """
+        return self._match(
+            len(self.steps) - 1, node, ancestors, len(ancestors), selections
+        )
+
+    def _match(
+        self,
+        index: int,
+        node: Node,
+        ancestors: Sequence[Node],
+        depth: int,
+        selections: Optional[SiblingSelections],
+    ) -> bool:
+        step = self.steps[index]
+        parent = ancestors[depth - 1] if depth else None
+        if not step.matches(node, parent, selections):
+            return False
+        if index == 0:
+            return not self.absolute or step.descendant or depth == 0
+        if not step.descendant:
+            return depth > 0 and self._match(
+                index - 1, ancestors[depth - 1], ancestors, depth - 1, selections
+            )
+        return any(
+            self._match(
+                index - 1, ancestors[above - 1], ancestors, above - 1, selections
+            )
+            for above in range(depth, 0, -1)
+        )
+
+    def select(self, root: Node) -> List[Node]:
+        """Select the nodes the pattern reaches from ``root``, in document order.
+
+        A leading ``/`` or ``//`` starts from ``root`` as well.
+        """
+        current = [root]
+        for step in self.steps:
+            if len(current) == 1:
+                current = step.select(current[0])
+                continue
+            selected: List[Node] = []
+            for context in current:
+                selected.extend(step.select(context))
+            if step.descendant:
+                # Nested context nodes reach the same descendants
+                seen: set[int] = set()
+                selected = [
+                    node
+                    for node in selected
+                    if id(node) not in seen and not seen.add(id(node))
+                ]
+            current = selected
+        return current
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern: str) -> CompiledPattern:
+    """Compile a pattern; raise ``ValueError`` if it isn't valid."""
+    source = pattern.strip()
+    position = 0
+    absolute = descendant = False
+    if source.startswith("//"):
+        absolute = descendant = True
+        position = 2
+    elif source.startswith("/"):
+        absolute = True
+        position = 1
+
+    steps: List[Step] = []
+    while True:
+        match = _STEP.match(source, position)
+        if match is None:
+            raise _invalid(pattern, position)
+        position = match.end()
+        predicates = []
+        while (predicate := _PREDICATE.match(source, position)) is not None:
+            predicates.append(_predicate(predicate))
+            position = predicate.end()
+        step = Step(match.group(0), descendant, tuple(predicates))
+        if steps and steps[-1].kind == "attribute":
+            raise _invalid(pattern, match.start())
+        if step.kind == "attribute" and predicates:
+            raise _invalid(pattern, match.end())
+        steps.append(step)
+
+        if position == len(source):
+            break
+        if source.startswith("//", position):
+            descendant = True
+            position += 2
+        elif source.startswith("/", position):
+            descendant = False
+            position += 1
+        else:
+            raise _invalid(pattern, position)
+
+    return CompiledPattern(source=pattern, steps=tuple(steps), absolute=absolute)
+
+
+def _predicate(match: re.Match[str]) -> Predicate:
+    if match.group("position") is not None:
+        return Predicate(position=int(match.group("position")))
+    if match.group("last") is not None:
+        return Predicate(position=LAST)
+    value = match.group("single")
+    if value is None:
+        value = match.group("double")
+    return Predicate(
+        attribute=match.group("attribute"),
+        value=value,
+        negate=match.group("op") == "!=",
+    )
+
+
+def _invalid(pattern: str, position: int) -> ValueError:
+    return ValueError(f"Invalid pattern {pattern!r} at position {position}")
+
+
+def _descendants_or_self(node: Node) -> Iterator[Node]:
+    """A node and everything below it, in document order."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        if isinstance(current, (Element, Fragment)):
+            stack.extend(reversed(current.children))
+
+
+class PatternMatcher:
+    """Engine for matching nodes against XPath-like patterns."""
+
+    @staticmethod
+    def matches(node: Node, pattern: str, ancestors: Sequence[Node] = ()) -> bool:
+        """Check if a node matches the given pattern."""
+        return compile_pattern(pattern).matches(node, ancestors)
+
+    @staticmethod
+    def select_nodes(root: Node, selector: str) -> List[Node]:
+        """Select nodes from root using the pattern language."""
+        return compile_pattern(selector).select(root)
 
     @staticmethod
     def select_first(root: Node, selector: str) -> Optional[Node]:
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator, Mapping, MutableMapping
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from tdom import Node
+from tdom import Element, Node, Text
+
+from .patterns import CompiledPattern, SiblingSelections, compile_pattern
 
 
 @dataclass
@@ -16,57 +20,191 @@ class TemplateInfo:
     function: Callable
     priority: int = 0
     mode: Optional[str] = None
+    compiled: CompiledPattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.compiled = compile_pattern(self.pattern)
 
-    def matches(self, node: Node, mode: Optional[str] = None) -> bool:
+    def matches(
+        self, node: Node, mode: Optional[str] = None, ancestors: Sequence[Node] = ()
+    ) -> bool:
         """Check if this template matches the given node and mode."""
         if self.mode != mode:
             return False
-        return self._pattern_matches(node)
+        return self._pattern_matches(node, ancestors)
 
-    def _pattern_matches(self, node: Node) -> bool:
+    def _pattern_matches(self, node: Node, ancestors: Sequence[Node] = ()) -> bool:
         """Check if the pattern matches the node."""
-        # Basic implementation - match by tag name for Elements
-        if hasattr(node, "tag"):
-            if self.pattern == "*":
-                return True
-            return getattr(node, "tag", "") == self.pattern
+        return self.compiled.matches(node, ancestors)
+
+
+class VariableScope(MutableMapping[str, Any]):
+    """Template variables: this scope's own, then those of enclosing scopes.
+
+    A child scope is two references until something is set in it, so
+    handing every level of a transform its own scope costs no dict copies.
+    Setting or deleting a variable only affects this scope.
+
+    A child is linked past enclosing scopes that have no variables when it
+    is made, so a lookup walks one scope per level that set a variable, not
+    one per level of the tree. ``copy()`` and ``|`` return plain dicts, as
+    they did when variables were a dict.
+    """
+
+    __slots__ = ("parent", "local")
+
+    def __init__(
+        self,
+        local: Optional[Dict[str, Any]] = None,
+        parent: Optional[VariableScope] = None,
+    ) -> None:
+        self.local = local
+        self.parent = parent
+
+    def new_child(self) -> VariableScope:
+        """A scope that sees this one's variables."""
+        return VariableScope(parent=self if self.local else self.parent)
+
+    def reset(self) -> None:
+        """Forget the variables set in this scope."""
+        if self.local:
+            self.local = None
+
+    def __getitem__(self, key: str) -> Any:
+        scope: Optional[VariableScope] = self
+        while scope is not None:
+            if scope.local and key in scope.local:
+                return scope.local[key]
+            scope = scope.parent
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self.local is None:
+            self.local = {}
+        self.local[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if not self.local or key not in self.local:
+            raise KeyError(key)
+        del self.local[key]
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        scope: Optional[VariableScope] = self
+        while scope is not None:
+            for key in scope.local or ():
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+            scope = scope.parent
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
 
-        # For text nodes, fragments, etc.
-        if self.pattern in ("text()", "node()"):
-            return True
+    def copy(self) -> Dict[str, Any]:
+        """The variables visible from this scope, as a new dict."""
+        return dict(self)
 
-        return False
+    def __or__(self, other: Any) -> Dict[str, Any]:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return {**self, **other}
+
+    def __ror__(self, other: Any) -> Dict[str, Any]:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return {**other, **self}
+
+    def __ior__(self, other: Any) -> VariableScope:
+        self.update(other)
+        return self
+
+    def __repr__(self) -> str:
+        return f"VariableScope({dict(self)!r})"
+
+
+class _VariablesField:
+    """``TemplateContext.variables``, always a ``VariableScope``.
+
+    A mapping assigned to it, or passed to the constructor, becomes the
+    outermost scope of a new chain.
+    """
+
+    def __get__(self, obj: Any, objtype: Any = None) -> Any:
+        if obj is None:
+            # The dataclass default: a new scope per context
+            return None
+        return obj._variables
+
+    def __set__(self, obj: Any, value: Optional[Mapping[str, Any]]) -> None:
+        if not isinstance(value, VariableScope):
+            value = VariableScope(None if value is None else dict(value))
+        obj._variables = value
 
 
 @dataclass
 class TemplateContext:
-    """Context passed to template functions during transformation."""
+    """Context passed to template functions during transformation.
+
+    ``apply_templates`` makes one context per list of nodes and updates
+    ``current_node`` and ``position`` as it moves along the list, so a
+    template's context only describes its node while the template runs.
+    Use ``context.copy()`` to keep one.
+    """
 
-    variables: Dict[str, Any] = field(default_factory=dict)
+    # A dict assigned here becomes the outermost scope
+    variables: VariableScope = _VariablesField()  # type: ignore[assignment]
     current_node: Optional[Node] = None
     mode: Optional[str] = None
     position: int = 1
     size: int = 1
+    # Nodes above current_node, from the top down, for patterns like "a/b"
+    ancestors: Tuple[Node, ...] = ()
 
     def copy(self, **changes: Any) -> TemplateContext:
-        """Create a copy of the context with optional changes."""
+        """Create a copy of the context with optional changes.
+
+        The copy's variables are a new scope that sees this context's.
+        """
         new_context = TemplateContext(
-            variables=self.variables.copy(),
+            variables=self.variables.new_child(),
             current_node=self.current_node,
             mode=self.mode,
             position=self.position,
             size=self.size,
+            ancestors=self.ancestors,
         )
         for key, value in changes.items():
             setattr(new_context, key, value)
         return new_context
 
 
+_Ranked = Tuple[int, TemplateInfo]
+
+
 class TemplateRegistry:
-    """Registry for storing and resolving templates."""
+    """Registry for storing and resolving templates.
+
+    Lookups go through an index built from the templates the first time a
+    node is dispatched after a change. For each mode it lists the templates
+    whose pattern ends in a given tag, in ``*`` or ``element()``, in
+    ``text()``, and in ``node()``, each list in priority order. A node is
+    only checked against the lists its last step can match, so finding a
+    template costs a few dict lookups however many are registered. Ties in
+    priority go to the template that was registered first.
+    """
 
     def __init__(self) -> None:
         self._templates: List[TemplateInfo] = []
+        self._indexed = False
+        # (rank, template) lists per (mode, tag) and per mode for the other
+        # kinds of last step; rank is the position in priority order
+        self._by_tag: Dict[Tuple[Optional[str], str], List[_Ranked]] = {}
+        self._by_kind: Dict[Tuple[Optional[str], str], List[_Ranked]] = {}
+        # Candidates per (mode, tag) for elements and (mode, type) otherwise
+        self._dispatch: Dict[Tuple[Optional[str], Any], List[TemplateInfo]] = {}
+        # What positional steps select among the children of recent parents
+        self._selections = SiblingSelections()
 
     def register(
         self,
@@ -83,21 +221,61 @@ class TemplateRegistry:
             mode=mode,
         )
         self._templates.append(template_info)
-        # Sort by priority (higher priority first)
-        self._templates.sort(key=lambda t: t.priority, reverse=True)
+        self._indexed = False
+
+    def _build_index(self) -> None:
+        """Index the templates by mode and last step, best first."""
+        self._by_tag.clear()
+        self._by_kind.clear()
+        self._dispatch.clear()
+        self._selections.clear()
+        # Higher priority first; sorted() is stable, so ties keep their order
+        ordered = sorted(self._templates, key=lambda t: -t.priority)
+        for rank, template in enumerate(ordered):
+            last = template.compiled.last
+            if last.kind == "tag":
+                bucket = self._by_tag.setdefault((template.mode, last.test), [])
+            else:
+                bucket = self._by_kind.setdefault((template.mode, last.kind), [])
+            bucket.append((rank, template))
+        self._indexed = True
+
+    def _candidates(self, node: Node, mode: Optional[str]) -> List[TemplateInfo]:
+        """Templates that could match a node of this tag or type, best first."""
+        if isinstance(node, Element):
+            kinds = ("element", "node")
+            lists = [self._by_tag.get((mode, node.tag), [])]
+        else:
+            kinds = ("text", "node") if isinstance(node, Text) else ("node",)
+            lists = []
+        lists.extend(self._by_kind.get((mode, kind), []) for kind in kinds)
+        return [template for _, template in sorted(chain.from_iterable(lists))]
 
     def find_template(
-        self, node: Node, mode: Optional[str] = None
+        self, node: Node, mode: Optional[str] = None, ancestors: Sequence[Node] = ()
     ) -> Optional[TemplateInfo]:
-        """Find the best matching template for a node."""
-        for template in self._templates:
-            if template.matches(node, mode):
+        """Find the best matching template for a node.
+
+        ``ancestors`` are the nodes above it, from the top down, for
+        patterns with more than one step.
+        """
+        if not self._indexed:
+            self._build_index()
+
+        key = (mode, node.tag if isinstance(node, Element) else type(node))
+        candidates = self._dispatch.get(key)
+        if candidates is None:
+            candidates = self._dispatch[key] = self._candidates(node, mode)
+        for template in candidates:
+            if template.compiled.matches(node, ancestors, self._selections):
                 return template
         return None
 
     def clear(self) -> None:
         """Clear all registered templates."""
         self._templates.clear()
+        self._selections.clear()
+        self._indexed = False
 
 
 # Global registry instance
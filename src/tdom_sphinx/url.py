@@ -1,13 +1,19 @@
 """Helpers for URL and path functions."""
 
+import re
+from functools import lru_cache
 from itertools import repeat
 from pathlib import PurePosixPath
 from typing import Optional
 
 from tdom import Node
 
+from tdom_sphinx.instrumentation import timed
+from tdom_sphinx.nodes import LazyHTML
+
 ROOT = PurePosixPath("/")
 ROOT_PATHS = ("/", "/index", PurePosixPath("/"), PurePosixPath("/index"))
+RELATIVE_CACHE_SIZE = 4096
 
 
 def relative_path(
@@ -182,41 +188,112 @@ def relative(
     return value
 
 
-def relative_tree(target_node: Node, current: PurePosixPath) -> None:
-    """Rewrite certain URL-bearing attributes in a tdom tree relative to current.
-
-    Acts on these cases:
-    - In the <head>, for any <link> element with an ``href`` attribute,
-      replace its value with a path made relative to ``current`` using ``relative``.
-    - In the <body>, for any <a> element with an ``href`` attribute,
-      replace its value with a path made relative to ``current`` using ``relative``.
+@lru_cache(maxsize=RELATIVE_CACHE_SIZE)
+def _segments(path: str) -> tuple[str, ...] | None:
+    """Split an absolute path into the parts ``normalize`` would give it.
 
-    This function mutates the provided tree in-place and returns nothing.
+    Returns None for anything the string fast path does not handle, such as
+    relative paths or a leading ``//``; callers then fall back to ``relative``.
+    """
+    if path in ROOT_PATHS:
+        return ("index",)
+    if not path.startswith("/") or path.startswith("//"):
+        return None
+    # PurePosixPath drops empty and "." parts, so do the same
+    parts = tuple(part for part in path.split("/") if part and part != ".")
+    return parts or None
+
+
+@lru_cache(maxsize=RELATIVE_CACHE_SIZE)
+def _relative_from_directory(directory: tuple[str, ...], target: tuple[str, ...]) -> str:
+    """``relative_path`` on pre-split parts, for a current page in ``directory``."""
+    # The nearest parent of current that is also a parent of target
+    common = 0
+    limit = min(len(directory), len(target) - 1)
+    while common < limit and directory[common] == target[common]:
+        common += 1
+    hops = len(directory) - common
+    return "/".join([".."] * hops + list(target[common:]))
+
+
+def relative_href(current: PurePosixPath | str, target: str) -> str:
+    """Fast, cached equivalent of ``str(relative(current, target))``.
+
+    Works on pre-split path segments instead of building ``PurePosixPath``
+    objects, and caches results per (current directory, target), so every
+    page in a directory shares them. Inputs the fast path doesn't handle go
+    through ``relative`` unchanged.
     """
+    current_parts = _segments(str(current))
+    target_parts = _segments(target)
+    if current_parts is None or target_parts is None:
+        return str(relative(current, target))
+    if current_parts == target_parts:
+        return current_parts[-1]
+    return _relative_from_directory(current_parts[:-1], target_parts)
+
+
+def relative_cache_info():
+    """Return hit/miss statistics for the ``relative_href`` cache."""
+    return _relative_from_directory.cache_info()
+
 
-    def walk(node: object, in_head: bool = False, in_body: bool = False) -> None:
-        # Detect an element-like node by duck-typing the attributes we need
-        tag = getattr(node, "tag", None)
-        attrs = getattr(node, "attrs", None)
+def reset_relative_cache() -> None:
+    """Clear the ``relative_href`` caches."""
+    _segments.cache_clear()
+    _relative_from_directory.cache_clear()
 
-        now_in_head = in_head or (tag == "head")
-        now_in_body = in_body or (tag == "body")
 
-        if now_in_head and tag == "link" and isinstance(attrs, dict):
-            href = attrs.get("href")
-            if isinstance(href, str) and href.startswith("/"):
-                # Compute relative path string and assign back
-                attrs["href"] = str(relative(current=current, target=href))
+# Elements whose URL attribute relative_tree rewrites, and that attribute
+URL_ATTRS = {"a": "href", "link": "href", "script": "src", "img": "src"}
 
-        if tag == "a" and isinstance(attrs, dict):
-            href = attrs.get("href")
-            if isinstance(href, str) and href.startswith("/"):
-                attrs["href"] = str(relative(current=current, target=href))
 
-        # Recurse into children if present
-        children = getattr(node, "children", None)
-        if isinstance(children, (list, tuple)):
-            for ch in children:
-                walk(ch, now_in_head, now_in_body)
+# A site-absolute href or src, spelled any way html.parser would accept it
+_ABSOLUTE_URL_ATTR = re.compile(r"""(?i)\b(?:href|src)\s*=\s*["']?/""")
 
-    walk(target_node)
+
+def _needs_rewrite(node: LazyHTML) -> bool:
+    """True if parsing the node could turn up a URL relative_tree rewrites."""
+    if node.is_parsed:
+        return True
+    return _ABSOLUTE_URL_ATTR.search(node.source) is not None
+
+
+def relative_tree(target_node: Node, current: PurePosixPath | str) -> None:
+    """Rewrite certain URL-bearing attributes in a tdom tree relative to current.
+
+    Acts on these cases:
+    - In the <head>, for any <link> element with an ``href`` attribute,
+      replace its value with a path made relative to ``current`` using ``relative``.
+    - Anywhere, for any <a> element with an ``href`` attribute, and any
+      <script> or <img> element with a ``src`` attribute, do the same.
+
+    Only values starting with ``/`` are rewritten, so running it twice over
+    the same tree is harmless. The tree is walked once, without recursion.
+    An unparsed ``LazyHTML`` node is only parsed if its source contains a
+    site-absolute URL attribute.
+
+    This function mutates the provided tree in-place and returns nothing.
+    """
+    with timed("relative_tree"):
+        stack: list[tuple[object, bool]] = [(target_node, False)]
+        while stack:
+            node, in_head = stack.pop()
+            if type(node) is LazyHTML and not _needs_rewrite(node):
+                continue
+            # Detect an element-like node by duck-typing the attributes we need
+            tag = getattr(node, "tag", None)
+            attrs = getattr(node, "attrs", None)
+
+            in_head = in_head or (tag == "head")
+
+            name = URL_ATTRS.get(tag) if isinstance(tag, str) else None
+            rewrite = name is not None and (in_head or tag != "link")
+            if rewrite and isinstance(attrs, dict):
+                value = attrs.get(name)
+                if isinstance(value, str) and value.startswith("/"):
+                    attrs[name] = relative_href(current, value)
+
+            children = getattr(node, "children", None)
+            if isinstance(children, (list, tuple)):
+                stack.extend((child, in_head) for child in reversed(children))
@@ -2,73 +2,252 @@
 from __future__ import annotations
 
 from html.parser import HTMLParser
+from typing import Iterable, Iterator
 
+from tdom.nodes import VOID_ELEMENTS
 from tdom.nodes import Element as TElement, Fragment as TFragment, Text as TText, Node as TNode
 
+from tdom_sphinx.parse_cache import get_parse_cache
+
+
+# Start tags that close an open <p>
+_CLOSES_P = frozenset(
+    {
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "details",
+        "div",
+        "dl",
+        "fieldset",
+        "figcaption",
+        "figure",
+        "footer",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "main",
+        "menu",
+        "nav",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "table",
+        "ul",
+    }
+)
+
+_TABLE_SECTIONS = frozenset({"tbody", "thead", "tfoot"})
+
+# Elements whose end tag is optional, and the start tags that imply it when
+# the element is open below them, up to the nearest scope boundary
+_OPTIONAL_END_TAGS: dict[str, frozenset[str]] = {
+    "p": _CLOSES_P,
+    "li": frozenset({"li"}),
+    "dt": frozenset({"dt", "dd"}),
+    "dd": frozenset({"dt", "dd"}),
+    "option": frozenset({"option", "optgroup"}),
+    "tr": frozenset({"tr"}) | _TABLE_SECTIONS,
+    "td": frozenset({"td", "th", "tr"}) | _TABLE_SECTIONS,
+    "th": frozenset({"td", "th", "tr"}) | _TABLE_SECTIONS,
+    "thead": _TABLE_SECTIONS,
+    "tbody": _TABLE_SECTIONS,
+}
+
+# Open elements that a start tag doesn't look past for an implied end tag,
+# so "<li><ul><li>" nests a list instead of closing the outer item
+_SCOPE_BOUNDARIES = frozenset(
+    {
+        "body",
+        "button",
+        "caption",
+        "dl",
+        "html",
+        "object",
+        "ol",
+        "select",
+        "table",
+        "td",
+        "template",
+        "th",
+        "ul",
+    }
+)
+
+# Elements inside which whitespace-only text is kept
+_PREFORMATTED = frozenset({"pre", "textarea", "script", "style"})
+
+# Phrasing elements: whitespace between two of them is a visible space
+_INLINE_ELEMENTS = frozenset(
+    {
+        "a",
+        "abbr",
+        "b",
+        "bdi",
+        "bdo",
+        "br",
+        "cite",
+        "code",
+        "data",
+        "dfn",
+        "em",
+        "i",
+        "img",
+        "kbd",
+        "mark",
+        "q",
+        "s",
+        "samp",
+        "small",
+        "span",
+        "strong",
+        "sub",
+        "sup",
+        "time",
+        "u",
+        "var",
+        "wbr",
+    }
+)
+
 
 class TdomHTMLParser(HTMLParser):
-    """Custom HTML parser that builds tdom Node trees."""
+    """Custom HTML parser that builds tdom Node trees.
+
+    Text is buffered in a list and joined once per text node, so long runs
+    of text parse in linear time. Void elements are never left open, end
+    tags that HTML makes optional (``<p>``, ``<li>``, table cells, ...) are
+    implied, and stray end tags are ignored. Entities are decoded by
+    ``HTMLParser``.
+
+    Whitespace-only text is dropped, except inside ``<pre>``-like elements
+    and between two inline elements, where it renders as a space.
+    """
 
     def __init__(self) -> None:
         super().__init__()
         self.stack: list[TElement] = []
         self.root_nodes: list[TNode] = []
-        self.current_text: str = ""
+        self.text_parts: list[str] = []
+        # Whitespace-only text kept back until we know what follows it
+        self.pending_space: str = ""
+        self.preformatted: int = 0
+        # The last root node handed out by an incremental parse, if any
+        self.previous_root: TNode | None = None
 
-    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-        """Handle opening HTML tags."""
-        # Flush any pending text content
-        self._flush_text()
+    def _children(self) -> list[TNode]:
+        return self.stack[-1].children if self.stack else self.root_nodes
+
+    def _previous_sibling(self) -> TNode | None:
+        children = self._children()
+        if children:
+            return children[-1]
+        return None if self.stack else self.previous_root
+
+    def _close_implied(self, tag: str) -> None:
+        """Close open elements whose end tag is implied by a ``tag`` start.
+
+        Looks down the stack, past elements like ``<p>`` or ``<span>`` that
+        ``tag`` doesn't close, for the nearest element it does; that element
+        and everything opened inside it are closed. The search goes on below
+        it, as a ``<tr>`` closes a cell and then the row, and stops at a
+        scope boundary.
+        """
+        stack = self.stack
+        index = len(stack) - 1
+        while index >= 0:
+            open_tag = stack[index].tag
+            implied_by = _OPTIONAL_END_TAGS.get(open_tag)
+            if implied_by is not None and tag in implied_by:
+                while len(stack) > index:
+                    self._pop()
+            elif open_tag in _SCOPE_BOUNDARIES:
+                return
+            index -= 1
+
+    def _pop(self) -> None:
+        element = self.stack.pop()
+        if element.tag in _PREFORMATTED:
+            self.preformatted -= 1
 
+    def _append(self, node: TNode) -> None:
+        children = self._children()
+        if self.pending_space:
+            previous = self._previous_sibling()
+            node_tag = getattr(node, "tag", None)
+            # Keep the space between inline content, e.g. "<em>a</em> <b>b</b>"
+            if node_tag in _INLINE_ELEMENTS and (
+                isinstance(previous, TText)
+                or getattr(previous, "tag", None) in _INLINE_ELEMENTS
+            ):
+                children.append(TText(self.pending_space))
+            self.pending_space = ""
+        children.append(node)
+
+    def _element(self, tag: str, attrs: list[tuple[str, str | None]]) -> TElement:
+        self._flush_text()
+        self._close_implied(tag)
         # Convert attrs list to dict, normalizing None values to empty strings
         attrs_dict: dict[str, str | None] = {name: value or "" for name, value in attrs}
-
-        # Create new element
         element = TElement(tag=tag, attrs=attrs_dict, children=[])
+        self._append(element)
+        return element
 
-        if self.stack:
-            # Add to current parent's children
-            self.stack[-1].children.append(element)
-        else:
-            # This is a root element
-            self.root_nodes.append(element)
-
-        # Push onto stack
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        """Handle opening HTML tags."""
+        element = self._element(tag, attrs)
+        if tag in VOID_ELEMENTS:
+            return
         self.stack.append(element)
+        if tag in _PREFORMATTED:
+            self.preformatted += 1
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        """Handle ``<tag />``: an element with no children."""
+        self._element(tag, attrs)
 
     def handle_endtag(self, tag: str) -> None:
         """Handle closing HTML tags."""
-        # Flush any pending text content
         self._flush_text()
-
-        # Pop from stack
-        if self.stack:
-            self.stack.pop()
+        self.pending_space = ""
+        # Close up to the matching open element; ignore stray end tags
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index].tag == tag:
+                while len(self.stack) > index:
+                    self._pop()
+                return
 
     def handle_data(self, data: str) -> None:
         """Handle text content between tags."""
-        self.current_text += data
+        self.text_parts.append(data)
 
     def _flush_text(self) -> None:
-        """Add accumulated text as a Text node if non-empty."""
-        if self.current_text.strip():  # Only add non-whitespace text
-            text_node = TText(self.current_text)
-
-            if self.stack:
-                # Add to current parent's children
-                self.stack[-1].children.append(text_node)
-            else:
-                # This is root-level text
-                self.root_nodes.append(text_node)
-
-        self.current_text = ""
+        """Add accumulated text as a Text node, or hold back whitespace."""
+        if not self.text_parts:
+            return
+        text = "".join(self.text_parts)
+        self.text_parts.clear()
+        if self.preformatted or text.strip():
+            self._append(TText(text))
+        elif self._previous_sibling() is not None:
+            self.pending_space = text
 
     def close(self) -> None:
         """Finish parsing. Result can be retrieved via get_result()."""
+        super().close()
         # Flush any remaining text
         self._flush_text()
-
-        super().close()
+        self.pending_space = ""
+        self.stack.clear()
+        self.preformatted = 0
 
     def get_result(self) -> TNode:
         """Return the parsed root node(s) as a tdom Node."""
@@ -84,11 +263,57 @@ class TdomHTMLParser(HTMLParser):
             return TFragment(children=self.root_nodes)
 
 
+class IncrementalHTMLParser(TdomHTMLParser):
+    """Parse HTML fed in chunks, handing out top-level nodes as they close.
+
+    ``feed()`` and ``close()`` return the top-level nodes completed so far
+    and forget them, so a caller can process each subtree (rewrite its
+    URLs, extract its text, serialize it) and let it go without the whole
+    document ever being in memory. The nodes are what ``TdomHTMLParser``
+    would have produced for the whole input.
+    """
+
+    def feed(self, data: str) -> list[TNode]:  # type: ignore[override]
+        """Parse another chunk; return the top-level nodes it completed."""
+        super().feed(data)
+        return self._take_completed()
+
+    def close(self) -> list[TNode]:  # type: ignore[override]
+        """Finish parsing; return the remaining top-level nodes."""
+        super().close()
+        return self._take_completed()
+
+    def _take_completed(self) -> list[TNode]:
+        # The last root is still being built while elements are open
+        count = len(self.root_nodes) - (1 if self.stack else 0)
+        completed = self.root_nodes[:count]
+        del self.root_nodes[:count]
+        if completed:
+            self.previous_root = completed[-1]
+        return completed
+
+
+def iter_html_subtrees(chunks: Iterable[str]) -> Iterator[TNode]:
+    """Parse HTML from an iterable of chunks, yielding top-level nodes.
+
+    Examples:
+        >>> for node in iter_html_subtrees(open("big.html")):
+        ...     relative_tree(node, "/api/index")
+        ...     out.writelines(iter_html(node))
+    """
+    parser = IncrementalHTMLParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
 def html_string_to_tdom(html_string: str) -> TNode:
     """Convert an HTML string into a tdom Node tree.
 
     Uses Python's built-in html.parser to parse the HTML and constructs
     tdom Node objects following the same patterns used throughout the codebase.
+    Results are cached by content (see ``tdom_sphinx.parse_cache``); every
+    call returns a tree of its own that the caller may modify.
 
     Args:
         html_string: A string containing HTML content
@@ -117,7 +342,11 @@ def html_string_to_tdom(html_string: str) -> TNode:
         # Empty or whitespace-only string
         return TFragment(children=[])
 
+    return get_parse_cache().parse(html_string, _parse_html_string)
+
+
+def _parse_html_string(html_string: str) -> TNode:
     parser = TdomHTMLParser()
     parser.feed(html_string)
     parser.close()
-    return parser.get_result()
\ No newline at end of file
+    return parser.get_result()
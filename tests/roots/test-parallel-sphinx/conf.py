@@ -0,0 +1,12 @@
+"""Sphinx configuration for a small multi-page site written in parallel."""
+
+extensions = [
+    "tdom_sphinx",
+]
+
+project = "tdom-sphinx"
+html_theme = "tdom-theme"
+
+tdom_compiled_layout = True
+tdom_site_navigation = True
+tdom_fingerprint_pages = True
@@ -0,0 +1,101 @@
+"""Tests for content-hashed static asset URLs."""
+
+import json
+from pathlib import Path
+
+import pytest
+from sphinx.testing.util import SphinxTestApp
+
+from tdom_sphinx import sphinx_events
+from tdom_sphinx.assets import (
+    MANIFEST_NAME,
+    AssetManifest,
+    build_asset_manifest,
+    hashed_name,
+)
+
+
+def test_hashed_name_depends_on_content():
+    name = hashed_name("pico.css", b"body {}")
+    assert name.startswith("pico.")
+    assert name.endswith(".css")
+    assert name != hashed_name("pico.css", b"body { color: red }")
+    assert name == hashed_name("pico.css", b"body {}")
+
+
+def test_hashed_name_keeps_the_directory():
+    name = hashed_name("css/theme.css", b"body {}")
+    assert name.startswith("css/theme.")
+    assert name.endswith(".css")
+
+
+def test_build_asset_manifest(tmp_path: Path):
+    (tmp_path / "pico.css").write_text("body {}")
+    (tmp_path / "favicon.ico").write_bytes(b"\0\1")
+
+    manifest = build_asset_manifest(tmp_path)
+    pico_url = manifest.url("pico.css")
+    assert pico_url == "/_static/" + hashed_name("pico.css", b"body {}")
+    assert (tmp_path / Path(pico_url).name).read_text() == "body {}"
+    assert manifest.url("sphinx.css") == "/_static/sphinx.css"
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text()) == manifest.urls
+
+
+def test_build_asset_manifest_removes_stale_copies(tmp_path: Path):
+    (tmp_path / "pico.css").write_text("body {}")
+    old = Path(build_asset_manifest(tmp_path).url("pico.css")).name
+    (tmp_path / "pico.min.css").write_text("body {}")
+
+    (tmp_path / "pico.css").write_text("body { color: red }")
+    new = Path(build_asset_manifest(tmp_path).url("pico.css")).name
+
+    assert new != old
+    assert (tmp_path / new).exists()
+    assert not (tmp_path / old).exists()
+    assert (tmp_path / "pico.min.css").exists()
+
+
+def test_empty_manifest_gives_plain_urls():
+    assert AssetManifest().url("pico.css") == "/_static/pico.css"
+
+
+# Its own srcdir keeps the hashed files out of the basic-sphinx output that
+# the off-by-default test shares
+@pytest.mark.sphinx(
+    "html",
+    testroot="basic-sphinx",
+    srcdir="asset-manifest",
+    confoverrides={"tdom_asset_manifest": True, "tdom_compiled_layout": True},
+)
+def test_pages_link_to_hashed_assets(
+    app: SphinxTestApp, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    warm = sphinx_events._warm_render_caches
+    warmed = []
+
+    def counting_warm(*args):
+        warmed.append(args)
+        warm(*args)
+
+    monkeypatch.setattr(sphinx_events, "_warm_render_caches", counting_warm)
+    app.build()
+
+    # Only the caches built for the manifest's SiteConfig are warmed
+    assert len(warmed) == 1
+
+    manifest = getattr(app, "site_config").assets
+    assert set(manifest.urls) >= {"tdom-sphinx.css", "pico.css", "pygments.css"}
+    # Sphinx's own css_files and script_files are hashed as well
+    assert set(manifest.urls) >= {"basic.css", "doctools.js"}
+    index = (app.outdir / "index.html").read_text()
+    for url in manifest.urls.values():
+        assert f'="{url.lstrip("/")}"' in index
+        assert (app.outdir / url.lstrip("/")).exists()
+
+
+@pytest.mark.sphinx("html", testroot="basic-sphinx")
+def test_asset_manifest_is_off_by_default(app: SphinxTestApp) -> None:
+    app.build()
+
+    assert getattr(app, "site_config").assets is None
+    assert not (app.outdir / "_static" / MANIFEST_NAME).exists()
@@ -0,0 +1,111 @@
+"""Tests for the page chrome cache used by BaseLayout."""
+
+from dataclasses import replace
+
+import pytest
+
+from tdom_sphinx.chrome import (
+    ChromeCache,
+    get_chrome_cache,
+    page_directory,
+    reset_chrome_cache,
+)
+from tdom import Node, html
+
+from tdom_sphinx.components import base_layout
+from tdom_sphinx.components.base_layout import BaseLayout
+from tdom_sphinx.models import PageContext, SiteConfig
+
+
+@pytest.fixture(autouse=True)
+def fresh_chrome_cache():
+    """Start and end each test with an empty global chrome cache."""
+    reset_chrome_cache()
+    yield
+    reset_chrome_cache()
+
+
+def test_page_directory():
+    assert page_directory("index") == "/"
+    assert page_directory("a/b/c") == "/a/b"
+
+
+def test_chrome_cache_counts_hits_and_misses(site_config: SiteConfig):
+    cache = ChromeCache()
+    calls = []
+
+    def render():
+        calls.append(1)
+        return object()
+
+    first = cache.get(site_config, ("footer",), render)  # type: ignore[arg-type]
+    second = cache.get(site_config, ("footer",), render)  # type: ignore[arg-type]
+
+    assert first is second
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_chrome_cache_keys_on_site_config_identity(site_config: SiteConfig):
+    cache = ChromeCache()
+    other = replace(site_config, site_title="Other Site")
+
+    cache.get(site_config, ("footer",), lambda: object())  # type: ignore[arg-type]
+    cache.get(other, ("footer",), lambda: object())  # type: ignore[arg-type]
+
+    assert cache.misses == 2
+    assert cache.hits == 0
+
+
+def test_base_layout_reuses_chrome_per_directory(
+    page_context: PageContext, site_config: SiteConfig
+):
+    sibling = replace(page_context, pagename="other")
+    nested = replace(page_context, pagename="a/b/page")
+
+    first = str(BaseLayout(page_context=page_context, site_config=site_config))
+    chrome = get_chrome_cache()
+    assert chrome.misses == 3  # head, heading and footer
+    assert chrome.hits == 0
+
+    second = str(BaseLayout(page_context=sibling, site_config=site_config))
+    assert second == first
+    assert chrome.hits == 3
+
+    deeper = str(BaseLayout(page_context=nested, site_config=site_config))
+    assert chrome.misses == 6
+    assert 'href="../../_static/tdom-sphinx.css"' in deeper
+
+
+def test_base_layout_shares_head_between_titles(
+    page_context: PageContext, site_config: SiteConfig
+):
+    other = replace(page_context, pagename="other", title="Other Page")
+
+    first = str(BaseLayout(page_context=page_context, site_config=site_config))
+    second = str(BaseLayout(page_context=other, site_config=site_config))
+
+    assert get_chrome_cache().misses == 3
+    assert "<title>My Test Page - My Test Site</title>" in first
+    assert "<title>Other Page - My Test Site</title>" in second
+    # Swapping in a title leaves the cached head as it was
+    assert str(BaseLayout(page_context=page_context, site_config=site_config)) == first
+
+
+def test_base_layout_leaves_cached_chrome_unchanged(
+    page_context: PageContext, site_config: SiteConfig, monkeypatch
+):
+    def Footer(*, page_context: PageContext, site_config: SiteConfig) -> Node:
+        return html(t'<footer><a href="/about.html">About</a></footer>')
+
+    monkeypatch.setattr(base_layout, "Footer", Footer)
+    top = replace(page_context, pagename="index")
+    nested = replace(page_context, pagename="a/b/page")
+
+    first = str(BaseLayout(page_context=top, site_config=site_config))
+    deeper = str(BaseLayout(page_context=nested, site_config=site_config))
+    again = str(BaseLayout(page_context=top, site_config=site_config))
+
+    assert '<footer><a href="about.html">About</a></footer>' in first
+    assert '<footer><a href="../../about.html">About</a></footer>' in deeper
+    assert again == first
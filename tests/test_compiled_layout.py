@@ -0,0 +1,43 @@
+"""Tests for the precompiled BaseLayout."""
+
+from dataclasses import replace
+
+import pytest
+
+from tdom_sphinx.compiled_layout import CompiledLayout, compile_skeleton
+from tdom_sphinx.components.base_layout import BaseLayout
+from tdom_sphinx.models import PageContext, SiteConfig
+from tdom_sphinx.utils import html_string_to_tdom
+
+
+def test_compile_skeleton_has_one_segment_per_gap(site_config: SiteConfig):
+    skeleton = compile_skeleton(site_config, "/")
+    assert skeleton.slots == ("title", "aside", "body")
+    assert len(skeleton.segments) == len(skeleton.slots) + 1
+    assert skeleton.segments[0].startswith("<!DOCTYPE html>")
+
+
+@pytest.mark.parametrize("pagename", ["index", "guide/intro", "a/b/c/page"])
+def test_compiled_layout_matches_tree_path(
+    page_context: PageContext, site_config: SiteConfig, pagename: str
+):
+    toc = html_string_to_tdom(
+        '<ul><li><a href="/docs.html">Docs</a></li><li><a href="/api.html">API</a></li></ul>'
+    )
+    local = replace(page_context, pagename=pagename, toc=toc)
+
+    expected = str(BaseLayout(page_context=local, site_config=site_config))
+    compiled = CompiledLayout(site_config)
+
+    assert compiled.render(local) == expected
+
+
+def test_compiled_layout_compiles_each_directory_once(
+    page_context: PageContext, site_config: SiteConfig
+):
+    compiled = CompiledLayout(site_config)
+    compiled.render(replace(page_context, pagename="guide/one"))
+    compiled.render(replace(page_context, pagename="guide/two"))
+    compiled.render(replace(page_context, pagename="index"))
+
+    assert sorted(directory for directory, *_ in compiled.skeletons) == ["/", "/guide"]
@@ -0,0 +1,117 @@
+"""Tests for skipping pages whose inputs are unchanged."""
+
+import json
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from sphinx.testing.util import SphinxTestApp
+
+from tdom_sphinx.fingerprint import (
+    MANIFEST_NAME,
+    PageFingerprints,
+    code_fingerprint,
+    page_fingerprint,
+)
+from tdom_sphinx.models import PageContext, SiteConfig
+
+
+def test_page_fingerprint_is_stable(page_context: PageContext, site_config: SiteConfig):
+    same = replace(page_context, toctree=lambda **kwargs: "")
+    other = replace(page_context, toctree=lambda **kwargs: "")
+    assert page_fingerprint(same, site_config) == page_fingerprint(other, site_config)
+
+
+class _Stylesheet:
+    """Like Sphinx's ``_CascadingStyleSheet``: no ``__repr__``."""
+
+    def __init__(self, filename: str, **attributes: str) -> None:
+        self.filename = filename
+        self.priority = 500
+        self.attributes = {"rel": "stylesheet", **attributes}
+
+
+def test_page_fingerprint_ignores_asset_identity(
+    page_context: PageContext, site_config: SiteConfig
+):
+    first = replace(page_context, css_files=(_Stylesheet("_static/a.css"),))
+    second = replace(page_context, css_files=(_Stylesheet("_static/a.css"),))
+    other = replace(page_context, css_files=(_Stylesheet("_static/b.css"),))
+
+    fingerprint = page_fingerprint(first, site_config)
+    assert page_fingerprint(second, site_config) == fingerprint
+    assert page_fingerprint(other, site_config) != fingerprint
+
+
+def test_page_fingerprint_changes_with_inputs(
+    page_context: PageContext, site_config: SiteConfig
+):
+    fingerprint = page_fingerprint(page_context, site_config)
+    changed_body = replace(page_context, body="<p>Changed</p>")
+    changed_site = replace(site_config, site_title="Other Site")
+    assert page_fingerprint(changed_body, site_config) != fingerprint
+    assert page_fingerprint(page_context, changed_site) != fingerprint
+
+
+def test_fingerprints_round_trip(tmp_path: Path):
+    fingerprints = PageFingerprints.load(tmp_path)
+    assert fingerprints.previous == {}
+    fingerprints.record("index", "abc")
+    fingerprints.save()
+
+    loaded = PageFingerprints.load(tmp_path)
+    assert loaded.is_unchanged("index", "abc")
+    assert not loaded.is_unchanged("index", "def")
+
+
+def test_fingerprints_ignore_manifest_from_other_code(tmp_path: Path):
+    manifest = {"code": "old", "pages": {"index": "abc"}}
+    (tmp_path / MANIFEST_NAME).write_text(json.dumps(manifest))
+
+    loaded = PageFingerprints.load(tmp_path)
+    assert loaded.code == code_fingerprint()
+    assert loaded.previous == {}
+
+
+def test_fingerprints_merge_worker_journals(tmp_path: Path):
+    fingerprints = PageFingerprints.load(tmp_path)
+    # Pretend the pages are recorded from a worker process
+    fingerprints.journal.owner_pid = -1
+    fingerprints.record("a", "1")
+    fingerprints.record("b", "2")
+    fingerprints.current.clear()
+
+    fingerprints.save()
+    assert list(tmp_path.glob(".tdom-sphinx-fingerprints.*.jsonl")) == []
+    assert PageFingerprints.load(tmp_path).previous == {"a": "1", "b": "2"}
+
+
+@pytest.mark.sphinx(
+    "html",
+    testroot="basic-sphinx",
+    srcdir="fingerprints",
+    confoverrides={"tdom_fingerprint_pages": True},
+)
+def test_unchanged_page_is_not_rewritten(
+    app: SphinxTestApp, make_app: Callable[..., SphinxTestApp], app_params
+) -> None:
+    app.build()
+    index = app.outdir / "index.html"
+    assert index.read_text().startswith("<!DOCTYPE html>")
+    assert (app.outdir / MANIFEST_NAME).exists()
+    index.write_text("left alone")
+
+    # A second build, with its own app, of the same project into the same outdir
+    args, kwargs = app_params
+    second = make_app(*args, **kwargs)
+    second.build(force_all=True)
+
+    assert index.read_text() == "left alone"
+    assert getattr(second, "page_fingerprints").skipped >= 1
+
+
+@pytest.mark.sphinx("html", testroot="basic-sphinx")
+def test_fingerprinting_is_off_by_default(app: SphinxTestApp) -> None:
+    assert getattr(app, "page_fingerprints") is None
+    assert getattr(app, "page_writer") is None
@@ -6,7 +6,14 @@ to ensure they provide correct test data and behave as expected.
 
 from sphinx.testing.util import SphinxTestApp
 
-from tdom_sphinx.models import IconLink, Link, NavbarConfig, PageContext, SiteConfig
+from tdom_sphinx.models import (
+    IconLink,
+    Link,
+    NavbarConfig,
+    PageContext,
+    RenderSnapshot,
+    SiteConfig,
+)
 
 
 def test_page_context_fixture(page_context):
@@ -75,7 +82,7 @@ def test_sphinx_context_fixture(sphinx_context):
     assert sphinx_context["project"] == "My Test Site"
     assert sphinx_context["title"] == "My Test Page"
     assert sphinx_context["body"] == "<p>Hello World</p>"
-    assert isinstance(sphinx_context["sphinx_app"], SphinxTestApp)
+    assert isinstance(sphinx_context["render_snapshot"], RenderSnapshot)
     assert isinstance(sphinx_context["page_context"], PageContext)
 
 
@@ -83,11 +90,11 @@ def test_fixtures_integration(site_config, page_context, sphinx_app, sphinx_cont
     """Test that fixtures work together correctly."""
     # Verify the integration works as expected
     assert sphinx_context["page_context"] is page_context
-    assert sphinx_context["sphinx_app"] is sphinx_app
     assert getattr(sphinx_app, "site_config") is site_config
+    assert sphinx_context["render_snapshot"].site_config is site_config
 
     # Test that the context contains all expected keys
-    expected_keys = {"project", "title", "body", "sphinx_app", "page_context"}
+    expected_keys = {"project", "title", "body", "render_snapshot", "page_context"}
     assert set(sphinx_context.keys()) == expected_keys
 
 
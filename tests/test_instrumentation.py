@@ -0,0 +1,212 @@
+"""Tests for the opt-in render timings, trace and memory profile."""
+
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from sphinx.testing.util import SphinxTestApp
+
+from tdom_sphinx.instrumentation import (
+    MEMORY_NAME,
+    TIMINGS_NAME,
+    TRACE_NAME,
+    PageMemory,
+    Span,
+    begin_page,
+    end_page,
+    format_memory_report,
+    format_timing_report,
+    for_page,
+    get_instrumentation,
+    install_instrumentation,
+    memory_report,
+    reset_instrumentation,
+    timed,
+    timing_report,
+    trace_events,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_instrumentation():
+    """Start and end each test without instrumentation installed."""
+    reset_instrumentation()
+    yield
+    reset_instrumentation()
+
+
+def test_timed_is_a_no_op_when_disabled():
+    assert get_instrumentation() is None
+    assert timed("a") is timed("b")
+    with timed("a"):
+        pass
+
+
+def test_spans_are_recorded_per_page(tmp_path: Path):
+    instrumentation = install_instrumentation(tmp_path)
+    with for_page("index"), timed("outer"):
+        with timed("inner"):
+            pass
+    with timed("unpaged"):
+        pass
+
+    names = [(span.name, span.page) for span in instrumentation.spans]
+    assert names == [("inner", "index"), ("outer", "index"), ("unpaged", None)]
+    outer = instrumentation.spans[1]
+    assert outer.duration_ns >= instrumentation.spans[0].duration_ns
+
+
+def test_worker_spans_are_collected_from_the_journal(tmp_path: Path):
+    instrumentation = install_instrumentation(tmp_path)
+    # Pretend this process is a forked write worker
+    instrumentation.journal.owner_pid = -1
+    with for_page("a"), timed("TdomBridge.render"):
+        pass
+    assert instrumentation.spans == []
+
+    instrumentation.journal.owner_pid = 0
+    spans = instrumentation.collect()
+    assert [(span.name, span.page) for span in spans] == [("TdomBridge.render", "a")]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_timing_report():
+    spans = [Span("Head", "p", 0, ms * 1_000_000, 1) for ms in range(1, 101)]
+    spans.append(Span("Main", "p", 0, 1_000_000, 1))
+
+    report = timing_report(spans)
+    assert list(report) == ["Head", "Main"]
+    assert report["Head"] == {
+        "count": 100,
+        "total_ms": 5050.0,
+        "p50_ms": 50.0,
+        "p99_ms": 99.0,
+    }
+    header, head, main = format_timing_report(report).splitlines()
+    assert header.split()[:2] == ["span", "count"]
+    assert head.split()[:2] == ["Head", "100"]
+    assert main.split()[:2] == ["Main", "1"]
+
+
+# Its own srcdir keeps the timing report out of the basic-sphinx output
+# that the other builds in this module share
+@pytest.mark.sphinx(
+    "html",
+    testroot="basic-sphinx",
+    srcdir="timings",
+    confoverrides={"tdom_timings": True},
+)
+def test_build_writes_timing_report(app: SphinxTestApp) -> None:
+    app.build()
+
+    report = json.loads((app.outdir / f"{TIMINGS_NAME}.json").read_text())
+    for name in ("make_page_context", "TdomBridge.render", "Head", "SiteAside", "Main"):
+        assert report[name]["count"] >= 1
+    assert (app.outdir / f"{TIMINGS_NAME}.txt").exists()
+    assert get_instrumentation() is None
+
+
+@pytest.mark.sphinx("html", testroot="basic-sphinx")
+def test_timings_are_off_by_default(app: SphinxTestApp) -> None:
+    app.build()
+
+    assert not (app.outdir / f"{TIMINGS_NAME}.json").exists()
+
+
+def test_memory_is_measured_per_page_and_span(tmp_path: Path):
+    instrumentation = install_instrumentation(tmp_path, memory=True)
+    begin_page("index")
+    with timed("outer"):
+        with timed("inner"):
+            held = bytearray(1_000_000)
+        del held
+        with timed("small"):
+            pass
+    end_page()
+
+    inner, small, outer = instrumentation.spans
+    assert inner.peak_bytes >= 1_000_000
+    assert small.peak_bytes < 1_000_000
+    # The inner span's peak still counts for the span and page around it
+    assert outer.peak_bytes >= 1_000_000
+    [page] = instrumentation.pages
+    assert page.page == "index"
+    assert page.peak_bytes >= 1_000_000
+    assert instrumentation.page is None
+
+    reset_instrumentation()
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_report():
+    pages = [PageMemory(f"p{kb}", kb * 1024, 1) for kb in range(1, 21)]
+    spans = [Span("Main", "p1", 0, 0, 1, 2048), Span("Main", "p2", 0, 0, 1, 4096)]
+
+    report = memory_report(pages, spans, top=3)
+    assert [row["page"] for row in report["pages"]] == ["p20", "p19", "p18"]
+    assert report["components"] == [
+        {"name": "Main", "count": 2, "mean_kb": 3.0, "max_kb": 4.0, "max_page": "p2"}
+    ]
+    text = format_memory_report(report)
+    assert "p20" in text
+    assert "Main (p2)" in text
+
+
+@pytest.mark.sphinx(
+    "html", testroot="basic-sphinx", confoverrides={"tdom_memory_profile": True}
+)
+def test_build_writes_memory_report(app: SphinxTestApp) -> None:
+    app.build()
+
+    report = json.loads((app.outdir / f"{MEMORY_NAME}.json").read_text())
+    assert "index" in [row["page"] for row in report["pages"]]
+    names = [row["name"] for row in report["components"]]
+    assert "TdomBridge.render" in names
+    # Memory profiling alone doesn't write the timing report
+    assert not (app.outdir / f"{TIMINGS_NAME}.json").exists()
+    assert not tracemalloc.is_tracing()
+
+
+def test_trace_events_have_a_track_per_process():
+    spans = [
+        Span("builder-inited", None, 1_000, 5_000, 10),
+        Span("TdomBridge.render", "b", 9_000, 2_000, 11),
+        Span("TdomBridge.render", "a", 8_000, 2_000, 10),
+    ]
+    events = trace_events(spans, main_pid=10)
+
+    metadata = [event for event in events if event["ph"] == "M"]
+    assert [event["args"]["name"] for event in metadata] == [
+        "sphinx",
+        "write worker 11",
+    ]
+    complete = [event for event in events if event["ph"] == "X"]
+    assert [(event["args"]["page"], event["pid"]) for event in complete] == [
+        (None, 10),
+        ("a", 10),
+        ("b", 11),
+    ]
+    assert complete[1]["ts"] == 8.0
+    assert complete[1]["dur"] == 2.0
+
+
+@pytest.mark.sphinx(
+    "html", testroot="basic-sphinx", confoverrides={"tdom_trace": True}
+)
+def test_build_writes_trace(app: SphinxTestApp) -> None:
+    app.build()
+
+    trace = json.loads((app.outdir / TRACE_NAME).read_text())
+    names = {event["name"] for event in trace["traceEvents"]}
+    for name in (
+        "builder-inited",
+        "html-page-context",
+        "toc_to_tree",
+        "relative_tree",
+        "serialize",
+        "Head",
+    ):
+        assert name in names
+    # Tracing alone doesn't write the timing report
+    assert not (app.outdir / f"{TIMINGS_NAME}.json").exists()
@@ -3,6 +3,7 @@
 from markupsafe import Markup
 from tdom.nodes import Element as TElement
 
+from tdom_sphinx.page_index import PageIndex
 from tdom_sphinx.sphinx_events import make_page_context
 
 
@@ -18,9 +19,8 @@ def test_make_page_context_builds_expected_page_context():
         "title": "My Title",
         "toc": "<ul><li>Item</li></ul>",
         "toctree": "<div>TOC Tree</div>",
-        # Intentionally provide both; implementation currently reads js from css
         "css_files": ["_static/sphinx.css", "_static/tdom-sphinx.css"],
-        "js_files": ["_static/sphinx.js"],
+        "script_files": ["_static/sphinx.js"],
         # Sphinx provides rellinks entries as tuples; map accordingly in make_page_context
         # Format: (pagename, title, accesskey, link_text)
         "rellinks": [
@@ -60,11 +60,9 @@ def test_make_page_context_builds_expected_page_context():
     assert "Item" in str(page_context.toc)
     assert page_context.metatags == '<meta charset="utf-8">'
 
-    # css/js become tuples; js currently mirrors css per implementation
+    # css/js become tuples
     assert page_context.css_files == tuple(context["css_files"])  # type: ignore[comparison-overlap]
-    assert page_context.js_files == tuple(
-        context["css_files"]
-    )  # mirrors css_files in current code
+    assert page_context.js_files == tuple(context["script_files"])  # type: ignore[comparison-overlap]
 
     # display_toc is True due to toc_num_entries["pagename"] > 1
     assert page_context.display_toc is True
@@ -79,3 +77,29 @@ def test_make_page_context_builds_expected_page_context():
 
     # document metadata passthrough
     assert page_context.meta == document_metadata
+
+
+def test_make_page_context_leaves_related_pages_to_the_page_index():
+    context = {
+        "body": "<p>Hello Body</p>",
+        "next": {"title": "Next Page"},
+        "prev": {"title": "Previous Page"},
+        "rellinks": [("genindex", "General Index", "I", "index")],
+        "title": "My Title",
+    }
+    page_index = PageIndex((), (), (), [], [], [], {}, {})
+
+    page_context = make_page_context(
+        context=context,
+        pagename="pagename",
+        templatename="page.html",
+        toc_num_entries={},
+        document_metadata={},
+        page_index=page_index,
+    )
+
+    assert page_context.page_index is page_index
+    assert page_context.rellinks == ()
+    assert page_context.prev is None
+    assert page_context.next is None
+    assert page_context.title == "My Title"
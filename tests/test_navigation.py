@@ -0,0 +1,138 @@
+"""Tests for the build-wide site navigation."""
+
+from dataclasses import replace
+
+import pytest
+from sphinx.testing.util import SphinxTestApp
+
+from tdom_sphinx.components.site_aside import SiteAside
+
+from tdom_sphinx.navigation import (
+    CURRENT_ATTR,
+    NavEntry,
+    SiteNavigation,
+    build_nav_entries,
+    iter_entries,
+)
+from tdom_sphinx.nodes import RawHTML
+from tdom_sphinx.utils import html_string_to_tdom
+
+
+def _navigation() -> SiteNavigation:
+    entries = build_nav_entries(
+        "index",
+        {
+            "index": ["about", "guide/index"],
+            "guide/index": ["guide/intro", "guide/setup"],
+        },
+        {
+            "about": "About",
+            "guide/index": "Guide",
+            "guide/intro": "Intro & Overview",
+            "guide/setup": "Setup",
+        },
+    )
+    target_uris = {entry.docname: f"{entry.docname}.html" for entry in iter_entries(entries)}
+    return SiteNavigation(entries=entries, target_uris=target_uris)
+
+
+def test_build_nav_entries() -> None:
+    entries = _navigation().entries
+    assert entries == (
+        NavEntry(docname="about", title="About"),
+        NavEntry(
+            docname="guide/index",
+            title="Guide",
+            children=(
+                NavEntry(docname="guide/intro", title="Intro & Overview"),
+                NavEntry(docname="guide/setup", title="Setup"),
+            ),
+        ),
+    )
+
+
+def test_build_nav_entries_skips_cycles() -> None:
+    entries = build_nav_entries("index", {"index": ["a"], "a": ["index", "a"]}, {})
+    assert entries == (NavEntry(docname="a", title="a"),)
+
+
+def test_render_root_page() -> None:
+    result = _navigation().render("index")
+    assert isinstance(result, RawHTML)
+    assert str(result) == (
+        '<nav role="navigation" aria-label="Table of contents">'
+        '<a href="about.html">About</a>'
+        '<details open="open"><summary><a href="guide/index.html">Guide</a></summary>'
+        '<ul><li><a href="guide/intro.html">Intro &amp; Overview</a></li>'
+        '<li><a href="guide/setup.html">Setup</a></li></ul></details>'
+        "</nav>"
+    )
+
+
+def test_render_marks_current_page() -> None:
+    html = str(_navigation().render("guide/intro"))
+    assert html.count(CURRENT_ATTR) == 1
+    assert f'<a{CURRENT_ATTR} href="intro.html">' in html
+    assert '<a href="../about.html">About</a>' in html
+
+
+def test_render_marks_every_link_to_the_current_page() -> None:
+    entries = build_nav_entries(
+        "index",
+        {"index": ["intro", "guide"], "guide": ["intro", "setup"]},
+        {"intro": "Intro", "guide": "Guide", "setup": "Setup"},
+    )
+    target_uris = {entry.docname: f"{entry.docname}.html" for entry in iter_entries(entries)}
+    navigation = SiteNavigation(entries=entries, target_uris=target_uris)
+
+    html = str(navigation.render("intro"))
+    assert html.count(f'<a{CURRENT_ATTR} href="intro.html">') == 2
+    assert html.count(CURRENT_ATTR) == 2
+    assert str(navigation.render("setup")).count(CURRENT_ATTR) == 1
+
+
+def test_render_is_shared_per_directory() -> None:
+    navigation = _navigation()
+    navigation.render("guide/intro")
+    navigation.render("guide/setup")
+    navigation.render("about")
+    assert set(navigation.rendered) == {"/", "/guide"}
+
+
+def test_render_without_entries() -> None:
+    navigation = SiteNavigation(entries=(), target_uris={})
+    assert str(navigation.render("index")) == ""
+
+
+def test_site_aside_renders_navigation_instead_of_the_page_toc(
+    page_context, site_config
+) -> None:
+    local = replace(
+        page_context,
+        pagename="about",
+        toc=html_string_to_tdom('<ul><li><a href="#intro">Intro</a></li></ul>'),
+        navigation=_navigation(),
+    )
+    aside = str(SiteAside(page_context=local, site_config=site_config))
+
+    assert str(_navigation().render("about")) in aside
+    assert "#intro" not in aside
+
+
+@pytest.mark.sphinx(
+    "html", testroot="basic-sphinx", confoverrides={"tdom_site_navigation": True}
+)
+def test_site_navigation_built_at_env_updated(app: SphinxTestApp) -> None:
+    app.build()
+
+    navigation = getattr(app, "site_navigation")
+    assert isinstance(navigation, SiteNavigation)
+    page = (app.outdir / "index.html").read_text()
+    assert '<aside id="site-aside">' in page
+
+
+@pytest.mark.sphinx("html", testroot="basic-sphinx")
+def test_site_navigation_is_off_by_default(app: SphinxTestApp) -> None:
+    app.build()
+
+    assert getattr(app, "site_navigation") is None
@@ -0,0 +1,85 @@
+"""Tests for the node types tdom_sphinx adds to tdom."""
+
+from tdom import Element, Fragment, html
+
+from tdom_sphinx.nodes import LazyHTML
+from tdom_sphinx.serialize import iter_html
+from tdom_sphinx.tdom_safe import escape_node, safe_node
+from tdom_sphinx.url import relative_tree
+
+SOURCE = '<p>One<br>two <a href="guide.html">Guide</a></p>'
+
+
+def test_lazy_html_serializes_source_verbatim():
+    node = LazyHTML(SOURCE)
+    tree = Element("main", children=[node])
+
+    assert str(tree) == f"<main>{SOURCE}</main>"
+    assert "".join(iter_html(tree)) == str(tree)
+    assert not node.is_parsed
+
+
+def test_lazy_html_parses_when_children_are_read():
+    node = LazyHTML(SOURCE)
+    [paragraph] = node.children
+    assert node.is_parsed
+    assert isinstance(paragraph, Element)
+    assert paragraph.tag == "p"
+
+    paragraph.attrs["class"] = "lead"
+    assert str(node).startswith('<p class="lead">One<br />two')
+    assert "".join(iter_html(Fragment(children=[node]))) == str(node)
+
+
+def test_lazy_html_interpolated_into_a_template_is_parsed():
+    # tdom flattens an interpolated fragment by reading its children
+    node = LazyHTML(SOURCE)
+    tree = html(t"<main>{node}</main>")
+
+    assert node.is_parsed
+    assert str(tree) == (
+        '<main><p>One<br />two <a href="guide.html">Guide</a></p></main>'
+    )
+
+
+def test_safe_node_interpolated_into_a_template_stays_unparsed():
+    safe = safe_node(SOURCE)
+    tree = html(t"<main>{safe}</main>")
+
+    assert not safe.node.is_parsed
+    assert str(tree) == f"<main>{SOURCE}</main>"
+
+
+def test_relative_tree_leaves_lazy_html_without_absolute_urls_unparsed():
+    plain = LazyHTML(SOURCE)
+    linked = LazyHTML('<a href="/docs">Docs</a>')
+    tree = Element("main", children=[plain, linked])
+
+    relative_tree(tree, "/guide/index")
+    assert not plain.is_parsed
+    assert linked.is_parsed
+    assert str(linked) == '<a href="../docs">Docs</a>'
+
+
+def test_safe_node_parses_html_lazily():
+    safe = safe_node(SOURCE)
+    assert isinstance(safe.node, LazyHTML)
+    assert str(safe) == SOURCE
+    assert not safe.node.is_parsed
+
+    # Escaping walks into the node, so it is parsed then
+    escaped = escape_node(safe.node)
+    assert "Guide" in str(escaped)
+    assert safe.node.is_parsed
+
+
+def test_relative_tree_finds_absolute_urls_in_any_spelling():
+    sources = ['<a HREF="/docs">Docs</a>', '<a href = "/docs">Docs</a>']
+    nodes = [LazyHTML(source) for source in sources]
+    nodes.append(LazyHTML("<img SRC='/logo.png'>"))
+
+    relative_tree(Element("main", children=list(nodes)), "/guide/index")
+    assert all(node.is_parsed for node in nodes)
+    assert str(nodes[0]) == '<a href="../docs">Docs</a>'
+    assert str(nodes[1]) == '<a href="../docs">Docs</a>'
+    assert str(nodes[2]) == '<img src="../logo.png" />'
@@ -0,0 +1,81 @@
+"""Tests for the build-wide page index."""
+
+import pickle
+from array import array
+
+import pytest
+from sphinx.testing.util import SphinxTestApp
+
+from tdom_sphinx.page_index import NO_PAGE, PageIndex
+
+
+def _page_index() -> PageIndex:
+    docnames = ("index", "guide/index", "guide/intro")
+    return PageIndex(
+        docnames=docnames,
+        titles=("Home", "Guide", "Intro"),
+        target_uris=("index.html", "guide/index.html", "guide/intro.html"),
+        parents=array("i", [NO_PAGE, 0, 1]),
+        prevs=array("i", [NO_PAGE, 0, 1]),
+        nexts=array("i", [1, 2, NO_PAGE]),
+        meta_columns={"audience": {2: "beginners"}},
+        numbers={docname: number for number, docname in enumerate(docnames)},
+    )
+
+
+def test_lookups():
+    index = _page_index()
+    intro = index.number("guide/intro")
+
+    assert intro == 2
+    assert index.number("missing") == NO_PAGE
+    assert [index.title(n) for n in index.ancestors(intro)] == ["Home", "Guide"]
+    assert index.target_uri(index.prev(intro)) == "guide/index.html"
+    assert index.next(intro) == NO_PAGE
+    assert index.meta(intro, "audience") == "beginners"
+    assert index.meta(0, "audience", "everyone") == "everyone"
+    assert list(index.iter_pages()) == [0, 1, 2]
+
+
+def test_page_text_covers_related_pages_only():
+    index = _page_index()
+    text = index.page_text("guide/intro")
+
+    assert "Guide" in text
+    assert "beginners" in text
+    assert index.page_text("index") != text
+    assert index.page_text("missing") == ""
+
+
+def test_index_is_picklable():
+    index = _page_index()
+    copy = pickle.loads(pickle.dumps(index))
+    assert copy.ancestors(2) == index.ancestors(2)
+
+
+@pytest.mark.sphinx(
+    "html", testroot="parallel-sphinx", confoverrides={"tdom_page_index": True}
+)
+def test_index_is_built_from_the_environment(app: SphinxTestApp) -> None:
+    app.build()
+
+    index = getattr(app, "page_index")
+    assert index.docnames[:3] == ("index", "page1", "page2")
+    assert len(index) == 14
+
+    topic = index.number("guide/topic3")
+    assert [index.docnames[n] for n in index.ancestors(topic)] == [
+        "index",
+        "guide/index",
+    ]
+    assert index.docnames[index.prev(topic)] == "guide/topic2"
+    assert index.docnames[index.next(topic)] == "guide/topic4"
+    assert index.title(index.number("guide/index")) == "Guide"
+    assert index.target_uri(topic) == "guide/topic3.html"
+
+
+@pytest.mark.sphinx("html", testroot="basic-sphinx")
+def test_page_index_is_off_by_default(app: SphinxTestApp) -> None:
+    app.build()
+
+    assert getattr(app, "page_index") is None
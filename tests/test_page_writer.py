@@ -0,0 +1,35 @@
+"""Tests for streaming page output to disk."""
+
+import pytest
+from sphinx.testing.util import SphinxTestApp
+from tdom import Element
+
+from tdom_sphinx.aria_testing.utils import get_text_content
+from tdom_sphinx.page_writer import PageWriter
+from tdom_sphinx.utils import html_string_to_tdom
+
+
+@pytest.mark.sphinx(
+    "html", testroot="basic-sphinx", confoverrides={"tdom_stream_pages": True}
+)
+def test_streamed_page_is_written(app: SphinxTestApp) -> None:
+    assert isinstance(getattr(app, "page_writer"), PageWriter)
+
+    app.build()
+
+    page = (app.outdir / "index.html").read_text()
+    assert page.startswith("<!DOCTYPE html>")
+    result = html_string_to_tdom(page)
+    assert isinstance(result, Element)
+    head = result.children[0]
+    assert isinstance(head, Element)
+    title = next(c for c in head.children if isinstance(c, Element) and c.tag == "title")
+    assert get_text_content(title).strip() == "Hello PicoCSS - tdom-sphinx"
+
+    # Every deferred page was written
+    assert getattr(app, "page_writer").pending == {}
+
+
+@pytest.mark.sphinx("html", testroot="basic-sphinx")
+def test_page_writer_is_off_by_default(app: SphinxTestApp) -> None:
+    assert getattr(app, "page_writer") is None
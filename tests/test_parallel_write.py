@@ -0,0 +1,69 @@
+"""Tests for rendering pages in parallel write workers."""
+
+import json
+import pickle
+
+import pytest
+from sphinx.testing.util import SphinxTestApp
+
+from tdom_sphinx.compiled_layout import CompiledLayout
+from tdom_sphinx.fingerprint import MANIFEST_NAME
+from tdom_sphinx.models import RenderSnapshot, SiteConfig
+from tdom_sphinx.navigation import CURRENT_ATTR, NavEntry, SiteNavigation
+
+PAGES = [
+    "index",
+    *(f"page{i}" for i in range(1, 7)),
+    "guide/index",
+    *(f"guide/topic{i}" for i in range(1, 7)),
+]
+
+
+def test_render_snapshot_pickles(site_config: SiteConfig) -> None:
+    compiled_layout = CompiledLayout(site_config)
+    compiled_layout.skeleton_for("guide/intro")
+    snapshot = RenderSnapshot(site_config=site_config, compiled_layout=compiled_layout)
+
+    restored = pickle.loads(pickle.dumps(snapshot))
+    assert restored.site_config == site_config
+    assert restored.compiled_layout.skeletons == compiled_layout.skeletons
+
+
+def test_site_navigation_pickles() -> None:
+    navigation = SiteNavigation(
+        entries=(NavEntry(docname="about", title="About"),),
+        target_uris={"about": "about.html"},
+    )
+    restored = pickle.loads(pickle.dumps(navigation))
+    assert str(restored.render("about")) == str(navigation.render("about"))
+
+
+@pytest.mark.sphinx("html", testroot="parallel-sphinx", parallel=4)
+def test_parallel_write(app: SphinxTestApp) -> None:
+    app.build()
+
+    # Caches were filled before the workers were forked
+    skeletons = getattr(app, "compiled_layout").skeletons
+    assert {directory for directory, *_ in skeletons} == {"/", "/guide"}
+    assert set(getattr(app, "site_navigation").rendered) == {"/", "/guide"}
+
+    for pagename in PAGES:
+        page = (app.outdir / f"{pagename}.html").read_text()
+        assert page.startswith("<!DOCTYPE html>")
+        assert page.count(CURRENT_ATTR) == (0 if pagename == "index" else 1)
+
+    # Fingerprints recorded in the workers were merged into the manifest
+    manifest = json.loads((app.outdir / MANIFEST_NAME).read_text())
+    assert set(PAGES) <= set(manifest["pages"])
+
+
+@pytest.mark.sphinx("html", testroot="parallel-sphinx", srcdir="serial-write")
+def test_warmed_skeletons_match_the_pages(app: SphinxTestApp) -> None:
+    app.build()
+
+    # Skeletons were warmed with the assets Sphinx gives each page, so
+    # writing the pages compiled no others
+    skeletons = getattr(app, "compiled_layout").skeletons
+    assert len(skeletons) == 2
+    page = (app.outdir / "guide" / "topic1.html").read_text()
+    assert '<script src="../_static/doctools.js' in page
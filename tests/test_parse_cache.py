@@ -0,0 +1,93 @@
+"""Tests for the content-addressed cache of parsed HTML."""
+
+import pytest
+from tdom import Element, Fragment, Text
+
+from tdom_sphinx.parse_cache import (
+    ParseCache,
+    clone_tree,
+    get_parse_cache,
+    reset_parse_cache,
+)
+from tdom_sphinx.utils import html_string_to_tdom
+
+TOC = '<ul><li><a href="/docs">Docs</a></li><li><a href="/about">About</a></li></ul>'
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start and end each test with an empty global cache."""
+    reset_parse_cache()
+    yield
+    reset_parse_cache()
+
+
+def test_clone_tree_copies_elements_and_shares_text():
+    text = Text("Docs")
+    link = Element("a", {"href": "/docs"}, [text])
+    tree = Fragment([Element("li", {}, [link])])
+
+    clone = clone_tree(tree)
+    assert str(clone) == str(tree)
+    cloned_link = clone.children[0].children[0]
+    assert cloned_link is not link
+    assert cloned_link.attrs is not link.attrs
+    assert cloned_link.children[0] is text
+
+
+def test_repeated_parses_are_hits():
+    first = html_string_to_tdom(TOC)
+    second = html_string_to_tdom(TOC)
+
+    assert str(first) == str(second) == TOC
+    info = get_parse_cache().info()
+    assert (info.hits, info.misses, info.entries) == (1, 1, 1)
+    assert info.hit_rate == 0.5
+    assert info.source_bytes == len(TOC)
+
+
+def test_returned_trees_can_be_modified():
+    first = html_string_to_tdom(TOC)
+    assert isinstance(first, Element)
+    link = first.children[0].children[0]
+    link.attrs["href"] = "docs.html"
+    first.children.pop()
+
+    assert str(html_string_to_tdom(TOC)) == TOC
+
+
+def test_cache_is_bounded():
+    cache = ParseCache(max_entries=2, max_bytes=10)
+    parse = Text
+
+    cache.parse("a", parse)
+    cache.parse("b", parse)
+    cache.parse("a", parse)
+    cache.parse("c", parse)
+    assert list(node.text for node, _ in cache.entries.values()) == ["a", "c"]
+    assert cache.evictions == 1
+
+    cache.parse("x" * 20, parse)
+    assert cache.info().entries == 2
+    assert cache.source_bytes == 2
+
+
+def test_large_sources_are_not_cached():
+    cache = ParseCache(max_source_bytes=4)
+
+    cache.parse("small", Text)
+    cache.parse("tiny", Text)
+    cache.parse("tiny", Text)
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert list(node.text for node, _ in cache.entries.values()) == ["tiny"]
+
+
+def test_a_miss_returns_the_fresh_parse():
+    cache = ParseCache()
+    parsed = Element("ul")
+
+    first = cache.parse(TOC, lambda _: parsed)
+    second = cache.parse(TOC, lambda _: parsed)
+    assert first is parsed
+    assert second is not parsed
+    assert cache.entries[next(iter(cache.entries))][0] is not parsed
@@ -0,0 +1,73 @@
+"""Tests for chunked serialization of tdom trees."""
+
+from markupsafe import Markup
+from tdom import Comment, DocumentType, Element, Fragment, Text
+
+from tdom_sphinx.components.base_layout import BaseLayout
+from tdom_sphinx.models import PageContext, SiteConfig
+from tdom_sphinx.nodes import RawHTML
+from tdom_sphinx.serialize import iter_html
+
+
+def test_iter_html_matches_str_for_mixed_nodes():
+    node = Fragment(
+        children=[
+            DocumentType("html"),
+            Element(
+                "html",
+                children=[
+                    Element(
+                        "head",
+                        children=[
+                            Element("title", children=[Text("a < b")]),
+                            Element("link", attrs={"href": "x&y", "async": None}),
+                            Element("script", children=[Text("if (a < b) {}")]),
+                        ],
+                    ),
+                    Comment(" note "),
+                    Element(
+                        "body",
+                        children=[
+                            Element("p", children=[Text("x < y"), Text(Markup("<b>ok</b>"))]),
+                            Element("div"),
+                        ],
+                    ),
+                ],
+            ),
+        ]
+    )
+
+    assert "".join(iter_html(node)) == str(node)
+
+
+def test_iter_html_yields_multiple_chunks():
+    node = Element("ul", children=[Element("li", children=[Text("One")])])
+    chunks = list(iter_html(node))
+    assert chunks == ["<ul>", "<li>", "One", "</li>", "</ul>"]
+
+
+def test_iter_html_matches_str_for_base_layout(
+    page_context: PageContext, site_config: SiteConfig
+):
+    document = BaseLayout(page_context=page_context, site_config=site_config)
+    assert "".join(iter_html(document)) == str(document)
+
+
+def test_iter_html_handles_deep_trees():
+    node = Text("leaf")
+    for _ in range(5000):
+        node = Element("div", children=[node])
+
+    html = "".join(iter_html(node))
+    assert html.startswith("<div><div>")
+    assert html.count("</div>") == 5000
+
+
+def test_iter_html_splices_raw_html_verbatim():
+    body = "<table><tr><td>a &amp; b</td></tr></table>"
+    node = Element("main", children=[RawHTML(body)])
+
+    chunks = list(iter_html(node))
+    assert chunks == ["<main>", body, "</main>"]
+    assert chunks[1] is body
+    assert "".join(chunks) == str(node)
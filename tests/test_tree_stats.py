@@ -0,0 +1,145 @@
+"""Tests for the opt-in per-page tree statistics."""
+
+import csv
+from pathlib import Path
+
+import pytest
+from sphinx.testing.util import SphinxTestApp
+from tdom import Element, Fragment, Text
+
+from tdom_sphinx.nodes import LazyHTML, RawHTML
+from tdom_sphinx.tdom_safe.utils import count_nodes
+from tdom_sphinx.tree_stats import (
+    TREE_STATS_NAME,
+    TreeStats,
+    install_tree_stats_collector,
+    reset_tree_stats_collector,
+    tree_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_collector():
+    """Start and end each test without a collector installed."""
+    reset_tree_stats_collector()
+    yield
+    reset_tree_stats_collector()
+
+
+def make_tree() -> Fragment:
+    link = Element("a", {"href": "/docs", "class": "nav"}, [Text("Docs")])
+    paragraph = Element("p", {}, [Text("Café "), link])
+    return Fragment([Element("main", {"id": "main"}, [paragraph]), Text("!")])
+
+
+def test_tree_stats():
+    tree = make_tree()
+    stats = tree_stats("index", tree)
+
+    assert stats == TreeStats(
+        page="index",
+        nodes=6,
+        max_depth=3,
+        text_bytes=len("Café Docs!".encode("utf-8")),
+        attributes=3,
+        output_bytes=len(str(tree).encode("utf-8")),
+    )
+    assert stats.nodes == count_nodes(tree)
+
+
+def test_tree_stats_of_serialized_output():
+    stats = tree_stats("index", "<p>é</p>")
+    assert stats == TreeStats("index", None, None, None, None, 9)
+
+
+def test_tree_stats_count_the_markup_of_html_strings():
+    body = "<p>Café <a href='/docs'>Docs</a></p>"
+    lazy = LazyHTML(body)
+    tree = Element("main", {}, [RawHTML(body), lazy])
+
+    stats = tree_stats("index", tree)
+    assert stats.nodes == 1 + 2 * 4
+    assert stats.max_depth == 3
+    assert stats.text_bytes == 2 * len("Café Docs".encode("utf-8"))
+    assert stats.attributes == 2
+    # Measuring left the body unparsed
+    assert not lazy.is_parsed
+
+
+def test_tree_stats_take_a_known_output_size():
+    stats = tree_stats("index", make_tree(), output_bytes=123)
+    assert stats.nodes == 6
+    assert stats.output_bytes == 123
+
+
+def test_worker_rows_are_collected_from_the_journal(tmp_path: Path):
+    collector = install_tree_stats_collector(tmp_path)
+    collector.record("b", make_tree())
+    # Pretend this process is a forked write worker
+    collector.journal.owner_pid = -1
+    collector.record("a", make_tree())
+    assert [row.page for row in collector.rows] == ["b"]
+
+    collector.journal.owner_pid = 0
+    assert [row.page for row in collector.collect()] == ["a", "b"]
+    assert list(tmp_path.iterdir()) == []
+
+
+# Its own srcdir keeps the CSV out of the basic-sphinx output that the
+# off-by-default test shares
+@pytest.mark.sphinx(
+    "html",
+    testroot="basic-sphinx",
+    srcdir="tree-stats",
+    confoverrides={"tdom_tree_stats": True},
+)
+def test_build_writes_tree_stats(app: SphinxTestApp) -> None:
+    app.build()
+
+    rows = getattr(app, "tree_stats")
+    index = next(row for row in rows if row.page == "index")
+    assert index.nodes > 10
+    assert index.output_bytes == (app.outdir / "index.html").stat().st_size
+
+    with open(app.outdir / TREE_STATS_NAME, newline="") as f:
+        records = list(csv.DictReader(f))
+    assert list(records[0]) == list(TreeStats._fields)
+    assert [record["page"] for record in records] == [row.page for row in rows]
+
+
+@pytest.mark.sphinx(
+    "html",
+    testroot="basic-sphinx",
+    srcdir="tree-stats-compiled",
+    confoverrides={"tdom_tree_stats": True, "tdom_compiled_layout": True},
+)
+def test_compiled_pages_leave_tree_columns_empty(app: SphinxTestApp) -> None:
+    app.build()
+
+    with open(app.outdir / TREE_STATS_NAME, newline="") as f:
+        index = next(row for row in csv.DictReader(f) if row["page"] == "index")
+    assert index["nodes"] == index["max_depth"] == ""
+    assert int(index["output_bytes"]) == (app.outdir / "index.html").stat().st_size
+
+
+@pytest.mark.sphinx(
+    "html",
+    testroot="basic-sphinx",
+    srcdir="tree-stats-streamed",
+    confoverrides={"tdom_tree_stats": True, "tdom_stream_pages": True},
+)
+def test_streamed_pages_are_measured_by_the_writer(app: SphinxTestApp) -> None:
+    app.build()
+
+    rows = getattr(app, "tree_stats")
+    index = next(row for row in rows if row.page == "index")
+    assert index.nodes > 10
+    assert index.output_bytes == (app.outdir / "index.html").stat().st_size
+
+
+@pytest.mark.sphinx("html", testroot="basic-sphinx")
+def test_tree_stats_are_off_by_default(app: SphinxTestApp) -> None:
+    app.build()
+
+    assert getattr(app, "tree_stats") is None
+    assert not (app.outdir / TREE_STATS_NAME).exists()
@@ -1,16 +1,26 @@
 """Tests for TXSLT functionality."""
 
 import pytest
-from tdom import Element, Text, html
+from tdom import Element, Fragment, Text, html
 
+from tdom_sphinx.serialize import iter_html
 from tdom_sphinx.txslt import (
+    CloseTag,
+    OpenTag,
     apply_templates,
+    compile_pattern,
     copy_of,
+    iter_apply_templates,
     select,
     template,
     value_of,
 )
-from tdom_sphinx.txslt.registry import reset_global_registry
+from tdom_sphinx.txslt.registry import (
+    TemplateContext,
+    TemplateRegistry,
+    VariableScope,
+    reset_global_registry,
+)
 from tdom_sphinx.txslt.helpers import (
     parse_html_string,
     select_one,
@@ -206,6 +216,33 @@ def test_select_function():
     assert len(all_children) == 3
 
 
+def test_universal_and_node_type_patterns():
+    """Test that "*" is elements only, and node() and text() are node types."""
+    root = Element(
+        tag="p",
+        children=[Text("a "), Element(tag="em", children=[Text("b")]), Text(" c")],
+    )
+
+    assert [type(node) for node in select(root, "*")] == [Element]
+    assert len(select(root, "node()")) == 3
+    assert [value_of(node) for node in select(root, "text()")] == ["a ", " c"]
+
+    registry = TemplateRegistry()
+    registry.register("*", lambda node, context: "element")
+    registry.register("text()", lambda node, context: "text", mode="text")
+    registry.register("node()", lambda node, context: "node", mode="node")
+
+    def found(node, mode=None):
+        info = registry.find_template(node, mode)
+        return info.function(node, None) if info else None
+
+    assert found(Element(tag="em")) == "element"
+    assert found(Text("a")) is None
+    assert found(Text("a"), mode="text") == "text"
+    assert found(Fragment(children=[Text("a")]), mode="text") is None
+    assert found(Element(tag="em"), mode="node") == "node"
+
+
 def test_value_of_function():
     """Test the value_of helper function."""
     root = Element(
@@ -383,3 +420,313 @@ def test_complex_hierarchical_transformation():
     assert get_text(h2, strip=True) == "Widget A"
     assert get_text(price_p, strip=True) == "$19.99"
     assert get_text(desc_p, strip=True) == "A useful widget for everyday tasks."
+
+
+def test_registry_dispatch_by_tag_wildcard_and_priority():
+    """Test indexed lookups agree with pattern matching and priority order."""
+    registry = TemplateRegistry()
+    registry.register("*", lambda node, context: "any", priority=1)
+    registry.register("item", lambda node, context: "item")
+    registry.register("item", lambda node, context: "item again")
+    registry.register("list", lambda node, context: "list", priority=5)
+
+    def found(node, mode=None):
+        info = registry.find_template(node, mode)
+        return info.function(node, None) if info else None
+
+    # "*" outranks the lower-priority tag template; ties go to the first
+    assert found(Element(tag="item")) == "any"
+    assert found(Element(tag="list")) == "list"
+    assert found(Element(tag="other")) == "any"
+    assert found(Text("x")) is None
+
+    registry.register("item", lambda node, context: "item high", priority=2)
+    registry.register("text()", lambda node, context: "text")
+    registry.register("node()", lambda node, context: "node", mode="m")
+    assert found(Element(tag="item")) == "item high"
+    assert found(Text("x")) == "text"
+    assert found(Text("x"), mode="m") == "node"
+    assert found(Element(tag="item"), mode="m") == "node"
+    assert found(Element(tag="item"), mode="other") is None
+
+    registry.clear()
+    assert found(Element(tag="item")) is None
+
+
+def test_compiled_pattern_select():
+    """Test parent, descendant, attribute and positional selectors."""
+    root = Element(
+        tag="root",
+        children=[
+            Element(
+                tag="ul",
+                attrs={"class": "nav"},
+                children=[
+                    Element(tag="li", attrs={"class": "a"}, children=[Text("1")]),
+                    Element(
+                        tag="li",
+                        children=[
+                            Text("2"),
+                            Element(tag="a", attrs={"href": "/x"}, children=[]),
+                        ],
+                    ),
+                ],
+            ),
+            Element(tag="ol", children=[Element(tag="li", children=[Text("3")])]),
+        ],
+    )
+
+    def texts(selector):
+        return [value_of(node) for node in select(root, selector)]
+
+    assert texts("ul/li") == ["1", "2"]
+    assert texts("//li") == ["1", "2", "3"]
+    assert texts("*/li[2]") == ["2"]
+    assert texts("//li[last()]") == ["2", "3"]
+    assert texts("ul[@class='nav']/li[@class]") == ["1"]
+    assert texts("ol[@class!='nav']/li") == []
+    assert texts("//a/@href") == ["/x"]
+    assert value_of(root, "ol/li") == "3"
+    assert compile_pattern("//li") is compile_pattern("//li")
+
+    with pytest.raises(ValueError, match="position 2"):
+        compile_pattern("a/")
+
+
+def test_registry_breaks_priority_ties_by_registration_order():
+    """Test that the first registered template wins among equal priorities."""
+    registry = TemplateRegistry()
+    registry.register("node()", lambda node, context: "node")
+    registry.register("item", lambda node, context: "item")
+    registry.register("list/item", lambda node, context: "list item", priority=1)
+
+    def found(node, ancestors=()):
+        info = registry.find_template(node, None, ancestors)
+        return info.function(node, None) if info else None
+
+    item = Element(tag="item")
+    assert found(item) == "node"
+    assert found(item, (Element(tag="list"),)) == "list item"
+    assert found(Text("x")) == "node"
+
+    registry.register("item", lambda node, context: "urgent", priority=1)
+    assert found(item) == "urgent"
+    assert found(item, (Element(tag="list"),)) == "list item"
+
+
+def test_registry_positional_patterns_in_nested_lists():
+    """Test positional patterns while moving between nested lists."""
+    registry = TemplateRegistry()
+    registry.register("li[1]", lambda node, context: "first")
+    registry.register("li[last()]", lambda node, context: "last")
+
+    inner = Element(tag="ul", children=[Element(tag="li") for _ in range(3)])
+    outer = Element(
+        tag="ul",
+        children=[Element(tag="li"), Element(tag="li", children=[inner])],
+    )
+
+    def found(node, ancestors):
+        info = registry.find_template(node, None, ancestors)
+        return info.function(node, None) if info else None
+
+    assert found(outer.children[0], (outer,)) == "first"
+    assert [found(li, (outer, outer.children[1], inner)) for li in inner.children] == [
+        "first",
+        None,
+        "last",
+    ]
+    assert found(outer.children[1], (outer,)) == "last"
+
+
+def test_template_patterns_with_parent_and_predicates():
+    """Test templates matched by parent steps and predicates."""
+
+    @template(pattern="li")
+    def item_template(node, context):
+        return Text("item;")
+
+    @template(pattern="ol/li", priority=1)
+    def ordered_item_template(node, context):
+        return Text(f"ordered {context.position};")
+
+    @template(pattern="li[@class='skip']", priority=2)
+    def skipped_template(node, context):
+        return None
+
+    root = Element(
+        tag="div",
+        children=[
+            Element(tag="ul", children=[Element(tag="li")]),
+            Element(
+                tag="ol",
+                children=[
+                    Element(tag="li"),
+                    Element(tag="li", attrs={"class": "skip"}),
+                ],
+            ),
+        ],
+    )
+
+    result = apply_templates(root)
+
+    assert str(result) == "<div><ul>item;</ul><ol>ordered 1;</ol></div>"
+
+
+def test_variable_scope():
+    """Test that child scopes see their parents' variables but not siblings'."""
+    root = VariableScope({"lang": "en"})
+    child = root.new_child()
+    child["depth"] = 1
+    assert child["lang"] == "en"
+    assert dict(child) == {"depth": 1, "lang": "en"}
+    assert "depth" not in root
+
+    child["lang"] = "de"
+    assert child["lang"] == "de"
+    assert root["lang"] == "en"
+
+    child.reset()
+    assert dict(child) == {"lang": "en"}
+
+
+def test_variable_scope_works_like_a_dict():
+    """Test that copy() and | give plain dicts, as when variables were a dict."""
+    scope = VariableScope({"lang": "en"}).new_child()
+    scope["depth"] = 1
+
+    assert scope.copy() == {"depth": 1, "lang": "en"}
+    assert scope | {"depth": 2} == {"depth": 2, "lang": "en"}
+    assert {"lang": "de", "extra": True} | scope == {
+        "lang": "en",
+        "extra": True,
+        "depth": 1,
+    }
+    scope |= {"depth": 3}
+    assert scope["depth"] == 3
+
+
+def test_variable_scope_skips_empty_scopes():
+    """Test that lookups don't walk scopes that set no variables."""
+    root = VariableScope({"lang": "en"})
+    scope = root
+    for _ in range(100):
+        scope = scope.new_child()
+
+    assert scope.parent is root
+    assert scope["lang"] == "en"
+
+
+def test_context_variables_can_be_reassigned():
+    """Test that a dict assigned to context.variables becomes a scope."""
+    seen = []
+
+    @template(pattern="item")
+    def item_template(node, context):
+        seen.append(context.variables.copy())
+        context.variables = {"item": context.position}
+        return apply_templates(node.children, context=context)
+
+    @template(pattern="leaf")
+    def leaf_template(node, context):
+        seen.append(context.variables.copy())
+        return None
+
+    root = Element(
+        tag="list",
+        children=[
+            Element(tag="item", children=[Element(tag="leaf")]),
+            Element(tag="item", children=[Element(tag="leaf")]),
+        ],
+    )
+
+    apply_templates(root, context=TemplateContext(variables={"top": True}))
+
+    # The replacement reaches the item's children, not its next sibling
+    assert seen == [{"top": True}, {"item": 1}, {"top": True}, {"item": 2}]
+    assert isinstance(TemplateContext(variables={"a": 1}).variables, VariableScope)
+
+
+def test_context_variables_are_scoped_per_node():
+    """Test that variables a template sets reach its children only."""
+    seen = []
+
+    @template(pattern="item")
+    def item_template(node, context):
+        seen.append((context.position, context.size, dict(context.variables)))
+        context.variables[f"item {context.position}"] = True
+        return apply_templates(node.children, context=context)
+
+    root = Element(
+        tag="list",
+        children=[
+            Element(tag="item", children=[Element(tag="item")]),
+            Element(tag="item"),
+        ],
+    )
+
+    apply_templates(root, context=TemplateContext(variables={"top": True}))
+
+    assert seen == [
+        (1, 2, {"top": True}),
+        (1, 1, {"top": True, "item 1": True}),
+        (2, 2, {"top": True}),
+    ]
+
+
+def test_apply_templates_deep_tree():
+    """Test that trees deeper than the recursion limit can be transformed."""
+
+    @template(pattern="leaf")
+    def leaf_template(node, context):
+        return Text(f"leaf at depth {len(context.ancestors)}")
+
+    depth = 10_000
+    root = node = Element(tag="section")
+    for _ in range(depth - 1):
+        child = Element(tag="section")
+        node.children.append(child)
+        node = child
+    node.children.append(Element(tag="leaf"))
+
+    result = apply_templates(root)
+
+    levels = 0
+    while isinstance(result, Element):
+        assert result.tag == "section"
+        assert len(result.children) == 1
+        levels += 1
+        result = result.children[0]
+    assert levels == depth
+    assert result == Text(f"leaf at depth {depth}")
+
+
+def test_iter_apply_templates_streams_output():
+    """Test that output is yielded as templates finish, in document order."""
+    calls = []
+
+    @template(pattern="item")
+    def item_template(node, context):
+        calls.append(context.position)
+        return Element(tag="li", children=[Text(f"item {context.position}")])
+
+    root = Element(
+        tag="list",
+        attrs={"class": "items"},
+        children=[Element(tag="item"), Text("&"), Element(tag="item")],
+    )
+
+    stream = iter_apply_templates(root)
+    assert next(stream) == OpenTag("list", {"class": "items"})
+    assert next(stream) == Element(tag="li", children=[Text("item 1")])
+    assert calls == [1]
+
+    rest = list(stream)
+    assert calls == [1, 3]
+    assert rest[-1] == CloseTag("list")
+
+    streamed = "".join(
+        chunk for node in iter_apply_templates(root) for chunk in iter_html(node)
+    )
+    assert streamed == str(apply_templates(root))
+    assert streamed == '<list class="items"><li>item 1</li>&amp;<li>item 3</li></list>'
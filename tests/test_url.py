@@ -3,7 +3,15 @@ from pathlib import PurePosixPath
 import pytest
 from tdom import Element, Fragment, html
 
-from tdom_sphinx.url import normalize, relative, relative_path, relative_tree
+from tdom_sphinx.url import (
+    normalize,
+    relative,
+    relative_cache_info,
+    relative_href,
+    relative_path,
+    relative_tree,
+    reset_relative_cache,
+)
 
 
 def test_normalize_root_variants():
@@ -88,6 +96,43 @@ def test_relative():
     assert result == PurePosixPath("../../baz")
 
 
+@pytest.mark.parametrize(
+    ("current", "target"),
+    [
+        ("/docs/page", "/docs/page"),
+        ("/a/b/c/index", "/a/d/e/index"),
+        ("/a/index", "/a/b/index"),
+        ("/a/b/c/index", "/a/index"),
+        ("/a/index", "/a/index"),
+        ("/foo/bar/boo/biz", "/foo/baz"),
+        ("/index", "/docs.html"),
+        ("/a/b/index", "/static/site.css"),
+        ("/", "/"),
+        ("/a/b", "/a"),
+        ("/a/b/", "/a//b/c"),
+        ("/a/./b", "/a/b/c"),
+        ("a/b", "/a/b"),
+    ],
+)
+def test_relative_href_matches_relative(current, target):
+    try:
+        expected = str(relative(current, target))
+    except ValueError:
+        with pytest.raises(ValueError):
+            relative_href(current, target)
+    else:
+        assert relative_href(current, target) == expected
+
+
+def test_relative_href_cache_is_shared_per_directory():
+    reset_relative_cache()
+    assert relative_href("/a/b/one", "/a/c/index") == "../c/index"
+    assert relative_href("/a/b/two", "/a/c/index") == "../c/index"
+    info = relative_cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
 def test_relative_tree_head_link_href_is_made_relative():
     # Given a simple head with a link to an absolute site path
     node = html(t"""
@@ -178,3 +223,18 @@ def test_relative_tree_body_anchor_ignores_non_absolute_and_external():
         "./bar.html",
         "https://example.com",
     ]
+
+
+def test_relative_tree_rewrites_script_and_img_src_and_is_idempotent():
+    node = html(t"""
+<body>
+  <script src="/_static/site.js"></script>
+  <img src="/_static/logo.png" />
+</body>
+""")
+    current = PurePosixPath("/a/b/index")
+    relative_tree(node, current)
+    relative_tree(node, current)
+
+    assert 'src="../../_static/site.js"' in str(node)
+    assert 'src="../../_static/logo.png"' in str(node)
@@ -6,7 +6,11 @@ from tdom.nodes import Fragment as TFragment
 from tdom.nodes import Text as TText
 
 from tdom_sphinx.aria_testing.utils import get_text_content
-from tdom_sphinx.utils import html_string_to_tdom
+from tdom_sphinx.utils import (
+    IncrementalHTMLParser,
+    html_string_to_tdom,
+    iter_html_subtrees,
+)
 
 
 def test_empty_string():
@@ -228,3 +232,112 @@ def test_return_type_patterns(html_input, expected_type):
     """Test that different input patterns return expected types."""
     result = html_string_to_tdom(html_input)
     assert isinstance(result, expected_type)
+
+
+def test_void_elements_are_not_left_open():
+    """Test that void elements without a slash don't swallow what follows."""
+    result = html_string_to_tdom('<p>a<br>b<img src="x.png">c</p><p>d</p>')
+    assert isinstance(result, TFragment)
+    first = result.children[0]
+    assert isinstance(first, TElement)
+    assert [getattr(child, "tag", None) for child in first.children] == [
+        None,
+        "br",
+        None,
+        "img",
+        None,
+    ]
+    assert getattr(result.children[1], "tag") == "p"
+
+
+def test_optional_end_tags():
+    """Test that end tags HTML makes optional are implied."""
+    result = html_string_to_tdom("<ul><li>One<li>Two</ul><p>First<p>Second")
+    assert isinstance(result, TFragment)
+    ul, first, second = result.children
+    assert isinstance(ul, TElement)
+    assert [get_text_content(li) for li in ul.children] == ["One", "Two"]
+    assert getattr(first, "tag") == "p"
+    assert get_text_content(second) == "Second"
+
+
+def test_optional_end_tags_below_other_open_elements():
+    """Test that an implied end tag closes the elements opened inside it."""
+    result = html_string_to_tdom("<ul><li><p>a<li>b</ul>")
+    assert str(result) == "<ul><li><p>a</p></li><li>b</li></ul>"
+
+    table = html_string_to_tdom("<table><tr><td><span>a<tr><td>b</table>")
+    assert [len(getattr(row, "children")) for row in table.children] == [1, 1]
+
+
+def test_optional_end_tags_stop_at_scope_boundaries():
+    """Test that nested lists and tables don't close the item around them."""
+    result = html_string_to_tdom("<ul><li>a<ul><li>b<li>c</ul></ul>")
+    assert str(result) == "<ul><li>a<ul><li>b</li><li>c</li></ul></li></ul>"
+
+    result = html_string_to_tdom("<p>a<table><tr><td><p>b<div>c</div></table>")
+    assert isinstance(result, TFragment)
+    assert str(result.children[1]) == (
+        "<table><tr><td><p>b</p><div>c</div></td></tr></table>"
+    )
+
+
+def test_table_cells_without_end_tags():
+    """Test that table rows and cells close each other."""
+    result = html_string_to_tdom("<table><tr><td>a<td>b<tr><td>c</table>")
+    assert isinstance(result, TElement)
+    rows = result.children
+    assert [len(getattr(row, "children")) for row in rows] == [2, 1]
+
+
+def test_stray_end_tags_are_ignored():
+    """Test that an unmatched end tag doesn't close the open element."""
+    result = html_string_to_tdom("<div>a</span>b</div>")
+    assert isinstance(result, TElement)
+    assert get_text_content(result) == "ab"
+
+
+def test_significant_whitespace_is_kept():
+    """Test that spaces between inline elements and inside <pre> survive."""
+    result = html_string_to_tdom(
+        "<p><em>a</em> <strong>b</strong></p>\n<pre><b>x</b>\n  <b>y</b></pre>"
+    )
+    assert isinstance(result, TFragment)
+    p, pre = result.children
+    assert str(p) == "<p><em>a</em> <strong>b</strong></p>"
+    assert str(pre) == "<pre><b>x</b>\n  <b>y</b></pre>"
+
+
+def test_long_text_runs():
+    """Test that text split across many data events becomes one node."""
+    body = "word &amp; " * 10_000
+    result = html_string_to_tdom(f"<p>{body}</p>")
+    assert isinstance(result, TElement)
+    assert len(result.children) == 1
+    assert getattr(result.children[0], "text") == "word & " * 10_000
+
+
+def test_incremental_parser_yields_closed_top_level_nodes():
+    """Test that feed() returns top-level nodes once they are closed."""
+    parser = IncrementalHTMLParser()
+    assert parser.feed("<section><p>One</p>") == []
+    [section] = parser.feed("</section><p>Tw")
+    assert str(section) == "<section><p>One</p></section>"
+    closed = parser.feed("o</p>\n<em>a</em> tail")
+    assert [str(node) for node in closed] == ["<p>Two</p>", "<em>a</em>"]
+    # Text may continue in the next chunk, so it is returned by close()
+    assert parser.close() == [TText(" tail")]
+    assert parser.root_nodes == []
+
+
+@pytest.mark.parametrize("size", [1, 7, 64])
+def test_iter_html_subtrees_matches_whole_parse(size):
+    """Test that chunked parsing gives the same nodes as a whole parse."""
+    html = (
+        "<h1>Title &amp; more</h1>\n<p>A <em>b</em> <strong>c</strong></p>"
+        "<ul><li>One<li>Two</ul><em>x</em> <em>y</em><pre> keep </pre>tail"
+    )
+    chunks = [html[i : i + size] for i in range(0, len(html), size)]
+    whole = html_string_to_tdom(html)
+    assert isinstance(whole, TFragment)
+    assert list(iter_html_subtrees(chunks)) == whole.children